@@ -27,6 +27,10 @@ if ! python3 -c "import streamlit" 2>/dev/null; then
 fi
 
 echo "✓ Dependencias listas"
+
+# Particionar por mes los archivos nuevos o modificados
+echo "🗂️  Actualizando almacén por mes..."
+python3 scripts/partition_store.py -q
 echo ""
 echo "📊 Abriendo aplicación en: http://localhost:8503"
 echo ""
@@ -0,0 +1,425 @@
+"""
+Agregados mensuales de SMS, WhatsApp e interacciones.
+Cada archivo se recorre una sola vez, por bloques, y se resume por mes de envío.
+No depende de Streamlit: lo usan el almacén particionado (partition_store.py),
+la app y los reportes.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    AGGREGATE_CHUNK_SIZE,
+    CSV_ENCODING,
+    DELIMITERS,
+    INTERACCIONES_DATE_COLUMNS,
+    SMS_DATE_COLUMNS,
+    WHATSAPP_DATE_COLUMNS,
+)
+
+
+# Cambia cuando cambia la forma de los agregados (invalida los agregados guardados)
+AGGREGATES_VERSION = 1
+
+# Mes de las filas sin fecha de envío reconocible
+NO_DATE = "sin-fecha"
+
+# Etiqueta de los valores vacíos en estados, operadores, etc.
+MISSING_LABEL = "Sin dato"
+
+SOURCES = ("sms", "whatsapp", "interacciones")
+
+CLICK_COLUMNS = ["Total Clicks URL 1", "Total Clicks URL 2", "Total Clicks URL 3"]
+
+# fuente → (encoding, delimitador, columnas de fecha)
+READ_OPTIONS = {
+    "sms": (CSV_ENCODING["sms"], DELIMITERS["sms"], SMS_DATE_COLUMNS),
+    "whatsapp": (CSV_ENCODING["whatsapp"], DELIMITERS["whatsapp"], WHATSAPP_DATE_COLUMNS),
+    "interacciones": (CSV_ENCODING["sms"], DELIMITERS["sms"], INTERACCIONES_DATE_COLUMNS),
+}
+
+# fuente → columnas del CSV que se leen además de las fechas
+_COLUMNS = {
+    "sms": ["Estado del envio", "Operador", "Tipo Mensaje"] + CLICK_COLUMNS,
+    "whatsapp": ["Phone number", "Status", "Reply Status", "Error Code"],
+    "interacciones": ["Estado del envio", "Operador", "Codigo corto", "Total de mensajes"],
+}
+
+
+# ============= LECTURA POR BLOQUES =============
+
+def _parse_dates(values: pd.Series) -> pd.Series:
+    """Fechas de una columna de texto: ISO 8601 (lo habitual) o, si no, formato libre con el día primero."""
+    parsed = pd.to_datetime(values, errors="coerce", format="ISO8601")
+    pending = parsed.isna() & (values.str.strip().str.len() > 0).fillna(False)
+    if pending.any():
+        retry = pd.to_datetime(values[pending], errors="coerce", format="mixed", dayfirst=True)
+        parsed = parsed.where(~pending, retry)
+    return parsed
+
+
+def send_days(chunk: pd.DataFrame, date_columns: List[str]) -> np.ndarray:
+    """Día de envío de cada fila (datetime64[D], NaT si no tiene fecha)."""
+    days = np.full(len(chunk), np.datetime64("NaT"), dtype="datetime64[D]")
+    for column in date_columns:
+        if column not in chunk.columns:
+            continue
+        missing = np.isnat(days)
+        if not missing.any():
+            break
+        parsed = _parse_dates(chunk[column][missing])
+        if parsed.dt.tz is not None:
+            parsed = parsed.dt.tz_localize(None)
+        days[missing] = parsed.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    return days
+
+
+def column_labels(chunk: pd.DataFrame, column: str) -> np.ndarray:
+    """Valores de texto de una columna (MISSING_LABEL si falta la columna o el valor)."""
+    if column not in chunk.columns:
+        return np.full(len(chunk), MISSING_LABEL, dtype=object)
+    values = chunk[column].str.strip()
+    return values.where(values.notna() & (values != ""), MISSING_LABEL).to_numpy(dtype=object)
+
+
+def read_chunks(source: str, path, all_columns: bool = False,
+                extra_columns: Iterable[str] = ()) -> Iterator[Tuple[pd.DataFrame, np.ndarray]]:
+    """
+    Bloques (filas, día de envío de cada fila) de un archivo de la fuente.
+
+    Por defecto solo se leen las columnas que usan los agregados (los clicks
+    como números) más extra_columns; con all_columns=True se leen todas como
+    texto, sin alterar los valores, para copiarlas a otro archivo.
+    """
+    encoding, delimiter, date_columns = READ_OPTIONS[source]
+    wanted = set(_COLUMNS[source]) | set(date_columns) | set(extra_columns)
+    reader = pd.read_csv(
+        path,
+        encoding=encoding,
+        delimiter=delimiter,
+        usecols=None if all_columns else (lambda column: column.strip() in wanted),
+        # Los clicks se leen como números; el resto como texto
+        dtype=str if all_columns else {column: str for column in wanted if column not in CLICK_COLUMNS},
+        keep_default_na=not all_columns,
+        chunksize=AGGREGATE_CHUNK_SIZE,
+    )
+    with reader:
+        for chunk in reader:
+            chunk.columns = [column.strip() for column in chunk.columns]
+            yield chunk, send_days(chunk, date_columns)
+
+
+def _sum_parts(parts: List[pd.DataFrame], keys: List[str]) -> pd.DataFrame:
+    """Suma los conteos parciales de todos los bloques (una fila por combinación de claves)."""
+    if not parts:
+        return pd.DataFrame()
+    table = pd.concat(parts).groupby(level=keys, dropna=False, sort=False).sum().reset_index()
+    days = table["day"].to_numpy(dtype="datetime64[D]")
+    months = days.astype("datetime64[M]").astype(str)
+    table["month"] = np.where(np.isnat(days), NO_DATE, months)
+    table["day"] = days.astype(str)
+    return table
+
+
+# ============= AGREGADOS POR FUENTE =============
+
+def _counts(frame: pd.DataFrame, key: str, weight: str = "rows") -> Dict[str, int]:
+    """{valor: cantidad} de mayor a menor."""
+    return sorted_counts(frame.groupby(key, sort=False)[weight].sum().to_dict())
+
+
+def _nested_counts(frame: pd.DataFrame, outer: str, inner: str) -> Dict[str, Dict[str, int]]:
+    """{valor externo: {valor interno: cantidad}}."""
+    nested: Dict[str, Dict[str, int]] = {}
+    for (first, second), count in frame.groupby([outer, inner], sort=False)["rows"].sum().items():
+        nested.setdefault(str(first), {})[str(second)] = int(count)
+    return nested
+
+
+def _daily(frame: pd.DataFrame, month: str) -> Dict[str, int]:
+    if month == NO_DATE:
+        return {}
+    return {day: int(count) for day, count in frame.groupby("day", sort=True)["rows"].sum().items()}
+
+
+# Sumas de clicks por fila de SMS: personas con clicks y total de clicks por URL
+CLICK_SUMS = ["any_click"] + [f"{kind}_url{i}" for i in (1, 2, 3) for kind in ("clicks", "total_clicks")]
+
+
+def _add_clicks(frame: pd.DataFrame, chunk: pd.DataFrame) -> None:
+    """Agrega a frame las columnas de CLICK_SUMS de cada fila del bloque."""
+    any_click = np.zeros(len(chunk), dtype=bool)
+    for i, column in enumerate(CLICK_COLUMNS, 1):
+        clicks = pd.to_numeric(chunk[column], errors="coerce").fillna(0).astype(np.int64).to_numpy() \
+            if column in chunk.columns else np.zeros(len(chunk), dtype=np.int64)
+        frame[f"clicks_url{i}"] = clicks > 0
+        frame[f"total_clicks_url{i}"] = clicks
+        any_click |= clicks > 0
+    frame["any_click"] = any_click
+
+
+def _aggregate_sms(chunks: Iterable, file_name: str) -> Dict[str, Dict]:
+    keys = ["day", "state", "operator", "message_type"]
+    sums = ["rows"] + CLICK_SUMS
+    parts = []
+    for chunk, days in chunks:
+        frame = pd.DataFrame({
+            "day": days,
+            "state": column_labels(chunk, "Estado del envio"),
+            "operator": column_labels(chunk, "Operador"),
+            "message_type": column_labels(chunk, "Tipo Mensaje"),
+            "rows": 1,
+        })
+        _add_clicks(frame, chunk)
+        parts.append(frame.groupby(keys, dropna=False, sort=False)[sums].sum())
+
+    table = _sum_parts(parts, keys)
+    months = {}
+    for month, group in table.groupby("month", sort=True) if len(table) else []:
+        clicks = {column: int(group[column].sum()) for column in sums if column.startswith(("clicks", "total_clicks"))}
+        clicks["total_with_clicks"] = int(group["any_click"].sum())
+        months[month] = {
+            "total": int(group["rows"].sum()),
+            "states": _counts(group, "state"),
+            "operators": _counts(group, "operator"),
+            "message_types": _counts(group, "message_type"),
+            "operator_states": _nested_counts(group, "operator", "state"),
+            "daily": _daily(group, month),
+            "clicks": clicks,
+        }
+    return months
+
+
+def _aggregate_whatsapp(chunks: Iterable, file_name: str) -> Dict[str, Dict]:
+    keys = ["day", "state", "reply"]
+    parts, error_parts, phone_parts = [], [], []
+    for chunk, days in chunks:
+        states = column_labels(chunk, "Status")
+        frame = pd.DataFrame({"day": days, "state": states, "reply": column_labels(chunk, "Reply Status"), "rows": 1})
+        parts.append(frame.groupby(keys, dropna=False, sort=False)[["rows"]].sum())
+
+        # Fallidos y en procesamiento: códigos de error y teléfonos (para la calidad de datos)
+        problem = np.isin(states, ["Failed", "Processing"])
+        if problem.any():
+            months = days[problem].astype("datetime64[M]")
+            phones = chunk["Phone number"].to_numpy(dtype=object)[problem] if "Phone number" in chunk.columns \
+                else np.full(problem.sum(), None, dtype=object)
+            detail = pd.DataFrame({
+                "month": np.where(np.isnat(months), NO_DATE, months.astype(str)),
+                "state": states[problem],
+                "phone": phones,
+                "code": column_labels(chunk, "Error Code")[problem],
+                "rows": 1,
+            })
+            with_phone = detail["phone"].notna() & (detail["phone"] != "")
+            phone_parts.append(detail[with_phone].groupby(["month", "state", "phone"])["rows"].sum())
+            failed = detail[(detail["state"] == "Failed") & (detail["code"] != MISSING_LABEL)]
+            error_parts.append(failed.groupby(["month", "code"])["rows"].sum())
+
+    table = _sum_parts(parts, keys)
+    months = {}
+    for month, group in table.groupby("month", sort=True) if len(table) else []:
+        total = int(group["rows"].sum())
+        states = _counts(group, "state")
+        months[month] = {
+            "total": total,
+            "states": states,
+            "by_file": {file_name: {"count": total, "states": states}},
+            "replies": _counts(group, "reply"),
+            "daily": _daily(group, month),
+            "error_codes": {},
+            "failed_phones": {},
+            "processing_phones": {},
+        }
+
+    if error_parts:
+        errors = pd.concat(error_parts).groupby(level=[0, 1]).sum()
+        for (month, code), count in errors.items():
+            months[month]["error_codes"][str(code)] = int(count)
+    if phone_parts:
+        phones = pd.concat(phone_parts).groupby(level=[0, 1, 2]).sum()
+        for (month, state, phone), count in phones.items():
+            target = "failed_phones" if state == "Failed" else "processing_phones"
+            months[month][target][str(phone)] = int(count)
+    return months
+
+
+def _aggregate_interacciones(chunks: Iterable, file_name: str) -> Dict[str, Dict]:
+    keys = ["day", "state", "operator", "short_code", "messages"]
+    parts = []
+    for chunk, days in chunks:
+        frame = pd.DataFrame({
+            "day": days,
+            "state": column_labels(chunk, "Estado del envio"),
+            "operator": column_labels(chunk, "Operador"),
+            "short_code": column_labels(chunk, "Codigo corto"),
+            "messages": column_labels(chunk, "Total de mensajes"),
+            "rows": 1,
+        })
+        parts.append(frame.groupby(keys, dropna=False, sort=False)[["rows"]].sum())
+
+    table = _sum_parts(parts, keys)
+    months = {}
+    for month, group in table.groupby("month", sort=True) if len(table) else []:
+        months[month] = {
+            "total": int(group["rows"].sum()),
+            "states": _counts(group, "state"),
+            "operators": _counts(group, "operator"),
+            "short_codes": _counts(group, "short_code"),
+            "message_states": _nested_counts(group, "messages", "state"),
+            "daily": _daily(group, month),
+        }
+    return months
+
+
+_AGGREGATORS = {
+    "sms": _aggregate_sms,
+    "whatsapp": _aggregate_whatsapp,
+    "interacciones": _aggregate_interacciones,
+}
+
+
+def aggregate_chunks(source: str, chunks: Iterable[Tuple[pd.DataFrame, np.ndarray]],
+                     file_name: str) -> Dict[str, Dict]:
+    """
+    Agregados por mes de envío de los bloques (filas, días) de un archivo.
+
+    Args:
+        source: "sms", "whatsapp" o "interacciones"
+        chunks: Bloques como los de read_chunks
+        file_name: Nombre del archivo (para los conteos por archivo)
+
+    Returns:
+        {mes "YYYY-MM" (o NO_DATE): agregados del mes}
+    """
+    if source not in _AGGREGATORS:
+        raise ValueError(f"Fuente desconocida: {source}")
+    return _AGGREGATORS[source](chunks, file_name)
+
+
+def aggregate_file(source: str, path) -> Dict[str, Dict]:
+    """Recorre un archivo una vez y retorna sus agregados por mes de envío."""
+    return aggregate_chunks(source, read_chunks(source, path), Path(path).name)
+
+
+# ============= CUBOS (FILTROS DE LA APP) =============
+
+# fuente → columnas del CSV que son dimensiones del cubo (además del día)
+CUBE_DIMENSIONS = {
+    "sms": ["Estado del envio", "Operador", "Usuario", "Tipo Mensaje"],
+    "whatsapp": ["Status", "Error Code"],
+    "interacciones": ["Estado del envio", "Operador", "Codigo corto", "Total de mensajes"],
+}
+
+# Dimensión con el nombre del archivo en el cubo de WhatsApp (varios archivos)
+FILE_DIMENSION = "Archivo"
+
+
+def sms_send_days(path) -> pd.Series:
+    """Id Envio → día de envío de un archivo SMS (para fechar las interacciones)."""
+    parts = []
+    for chunk, days in read_chunks("sms", path, extra_columns=["Id Envio"]):
+        if "Id Envio" in chunk.columns:
+            parts.append(pd.Series(days, index=chunk["Id Envio"].str.strip().to_numpy(dtype=object)))
+    if not parts:
+        return pd.Series([], dtype="datetime64[s]")
+    days = pd.concat(parts)
+    return days[~days.index.duplicated()]
+
+
+def fill_send_days(chunk: pd.DataFrame, days: np.ndarray, send_days_by_id: pd.Series = None) -> None:
+    """Completa en days el día de las filas sin fecha con el de su Id Envio (sms_send_days)."""
+    if send_days_by_id is None or "Id Envio" not in chunk.columns:
+        return
+    missing = np.isnat(days)
+    if missing.any():
+        ids = chunk["Id Envio"].str.strip().to_numpy(dtype=object)[missing]
+        days[missing] = send_days_by_id.reindex(ids).to_numpy(dtype="datetime64[D]")
+
+
+def build_cube(source: str, path, send_days_by_id: pd.Series = None) -> pd.DataFrame:
+    """
+    Cubo de un archivo: una fila por combinación de día y CUBE_DIMENSIONS con
+    la cantidad de filas ("rows") y, en SMS, las sumas de CLICK_SUMS. Los
+    filtros de la app se responden sobre el cubo (miles de filas) sin volver
+    a leer el CSV.
+
+    Args:
+        source: "sms", "whatsapp" o "interacciones"
+        path: Archivo de la fuente
+        send_days_by_id: Id Envio → día (sms_send_days), para las filas sin fecha
+    """
+    dimensions = CUBE_DIMENSIONS[source]
+    extra = dimensions + (["Id Envio"] if send_days_by_id is not None else [])
+    parts = []
+    for chunk, days in read_chunks(source, path, extra_columns=extra):
+        fill_send_days(chunk, days, send_days_by_id)
+        frame = pd.DataFrame({"day": days, **{column: column_labels(chunk, column) for column in dimensions}, "rows": 1})
+        if source == "sms":
+            _add_clicks(frame, chunk)
+        parts.append(frame.groupby(["day"] + dimensions, dropna=False, sort=False).sum())
+
+    if not parts:
+        return pd.DataFrame(columns=["day"] + dimensions + ["rows"])
+    cube = pd.concat(parts).groupby(level=list(range(len(dimensions) + 1)), dropna=False, sort=False).sum()
+    cube = cube.reset_index()
+    if source == "whatsapp":
+        cube.insert(0, FILE_DIMENSION, Path(path).name)
+    return concat_cubes([cube])
+
+
+def concat_cubes(cubes: List[pd.DataFrame]) -> pd.DataFrame:
+    """Une cubos (p. ej. de varios archivos) con las dimensiones como categorías."""
+    cube = pd.concat(cubes, ignore_index=True) if cubes else pd.DataFrame(columns=["day", "rows"])
+    for column in cube.columns:
+        if column != "day" and not pd.api.types.is_numeric_dtype(cube[column]):
+            cube[column] = cube[column].astype("category")
+    cube["day"] = cube["day"].astype("datetime64[s]")
+    return cube
+
+
+def filter_cube(cube: pd.DataFrame, filters: Dict = None) -> pd.DataFrame:
+    """
+    Filas del cubo que cumplen los filtros. filters: {"dates": (desde, hasta)
+    o None, columna: [valores]}; se ignoran las columnas que el cubo no tiene y
+    las listas vacías (sin filtro).
+    """
+    if not filters or cube.empty:
+        return cube
+    mask = np.ones(len(cube), dtype=bool)
+    dates = filters.get("dates")
+    if dates:
+        days = cube["day"].to_numpy(dtype="datetime64[D]")
+        mask &= (days >= np.datetime64(dates[0], "D")) & (days <= np.datetime64(dates[1], "D"))
+    for column, values in filters.items():
+        if column != "dates" and values and column in cube.columns:
+            mask &= cube[column].isin(values).to_numpy()
+    return cube[mask]
+
+
+def cube_counts(cube: pd.DataFrame, column: str, measure: str = "rows") -> Dict[str, int]:
+    """{valor de la dimensión: suma de measure} de mayor a menor."""
+    if cube.empty or column not in cube.columns:
+        return {}
+    counts = cube.groupby(column, observed=True, sort=False)[measure].sum()
+    return sorted_counts(counts[counts > 0].to_dict())
+
+
+# ============= COMBINACIÓN =============
+
+def sorted_counts(counts: Dict) -> Dict[str, int]:
+    """Conteos de mayor a menor (a igual cantidad, por nombre)."""
+    return {str(k): int(v) for k, v in sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))}
+
+
+def merge_counts(target: Dict, other: Dict) -> Dict:
+    """Suma en target los conteos de other (diccionarios anidados de enteros) y retorna target."""
+    for key, value in other.items():
+        if isinstance(value, dict):
+            merge_counts(target.setdefault(key, {}), value)
+        else:
+            target[key] = target.get(key, 0) + value
+    return target
@@ -7,31 +7,44 @@ import streamlit as st
 import pandas as pd
 from pathlib import Path
 import sys
+import time
 
 # Agregar el directorio de scripts al path
 scripts_dir = Path(__file__).parent
 sys.path.insert(0, str(scripts_dir))
 
-from config import PAGE_CONFIG, MESSAGES
+from config import PAGE_CONFIG, MESSAGES, WARMUP_WORKERS
+from cache_warmer import CacheWarmer
+from memory_budget import memory_budget_info
 from data_loader import (
     load_sms_data,
     load_whatsapp_data,
-    get_sms_statistics,
-    get_whatsapp_statistics,
-    get_sms_flow_data,
-    get_whatsapp_flow_data,
-    get_sms_clicks_stats,
     count_total_sms_records,
     get_sms_file_size,
     count_total_interacciones_records,
     get_interacciones_data,
-    get_interacciones_states_summary,
-    get_interacciones_by_operator,
-    get_interacciones_by_codigo_corto,
-    get_interacciones_interaction_flow,
     get_whatsapp_failed_analysis,
     get_whatsapp_failed_details,
+    get_available_months,
+    get_month_aggregates,
+    FILTER_COLUMNS,
+    get_sms_cube,
+    get_whatsapp_cube,
+    get_interacciones_cube,
+    get_filter_options,
+    get_sms_summary,
+    get_whatsapp_summary,
+    get_interacciones_summary,
+    flow_from_states,
+    get_sms_index,
+    get_whatsapp_indexes,
+    get_interacciones_index,
+    get_sms_rows,
+    get_whatsapp_rows,
+    get_interacciones_rows,
 )
+from aggregates import CLICK_COLUMNS
+from partition_store import compare_counts, failure_counts, month_metrics, previous_month
 from visualizations import (
     create_sankey_diagram,
     create_status_bar_chart,
@@ -40,9 +53,60 @@ from visualizations import (
     create_donut_chart,
     create_stacked_bar_chart,
     create_metric_cards,
+    create_month_comparison_chart,
 )
 
 
+# Funciones cacheadas que se precalientan al iniciar, en orden: primero los
+# totales de la barra lateral y los cubos (de ellos salen los resúmenes,
+# gráficos y filtros de cada sección), luego los índices de bitmaps (filas que
+# cumplen los filtros). Las funciones que cargan un archivo completo en un
+# DataFrame (muestras, análisis de fallidos) no se precalientan: tener todas en
+# memoria a la vez no cabe en un contenedor pequeño, así que se calculan la
+# primera vez que se abre su pestaña.
+# Los argumentos deben ser los mismos que usan las secciones.
+WARMUP_TASKS = {
+    "sms_total": count_total_sms_records,
+    "interacciones_total": count_total_interacciones_records,
+    "sms_cube": get_sms_cube,
+    "whatsapp_cube": get_whatsapp_cube,
+    "interacciones_cube": get_interacciones_cube,
+    "sms_index": get_sms_index,
+    "whatsapp_index": get_whatsapp_indexes,
+    "interacciones_index": get_interacciones_index,
+}
+
+
+@st.cache_resource
+def get_cache_warmer() -> CacheWarmer:
+    """Precalentamiento compartido por todas las sesiones (se inicia una vez por proceso)."""
+    return CacheWarmer(WARMUP_TASKS, WARMUP_WORKERS).start()
+
+
+def wait_for_warmup(*names):
+    """
+    Si el precalentamiento aún calcula alguno de estos datos, muestra el avance
+    y vuelve a ejecutar la página en un segundo en lugar de calcularlos otra vez.
+    """
+    warmer = get_cache_warmer()
+    if warmer.is_ready(names):
+        return
+    status = warmer.status()
+    st.info(f"⏳ Preparando datos en segundo plano... ({status['done']}/{status['total']})")
+    st.progress(status["done"] / max(status["total"], 1))
+    time.sleep(1)
+    st.rerun()
+
+
+def render_matching_rows(rows, matching):
+    """Filas que cumplen los filtros (leídas del archivo con el índice de bitmaps)."""
+    if rows.empty:
+        st.info("Ningún registro cumple los filtros")
+        return
+    st.write(f"**Mostrando {len(rows):,} primeros registros de {matching:,} que cumplen los filtros**")
+    st.dataframe(rows, use_container_width=True)
+
+
 def setup_page():
     """Configura la página de Streamlit con estilos mejorados."""
     st.set_page_config(**PAGE_CONFIG)
@@ -140,20 +204,36 @@ def setup_page():
     """, unsafe_allow_html=True)
 
 
+# Fragmento de Streamlit (st.fragment desde 1.37, experimental desde 1.33): al
+# usar un widget de adentro se vuelve a ejecutar solo la función decorada, no
+# la página. En versiones anteriores se ejecuta la página completa, como antes.
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+
+def lazy_tabs(labels, key):
+    """
+    Pestañas que solo ejecutan la elegida: st.tabs ejecuta el contenido de todas
+    en cada carga, así que aquí se elige con un radio horizontal y cada sección
+    calcula solo lo de la pestaña abierta.
+    """
+    return st.radio("Pestaña", labels, horizontal=True, key=key, label_visibility="collapsed")
+
+
 def render_header():
     """Renderiza el encabezado de la aplicación."""
     st.markdown(f'<div class="main-header">{MESSAGES["title"]}</div>', unsafe_allow_html=True)
     st.markdown(f'<div class="sub-header">{MESSAGES["subtitle"]}</div>', unsafe_allow_html=True)
 
 
-def render_sms_section():
-    """Renderiza la sección completa de SMS con análisis detallado."""
+def render_sms_section(filters=None):
+    """Renderiza la sección completa de SMS con análisis detallado (según los filtros globales)."""
     st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
     st.markdown('<div class="section-title">📱 ANÁLISIS DE CAMPAÑAS SMS</div>', unsafe_allow_html=True)
     st.markdown("*Visualización de 315K+ mensajes SMS procesados*")
+    wait_for_warmup("sms_cube")
     
-    total_sms = count_total_sms_records()
-    sms_stats = get_sms_statistics()
+    sms_stats = get_sms_summary(filters)
+    total_sms = sms_stats["total"]
     file_size = get_sms_file_size()
     
     # Métricas resumen
@@ -173,9 +253,16 @@ def render_sms_section():
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Tabs para diferentes análisis
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Estados", "🔄 Flujo", "👆 Engagement", "📈 Gráficos", "📄 Datos"])
+    render_sms_tabs(sms_stats, filters)
+
+
+@fragment
+def render_sms_tabs(sms_stats, filters=None):
+    """Pestañas de SMS: cambiar de pestaña vuelve a ejecutar solo este fragmento."""
+    total_sms = sms_stats["total"]
+    tab = lazy_tabs(["📊 Estados", "🔄 Flujo", "👆 Engagement", "📈 Gráficos", "📄 Datos"], key="tab_sms")
     
-    with tab1:
+    if tab == "📊 Estados":
         st.markdown("### Distribución de Estados")
         st.markdown("*Clasificación de mensajes SMS por su estado de entrega*")
         if sms_stats["states"]:
@@ -196,11 +283,11 @@ def render_sms_section():
             )
             st.dataframe(states_df, use_container_width=True, hide_index=True)
     
-    with tab2:
+    if tab == "🔄 Flujo":
         st.markdown("### Flujo de Estados (Diagrama Sankey)")
         st.markdown("*Visualiza cómo transicionan los mensajes entre diferentes estados*")
         try:
-            source, target, value = get_sms_flow_data()
+            source, target, value = flow_from_states(sms_stats["states"])
             if source and target and value:
                 fig = create_sankey_diagram(source, target, value, "Flujo SMS")
                 st.plotly_chart(fig, use_container_width=True)
@@ -209,12 +296,12 @@ def render_sms_section():
         except Exception as e:
             st.error(f"Error en Sankey: {e}")
     
-    with tab3:
+    if tab == "👆 Engagement":
         st.markdown("### 📊 Métricas de Engagement por URL")
         st.markdown("*Análisis de personas que dieron click en las URLs incluidas en los SMS*")
         try:
-            clicks_stats = get_sms_clicks_stats()
-            if clicks_stats:
+            clicks_stats = sms_stats["clicks"]
+            if clicks_stats["total_sms"]:
                 # Métricas principales
                 col1, col2, col3 = st.columns(3)
                 with col1:
@@ -256,7 +343,7 @@ def render_sms_section():
         except Exception as e:
             st.error(f"Error en engagement: {e}")
     
-    with tab4:
+    if tab == "📈 Gráficos":
         st.markdown("### Visualizaciones Adicionales")
         col1, col2 = st.columns(2)
         
@@ -265,21 +352,26 @@ def render_sms_section():
                 fig_pie = create_pie_chart(sms_stats["states"], "Distribución Porcentual")
                 st.plotly_chart(fig_pie, use_container_width=True)
     
-    with tab5:
+    if tab == "📄 Datos":
         st.markdown("### Muestra de Datos SMS")
+        if filters:
+            wait_for_warmup("sms_index")
+            render_matching_rows(*get_sms_rows(filters))
+            return
         sms_df = load_sms_data(sample=True, sample_size=100)
         if not sms_df.empty:
             st.write(f"**Mostrando 100 primeros registros de {total_sms:,} totales**")
             st.dataframe(sms_df, use_container_width=True)
 
 
-def render_whatsapp_section():
-    """Renderiza la sección completa de WhatsApp."""
+def render_whatsapp_section(filters=None):
+    """Renderiza la sección completa de WhatsApp (según los filtros globales)."""
     st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
     st.markdown('<div class="section-title">💬 ANÁLISIS DE WHATSAPP</div>', unsafe_allow_html=True)
     st.markdown("*Análisis de 1.9K+ mensajes WhatsApp con validaciones de calidad*")
+    wait_for_warmup("whatsapp_cube")
     
-    whatsapp_stats = get_whatsapp_statistics()
+    whatsapp_stats = get_whatsapp_summary(filters)
     total_wa = whatsapp_stats['total']
     
     # Métricas resumen
@@ -298,9 +390,19 @@ def render_whatsapp_section():
             st.metric("🔝 Estado Principal", top_state)
     st.markdown('</div>', unsafe_allow_html=True)
     
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Estados", "🔄 Flujo", "📈 Gráficos", "🔍 DQ Fallidos", "📄 Datos"])
+    render_whatsapp_tabs(whatsapp_stats, filters)
+
+
+@fragment
+def render_whatsapp_tabs(whatsapp_stats, filters=None):
+    """
+    Pestañas de WhatsApp (incluye las tablas de DQ Fallidos): cambiar de
+    pestaña vuelve a ejecutar solo este fragmento.
+    """
+    total_wa = whatsapp_stats["total"]
+    tab = lazy_tabs(["📊 Estados", "🔄 Flujo", "📈 Gráficos", "🔍 DQ Fallidos", "📄 Datos"], key="tab_whatsapp")
     
-    with tab1:
+    if tab == "📊 Estados":
         st.markdown("### Distribución de Estados")
         st.markdown("*Clasificación de mensajes WhatsApp por su estado de entrega*")
         if whatsapp_stats["states"]:
@@ -334,11 +436,11 @@ def render_whatsapp_section():
                         )
                         st.dataframe(file_states_df, use_container_width=True, hide_index=True)
     
-    with tab2:
+    if tab == "🔄 Flujo":
         st.markdown("### Flujo de Estados (Diagrama Sankey)")
         st.markdown("*Visualiza cómo transicionan los mensajes entre diferentes estados*")
         try:
-            source, target, value = get_whatsapp_flow_data()
+            source, target, value = flow_from_states(whatsapp_stats["states"])
             if source and target and value:
                 fig = create_sankey_diagram(source, target, value, "Flujo WhatsApp")
                 st.plotly_chart(fig, use_container_width=True)
@@ -347,7 +449,7 @@ def render_whatsapp_section():
         except Exception as e:
             st.error(f"Error en Sankey: {e}")
     
-    with tab3:
+    if tab == "📈 Gráficos":
         st.markdown("### Visualizaciones Adicionales")
         col1, col2 = st.columns(2)
         
@@ -356,11 +458,13 @@ def render_whatsapp_section():
                 fig_pie = create_pie_chart(whatsapp_stats["states"], "Distribución Porcentual")
                 st.plotly_chart(fig_pie, use_container_width=True)
     
-    with tab4:
+    if tab == "🔍 DQ Fallidos":
         st.markdown("### 🔍 Análisis de Calidad de Datos: Mensajes Problemáticos")
         st.markdown("*Análisis enriquecido con validaciones de números celulares colombianos (después del +57)*")
+        if filters:
+            wait_for_warmup("whatsapp_index")
         
-        failed_analysis = get_whatsapp_failed_analysis()
+        failed_analysis = get_whatsapp_failed_analysis(filters)
         
         if failed_analysis and (failed_analysis.get('total_failed', 0) > 0 or failed_analysis.get('total_processing', 0) > 0):
             # ===== MÉTRICAS RESUMEN =====
@@ -616,41 +720,52 @@ def render_whatsapp_section():
             st.markdown("✅ **No hay mensajes con estado 'Failed' o 'Processing'** - La calidad de datos es excelente!")
             st.markdown('</div>', unsafe_allow_html=True)
     
-    with tab5:
+    if tab == "📄 Datos":
         st.subheader("Muestra de Datos WhatsApp")
+        if filters:
+            wait_for_warmup("whatsapp_index")
+            render_matching_rows(*get_whatsapp_rows(filters))
+            return
         whatsapp_df = load_whatsapp_data()
         if not whatsapp_df.empty:
             st.write(f"Mostrando {len(whatsapp_df)} de {total_wa:,} registros")
             st.dataframe(whatsapp_df, use_container_width=True)
 
 
-def render_interacciones_section():
-    """Renderiza la sección de análisis de Interacciones."""
+def render_interacciones_section(filters=None):
+    """Renderiza la sección de análisis de Interacciones (según los filtros globales)."""
     st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
     st.markdown('<div class="section-title">💌 ANÁLISIS DE INTERACCIONES</div>', unsafe_allow_html=True)
     st.markdown("*Análisis de 315K+ interacciones de mensajes con múltiples canales*")
+    wait_for_warmup("interacciones_cube")
     
-    total_inter = count_total_interacciones_records()
-    inter_states = get_interacciones_states_summary()
-    inter_operators = get_interacciones_by_operator()
-    inter_codigos = get_interacciones_by_codigo_corto()
+    inter_stats = get_interacciones_summary(filters)
+    total_inter = inter_stats["total"]
+    inter_states = inter_stats["states"]
     
-    # Métricas resumen
+    # Métricas resumen (operadores y códigos se calculan al abrir su pestaña)
     st.markdown('<div class="metrics-container">', unsafe_allow_html=True)
-    col1, col2, col3, col4 = st.columns(4)
+    col1, col2, col3 = st.columns(3)
     with col1:
         st.metric("💌 Total Interacciones", f"{total_inter:,}")
     with col2:
         st.metric("🏷️ Estados Únicos", len(inter_states))
     with col3:
-        st.metric("📡 Operadores", len(inter_operators))
-    with col4:
-        st.metric("🔢 Códigos Cortos", len(inter_codigos))
+        if inter_states:
+            st.metric("🔝 Estado Principal", max(inter_states, key=inter_states.get))
     st.markdown('</div>', unsafe_allow_html=True)
     
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Estados", "📡 Operadores", "🔢 Códigos", "🔄 Flujo", "📄 Datos"])
+    render_interacciones_tabs(inter_stats, filters)
+
+
+@fragment
+def render_interacciones_tabs(inter_stats, filters=None):
+    """Pestañas de Interacciones: cambiar de pestaña vuelve a ejecutar solo este fragmento."""
+    total_inter = inter_stats["total"]
+    inter_states = inter_stats["states"]
+    tab = lazy_tabs(["📊 Estados", "📡 Operadores", "🔢 Códigos", "🔄 Flujo", "📄 Datos"], key="tab_interacciones")
     
-    with tab1:
+    if tab == "📊 Estados":
         st.markdown("### Distribución de Estados")
         st.markdown("*Clasificación de interacciones por su estado de entrega*")
         if inter_states:
@@ -671,9 +786,11 @@ def render_interacciones_section():
             )
             st.dataframe(states_df, use_container_width=True, hide_index=True)
     
-    with tab2:
+    if tab == "📡 Operadores":
         st.markdown("### Distribución por Operador")
         st.markdown("*Análisis de interacciones separadas por operador de telefonía*")
+        inter_operators = inter_stats["operators"]
+        st.metric("📡 Operadores", len(inter_operators))
         if inter_operators:
             col1, col2 = st.columns(2)
             with col1:
@@ -692,9 +809,11 @@ def render_interacciones_section():
             )
             st.dataframe(op_df, use_container_width=True, hide_index=True)
     
-    with tab3:
+    if tab == "🔢 Códigos":
         st.markdown("### Distribución por Código Corto")
         st.markdown("*Análisis de campaña por código corto utilizado*")
+        inter_codigos = inter_stats["short_codes"]
+        st.metric("🔢 Códigos Cortos", len(inter_codigos))
         if inter_codigos:
             col1, col2 = st.columns(2)
             with col1:
@@ -713,11 +832,11 @@ def render_interacciones_section():
             )
             st.dataframe(cod_df, use_container_width=True, hide_index=True)
     
-    with tab4:
+    if tab == "🔄 Flujo":
         st.markdown("### Flujo de Interacciones (Diagrama Sankey)")
         st.markdown("*Visualiza cómo fluyen las interacciones entre diferentes estados y canales*")
         try:
-            source, target, value = get_interacciones_interaction_flow()
+            source, target, value = inter_stats["flow"]
             if source and target and value:
                 fig = create_sankey_diagram(source, target, value, "Flujo de Interacciones")
                 st.plotly_chart(fig, use_container_width=True)
@@ -726,14 +845,134 @@ def render_interacciones_section():
         except Exception as e:
             st.error(f"Error en Sankey: {e}")
     
-    with tab5:
+    if tab == "📄 Datos":
         st.markdown("### Muestra de Datos Interacciones")
+        if filters:
+            wait_for_warmup("interacciones_index")
+            render_matching_rows(*get_interacciones_rows(filters))
+            return
         inter_df = get_interacciones_data(sample=True, sample_size=100)
         if not inter_df.empty:
             st.write(f"**Mostrando 100 primeros registros de {total_inter:,} totales**")
             st.dataframe(inter_df, use_container_width=True)
 
 
+def render_section_selector():
+    """Selector de sección en la barra lateral; solo se calcula la sección elegida."""
+    with st.sidebar:
+        return st.radio("🧭 Sección", list(SECTIONS), key="section")
+
+
+def render_filters():
+    """
+    Filtros globales en la barra lateral (fechas, operador, usuario, tipo y
+    archivo). Se responden sobre los cubos precalculados, sin leer los CSV.
+    Retorna solo los filtros activos: {"dates": (desde, hasta), columna: [valores]}.
+    """
+    with st.sidebar:
+        st.markdown("## 🔎 FILTROS")
+        if not get_cache_warmer().is_ready(["sms_cube", "whatsapp_cube", "interacciones_cube"]):
+            st.caption("⏳ Los filtros estarán disponibles al terminar de preparar los datos")
+            return {}
+
+        options = get_filter_options()
+        filters = {}
+        if options["dates"]:
+            first, last = options["dates"]
+            dates = st.date_input("📆 Fechas de envío", value=(first, last), min_value=first,
+                                  max_value=last, key="filtro_fechas")
+            # Mientras se elige el rango, date_input retorna una sola fecha
+            if len(dates) == 2 and tuple(dates) != (first, last):
+                filters["dates"] = tuple(dates)
+        for column, label in FILTER_COLUMNS.items():
+            if options[column]:
+                selected = st.multiselect(label, options[column], key=f"filtro_{column}")
+                if selected:
+                    filters[column] = selected
+        if "dates" in filters:
+            st.caption("Las filas sin fecha de envío se excluyen al filtrar por fechas")
+        st.markdown("---")
+    return filters
+
+
+def render_month_selector():
+    """Selector de mes (y mes de comparación) en la barra lateral; retorna (mes, comparación)."""
+    months = get_available_months()
+    with st.sidebar:
+        st.markdown("## 📅 ANÁLISIS MENSUAL")
+        if not months:
+            return None, None
+        month = st.selectbox("📅 Mes", months[::-1])
+        # Por defecto el mes anterior; si no hay datos de él, el más cercano hacia atrás
+        earlier = [m for m in months if m < month]
+        options = ["Ninguno"] + earlier[::-1]
+        default = previous_month(month) if previous_month(month) in earlier else (earlier[-1] if earlier else "Ninguno")
+        compare = st.selectbox("🔁 Comparar con", options, index=options.index(default))
+        st.markdown("---")
+    return month, (None if compare == "Ninguno" else compare)
+
+
+def render_monthly_section(month, compare):
+    """Renderiza el resumen del mes elegido y sus cambios frente al mes de comparación."""
+    st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
+    st.markdown('<div class="section-title">📅 ANÁLISIS MENSUAL</div>', unsafe_allow_html=True)
+    if month is None:
+        st.info("ℹ️ Aún no hay datos particionados por mes. Ejecuta `python scripts/partition_store.py` "
+                "para generarlos.")
+        return
+
+    current = get_month_aggregates(month)
+    previous = get_month_aggregates(compare) if compare else {}
+    st.markdown(f"*{month}" + (f" comparado con {compare}*" if compare else "*"))
+
+    # Métricas con su cambio frente al mes de comparación
+    metrics, before = month_metrics(current), month_metrics(previous)
+    columns = st.columns(4)
+    for i, (name, value) in enumerate(metrics.items()):
+        delta = f"{value - before[name]:+,}" if compare else None
+        with columns[i % 4]:
+            st.metric(name, f"{value:,}", delta,
+                      delta_color="inverse" if "fallid" in name else "normal")
+
+    sms, prev_sms = current.get("sms", {}), previous.get("sms", {})
+    label, prev_label = month, compare or "—"
+
+    def comparison(current_counts, previous_counts, column, title):
+        if not current_counts and not previous_counts:
+            st.info("No hay datos para este mes")
+            return
+        fig = create_month_comparison_chart(current_counts, previous_counts, label, prev_label, title)
+        st.plotly_chart(fig, use_container_width=True)
+        table = compare_counts(current_counts, previous_counts, column)
+        st.dataframe(table if compare else table[[column, "Mes"]], use_container_width=True, hide_index=True)
+
+    tab = lazy_tabs(["📊 Estados", "📡 Operadores", "👆 Clicks", "🔴 Fallos"], key="tab_mensual")
+
+    if tab == "📊 Estados":
+        comparison(sms.get("states", {}), prev_sms.get("states", {}), "Estado", "SMS por Estado")
+        comparison(current.get("whatsapp", {}).get("states", {}), previous.get("whatsapp", {}).get("states", {}),
+                   "Estado", "WhatsApp por Estado")
+
+    if tab == "📡 Operadores":
+        comparison(sms.get("operators", {}), prev_sms.get("operators", {}), "Operador", "SMS por Operador")
+
+    if tab == "👆 Clicks":
+        clicks, prev_clicks = sms.get("clicks", {}), prev_sms.get("clicks", {})
+        names = {f"total_clicks_url{i}": f"URL {i}" for i in range(1, len(CLICK_COLUMNS) + 1)}
+        comparison({names[k]: v for k, v in clicks.items() if k in names},
+                   {names[k]: v for k, v in prev_clicks.items() if k in names}, "URL", "Clicks por URL")
+
+    if tab == "🔴 Fallos":
+        sources = {"sms": "SMS", "whatsapp": "WhatsApp", "interacciones": "Interacciones"}
+        failures = {f"{sources[source]} · {state}": count
+                    for source, aggs in current.items()
+                    for state, count in failure_counts(aggs.get("states", {})).items()}
+        prev_failures = {f"{sources[source]} · {state}": count
+                         for source, aggs in previous.items()
+                         for state, count in failure_counts(aggs.get("states", {})).items()}
+        comparison(failures, prev_failures, "Fallo", "Fallos por Fuente y Estado")
+
+
 def render_sidebar():
     """Renderiza la barra lateral con información mejorada."""
     with st.sidebar:
@@ -768,21 +1007,27 @@ def render_sidebar():
         st.markdown("---")
         st.markdown("### 📊 Estadísticas en Caché")
         
-        try:
-            total_sms = count_total_sms_records()
-            whatsapp_stats = get_whatsapp_statistics()
-            total_inter = count_total_interacciones_records()
-            
+        warmer = get_cache_warmer()
+        status = warmer.status()
+        if warmer.is_ready(["sms_total", "whatsapp_cube", "interacciones_total"]):
             col1, col2 = st.columns(2)
             with col1:
-                st.metric("📱 SMS", f"{total_sms:,}")
-                st.metric("💌 Interacciones", f"{total_inter:,}")
+                st.metric("📱 SMS", f"{count_total_sms_records():,}")
+                st.metric("💌 Interacciones", f"{count_total_interacciones_records():,}")
             with col2:
-                st.metric("💬 WhatsApp", f"{whatsapp_stats['total']:,}")
-            
-        except:
+                st.metric("💬 WhatsApp", f"{get_whatsapp_summary()['total']:,}")
+        else:
             st.info("⏳ Calculando estadísticas...")
         
+        if status["ready"]:
+            st.caption(f"✅ Caché lista ({status['total']} cálculos en {status['seconds']:.1f} s)")
+        else:
+            st.progress(status["done"] / max(status["total"], 1),
+                        text=f"⏳ Preparando caché: {status['done']}/{status['total']}")
+        for name, error in status["errors"].items():
+            st.caption(f"⚠️ {name}: {error}")
+        render_memory_usage()
+        
         st.markdown("---")
         st.markdown("""
         ### 🔑 Diccionario de Colores
@@ -813,15 +1058,40 @@ def render_sidebar():
         st.markdown('<div style="text-align: center; color: #999; font-size: 0.8rem;"><p>© 2026 Todos los derechos reservados</p></div>', unsafe_allow_html=True)
 
 
+def render_memory_usage():
+    """Memoria que ocupan las cachés del proceso frente a su presupuesto (MEMORY_BUDGET_MB)."""
+    memory = memory_budget_info()
+    used_mb, max_mb = memory["bytes"] / 1024 / 1024, memory["max_bytes"] / 1024 / 1024
+    st.progress(min(used_mb / max_mb, 1.0), text=f"🧠 Memoria en caché: {used_mb:,.0f} de {max_mb:,.0f} MB")
+    details = [f"{name}: {cache['entries']} ({cache['bytes'] / 1024 / 1024:,.1f} MB)"
+               for name, cache in memory["caches"].items()]
+    if memory["process_bytes"]:
+        details.append(f"proceso: {memory['process_bytes'] / 1024 / 1024:,.0f} MB")
+    if memory["evictions"]:
+        details.append(f"{memory['evictions']} liberadas")
+    st.caption(" · ".join(details))
+
+
+# Sección → función que la renderiza (en el orden del selector)
+SECTIONS = {
+    "📅 Mensual": render_monthly_section,
+    "📱 SMS": render_sms_section,
+    "💬 WhatsApp": render_whatsapp_section,
+    "💌 Interacciones": render_interacciones_section,
+}
+
+
 def main():
     """Función principal."""
     setup_page()
+    section = render_section_selector()
+    # La sección mensual usa su selector de mes; las demás, los filtros globales
+    monthly = SECTIONS[section] is render_monthly_section
+    section_args = render_month_selector() if monthly else (render_filters(),)
     render_sidebar()
     
     render_header()
-    render_sms_section()
-    render_whatsapp_section()
-    render_interacciones_section()
+    SECTIONS[section](*section_args)
     
     # Footer
     st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
@@ -0,0 +1,334 @@
+"""
+Índices de bitmaps sobre los atributos de pocos valores de cada archivo
+(estado, operador, tipo de mensaje, código de error...).
+
+Por cada columna y valor se guarda el conjunto de filas que lo tienen: como
+bits empaquetados con NumPy (un bit por fila) o, si el valor es poco
+frecuente, como la lista de sus filas, lo que ocupe menos (igual que los
+contenedores de Roaring). Los conteos como "Failed Y Claro Y NO Promocional"
+son AND/OR/NOT entre arreglos de bytes más un conteo de bits: microsegundos,
+sin volver a leer el CSV. Las filas que cumplen la condición se leen después
+del archivo con fetch_rows (solo esas filas).
+
+No depende de Streamlit: lo usa la app (data_loader.py) y se puede consultar
+desde la línea de comandos.
+
+Uso (desde la carpeta scripts/):
+    python bitmap_index.py --fuente sms "Estado del envio=Failed" "Operador=Claro" "!Tipo Mensaje=Promocional"
+    python bitmap_index.py --fuente whatsapp --archivo ../data/mensajes_whatsapp/wa1.csv "Status=Failed,Processing" --filas 10
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from aggregates import CUBE_DIMENSIONS, READ_OPTIONS, column_labels, fill_send_days, read_chunks
+from config import AGGREGATE_CHUNK_SIZE
+
+
+# fuente → columnas indexadas: las mismas dimensiones de los cubos, así el
+# índice responde a nivel de fila los mismos filtros que los cubos
+INDEX_COLUMNS = CUBE_DIMENSIONS
+
+# Día de las filas sin fecha de envío (queda fuera de cualquier rango de fechas)
+NO_DAY = np.iinfo(np.int32).min
+
+# Bits en 1 de cada byte (conteo de bits si NumPy no tiene bitwise_count)
+_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+
+class Bitmap:
+    """
+    Conjunto de filas de un archivo como bits empaquetados (np.packbits: la
+    fila i es el bit i). Se combina con & (Y), | (O), ~ (NO) y - (Y NO).
+    """
+
+    __slots__ = ("bits", "size")
+
+    def __init__(self, bits: np.ndarray, size: int):
+        self.bits = bits
+        self.size = size
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> "Bitmap":
+        return cls(np.packbits(mask), len(mask))
+
+    @classmethod
+    def from_rows(cls, rows: np.ndarray, size: int) -> "Bitmap":
+        mask = np.zeros(size, dtype=bool)
+        mask[rows] = True
+        return cls.from_mask(mask)
+
+    @classmethod
+    def empty(cls, size: int) -> "Bitmap":
+        return cls(np.zeros((size + 7) // 8, dtype=np.uint8), size)
+
+    @classmethod
+    def full(cls, size: int) -> "Bitmap":
+        return ~cls.empty(size)
+
+    def _check(self, other: "Bitmap") -> None:
+        if self.size != other.size:
+            raise ValueError(f"Bitmaps de archivos distintos ({self.size} y {other.size} filas)")
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        self._check(other)
+        return Bitmap(self.bits & other.bits, self.size)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        self._check(other)
+        return Bitmap(self.bits | other.bits, self.size)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        self._check(other)
+        return Bitmap(self.bits & ~other.bits, self.size)
+
+    def __invert__(self) -> "Bitmap":
+        bits = ~self.bits
+        if self.size % 8:
+            # Los bits de relleno del último byte no son filas
+            bits[-1] &= (0xFF << (8 - self.size % 8)) & 0xFF
+        return Bitmap(bits, self.size)
+
+    def count(self) -> int:
+        """Cantidad de filas del conjunto."""
+        if hasattr(np, "bitwise_count"):
+            return int(np.bitwise_count(self.bits).sum())
+        return int(_POPCOUNT[self.bits].sum())
+
+    __len__ = count
+
+    def rows(self, limit: Optional[int] = None) -> np.ndarray:
+        """Números de fila del conjunto (desde 0, en orden), a lo sumo limit."""
+        rows = np.flatnonzero(np.unpackbits(self.bits, count=self.size))
+        return rows if limit is None else rows[:limit]
+
+
+class BitmapIndex:
+    """
+    Índice de un archivo: {columna: {valor: filas}} más el día de envío de
+    cada fila. Las filas de cada valor se guardan como bits empaquetados
+    (uint8) o, si ocupan menos, como números de fila (uint32).
+    """
+
+    def __init__(self, size: int, sets: Dict[str, Dict[str, np.ndarray]],
+                 counts: Dict[str, Dict[str, int]], days: np.ndarray):
+        self.size = size
+        self.sets = sets
+        self.counts = counts
+        self.days = days
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.sets)
+
+    def values(self, column: str) -> List[str]:
+        """Valores de la columna, del más frecuente al menos frecuente."""
+        return sorted(self.counts[column], key=lambda value: -self.counts[column][value])
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria que ocupa el índice."""
+        return self.days.nbytes + sum(rows.nbytes for column in self.sets.values() for rows in column.values())
+
+    def all(self) -> Bitmap:
+        return Bitmap.full(self.size)
+
+    def bitmap(self, column: str, values: Union[str, Iterable[str]]) -> Bitmap:
+        """Filas cuyo valor en la columna es alguno de values (un valor que no existe no tiene filas)."""
+        if isinstance(values, str):
+            values = [values]
+        result = None
+        for value in values:
+            rows = self.sets[column].get(str(value))
+            if rows is None:
+                continue
+            bitmap = Bitmap(rows, self.size) if rows.dtype == np.uint8 else Bitmap.from_rows(rows, self.size)
+            result = bitmap if result is None else result | bitmap
+        return result if result is not None else Bitmap.empty(self.size)
+
+    def date_range(self, first, last) -> Bitmap:
+        """Filas con día de envío entre first y last (inclusive)."""
+        first = np.datetime64(first, "D").astype(np.int64)
+        last = np.datetime64(last, "D").astype(np.int64)
+        return Bitmap.from_mask((self.days >= first) & (self.days <= last))
+
+    def match(self, filters: Optional[Dict] = None) -> Bitmap:
+        """
+        Filas que cumplen los filtros, con el mismo formato que filter_cube:
+        {"dates": (desde, hasta) o None, columna: [valores]}; se ignoran las
+        columnas que el índice no tiene y las listas vacías.
+        """
+        result = self.all()
+        for column, values in (filters or {}).items():
+            if column == "dates":
+                if values:
+                    result &= self.date_range(*values)
+            elif values and column in self.sets:
+                result &= self.bitmap(column, values)
+        return result
+
+    def value_counts(self, column: str, within: Optional[Bitmap] = None) -> Dict[str, int]:
+        """{valor: filas} de la columna, solo entre las filas de within si se da; de mayor a menor."""
+        if within is None:
+            counts = self.counts[column]
+        else:
+            counts = {value: (self.bitmap(column, value) & within).count() for value in self.sets[column]}
+        return {value: count for value, count in sorted(counts.items(), key=lambda item: -item[1]) if count > 0}
+
+
+def _row_sets(codes: np.ndarray, n_values: int) -> List[np.ndarray]:
+    """Filas de cada código: bits empaquetados o números de fila, lo que ocupe menos."""
+    order = np.argsort(codes, kind="stable").astype(np.uint32)
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=n_values))])
+    packed_bytes = (len(codes) + 7) // 8
+    sets = []
+    for code in range(n_values):
+        rows = order[bounds[code]:bounds[code + 1]]
+        sets.append(rows if rows.nbytes < packed_bytes else Bitmap.from_rows(rows, len(codes)).bits)
+    return sets
+
+
+def build_index(source: str, path, columns: Optional[List[str]] = None,
+                send_days_by_id: pd.Series = None) -> BitmapIndex:
+    """
+    Índice de un archivo en una pasada por bloques.
+
+    Args:
+        source: "sms", "whatsapp" o "interacciones"
+        path: Archivo de la fuente
+        columns: Columnas a indexar (por defecto INDEX_COLUMNS de la fuente)
+        send_days_by_id: Id Envio → día (sms_send_days), para las filas sin fecha
+    """
+    columns = list(columns or INDEX_COLUMNS[source])
+    extra = columns + (["Id Envio"] if send_days_by_id is not None else [])
+    codes: Dict[str, List[np.ndarray]] = {column: [] for column in columns}
+    values: Dict[str, Dict[str, int]] = {column: {} for column in columns}
+    days = []
+    for chunk, chunk_days in read_chunks(source, path, extra_columns=extra):
+        fill_send_days(chunk, chunk_days, send_days_by_id)
+        day_numbers = chunk_days.astype(np.int64)
+        day_numbers[np.isnat(chunk_days)] = NO_DAY
+        days.append(day_numbers.astype(np.int32))
+        for column in columns:
+            # Códigos del bloque → códigos del archivo
+            chunk_codes, uniques = pd.factorize(column_labels(chunk, column))
+            known = values[column]
+            mapping = np.array([known.setdefault(value, len(known)) for value in uniques], dtype=np.int32)
+            codes[column].append(mapping[chunk_codes])
+
+    size = int(sum(len(part) for part in days))
+    sets, counts = {}, {}
+    for column in columns:
+        column_codes = np.concatenate(codes[column]) if codes[column] else np.array([], dtype=np.int32)
+        row_sets = _row_sets(column_codes, len(values[column]))
+        value_counts = np.bincount(column_codes, minlength=len(values[column]))
+        sets[column] = {value: row_sets[code] for value, code in values[column].items()}
+        counts[column] = {value: int(value_counts[code]) for value, code in values[column].items()}
+    return BitmapIndex(size, sets, counts, np.concatenate(days) if days else np.array([], dtype=np.int32))
+
+
+def fetch_rows(source: str, path, rows: np.ndarray, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Lee del archivo solo las filas indicadas (números de fila del índice, en
+    orden) como texto. Deja de leer al pasar la última fila pedida; el índice
+    del resultado es el número de fila en el archivo.
+    """
+    encoding, delimiter, _ = READ_OPTIONS[source]
+    wanted = set(columns) if columns else None
+    reader = pd.read_csv(
+        path,
+        encoding=encoding,
+        delimiter=delimiter,
+        usecols=None if wanted is None else (lambda column: column.strip() in wanted),
+        dtype=str,
+        chunksize=AGGREGATE_CHUNK_SIZE,
+    )
+    rows = np.asarray(rows, dtype=np.int64)
+    if not len(rows):
+        return pd.DataFrame()
+    parts = []
+    with reader:
+        offset = 0
+        for chunk in reader:
+            if offset > rows[-1]:
+                break
+            selected = rows[(rows >= offset) & (rows < offset + len(chunk))]
+            if len(selected):
+                part = chunk.iloc[selected - offset]
+                part.index = selected
+                parts.append(part)
+            offset += len(chunk)
+    if not parts:
+        return pd.DataFrame()
+    result = pd.concat(parts)
+    result.columns = [column.strip() for column in result.columns]
+    return result
+
+
+# ============= LÍNEA DE COMANDOS =============
+
+def _condition(index: BitmapIndex, text: str) -> Bitmap:
+    """"columna=v1,v2" → filas con alguno de los valores; con "!" adelante, las que no."""
+    negate = text.startswith("!")
+    column, _, values = text.lstrip("!").partition("=")
+    if column not in index.sets:
+        raise ValueError(f"Columna no indexada: {column} (indexadas: {', '.join(index.columns)})")
+    bitmap = index.bitmap(column, values.split(","))
+    return ~bitmap if negate else bitmap
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python bitmap_index.py",
+        description="Cuenta las filas de un archivo que cumplen condiciones sobre sus columnas indexadas.",
+    )
+    parser.add_argument("condiciones", nargs="*",
+                        help='"columna=v1,v2" (alguno de los valores) o "!columna=v1" (ninguno); se combinan con Y')
+    parser.add_argument("--fuente", choices=list(INDEX_COLUMNS), default="sms", help="Fuente del archivo (por defecto sms)")
+    parser.add_argument("--archivo", help="Archivo a indexar (por defecto el de la fuente en data/)")
+    parser.add_argument("--filas", type=int, default=0, help="Mostrar las primeras N filas que cumplen")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de la línea de comandos."""
+    from config import INTERACCIONES_FILE, SMS_FILE, WHATSAPP_FILES
+
+    args = _parser().parse_args(argv)
+    default = {"sms": SMS_FILE, "interacciones": INTERACCIONES_FILE,
+               "whatsapp": WHATSAPP_FILES[0] if WHATSAPP_FILES else None}[args.fuente]
+    path = Path(args.archivo) if args.archivo else default
+    if path is None or not path.exists():
+        print(f"❌ No existe el archivo: {path}", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    index = build_index(args.fuente, path)
+    print(f"✓ Índice de {index.size:,} filas construido en {time.perf_counter() - start:.2f} segundos "
+          f"({index.nbytes / 1024:,.0f} KB)")
+    for column in index.columns:
+        print(f"  {column}: {len(index.counts[column])} valores")
+
+    start = time.perf_counter()
+    try:
+        result = index.all()
+        for text in args.condiciones:
+            result &= _condition(index, text)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    count = result.count()
+    print(f"✓ {count:,} filas cumplen ({(time.perf_counter() - start) * 1e6:,.0f} µs)")
+    if args.filas and count:
+        print(fetch_rows(args.fuente, path, result.rows(args.filas)).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
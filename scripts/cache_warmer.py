@@ -0,0 +1,76 @@
+"""
+Precalentamiento de cachés en segundo plano.
+
+Las funciones cacheadas de data_loader.py se calculan la primera vez que
+alguien las llama; sin precalentar, ese costo lo paga el primer usuario.
+CacheWarmer las ejecuta una vez en un pool de hilos al iniciar la app (la
+caché es del proceso y del disco, así que sirve a todas las sesiones) y
+reporta el avance para que la app muestre "preparando" en lugar de bloquearse
+calculándolas de nuevo.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+
+
+class CacheWarmer:
+    """Ejecuta una vez cada tarea {nombre: función sin argumentos} y guarda su estado."""
+
+    def __init__(self, tasks: Dict[str, Callable[[], object]], workers: int = 2):
+        self.tasks = dict(tasks)
+        self.workers = max(1, workers)
+        self._lock = threading.Lock()
+        self._seconds: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    def start(self) -> "CacheWarmer":
+        """Inicia el precalentamiento en un hilo de fondo (solo la primera vez)."""
+        with self._lock:
+            if self._started is not None:
+                return self
+            self._started = time.time()
+        threading.Thread(target=self._run, name="cache-warmer", daemon=True).start()
+        return self
+
+    def _run(self) -> None:
+        # Las tareas se envían en el orden del diccionario (primero los resúmenes)
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="cache-warmer") as pool:
+            for name, task in self.tasks.items():
+                pool.submit(self._warm, name, task)
+        self._finished = time.time()
+
+    def _warm(self, name: str, task: Callable[[], object]) -> None:
+        start = time.time()
+        try:
+            task()
+        except Exception as e:
+            # La sección volverá a llamar la función y mostrará el error
+            with self._lock:
+                self._errors[name] = str(e)
+        else:
+            with self._lock:
+                self._seconds[name] = time.time() - start
+
+    def is_ready(self, names: Optional[Iterable[str]] = None) -> bool:
+        """True si las tareas indicadas (por defecto todas) ya terminaron, bien o con error."""
+        names = self.tasks if names is None else [name for name in names if name in self.tasks]
+        with self._lock:
+            return all(name in self._seconds or name in self._errors for name in names)
+
+    def status(self) -> Dict:
+        """Avance del precalentamiento: total, listas, errores y segundos transcurridos."""
+        with self._lock:
+            done = len(self._seconds) + len(self._errors)
+            errors = dict(self._errors)
+        end = self._finished or time.time()
+        return {
+            "total": len(self.tasks),
+            "done": done,
+            "errors": errors,
+            "ready": done == len(self.tasks),
+            "seconds": end - self._started if self._started else 0.0,
+        }
@@ -0,0 +1,261 @@
+"""
+Generador de carga para el servicio de validación (validador_servicio.py).
+Mide rendimiento (solicitudes o filas por segundo) y latencias p50/p90/p99.
+
+Uso (desde la carpeta scripts/):
+    python carga_validador.py --lanzar                          # inicia un servicio temporal
+    python carga_validador.py --modo unitario --solicitudes 50000 --conexiones 32
+    python carga_validador.py --modo lote --filas 1000000 --conexiones 2 --formato csv
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+import numpy as np
+
+
+PUERTO = 8765
+
+
+def generar_numeros(cantidad: int, repetidos: float = 0.3, semilla: int = 0) -> List[str]:
+    """
+    Números de prueba con formatos variados (+57, espacios, guiones) y una
+    fracción de repetidos; ~5% no son celulares válidos.
+    """
+    rng = np.random.default_rng(semilla)
+    distintos = max(1, int(cantidad * (1 - repetidos)))
+    bases = rng.integers(3_000_000_000, 3_600_000_000, size=distintos)
+    bases[rng.random(distintos) < 0.05] -= 1_000_000_000
+    elegidos = bases[rng.integers(0, distintos, size=cantidad)]
+
+    formatos = ('{}', '+57{}', '57 {}', '{} ', '+57 {}')
+    estilo = rng.integers(0, len(formatos), size=cantidad)
+    numeros = []
+    for numero, indice in zip(elegidos.tolist(), estilo.tolist()):
+        texto = str(numero)
+        if indice == 4:
+            texto = f'{texto[:3]} {texto[3:6]} {texto[6:]}'
+        numeros.append(formatos[indice].format(texto))
+    return numeros
+
+
+def percentiles(latencias: List[float]) -> Dict[str, float]:
+    """Percentiles de latencia en milisegundos."""
+    if not latencias:
+        return {}
+    valores = np.asarray(latencias) * 1000
+    return {
+        'p50_ms': round(float(np.percentile(valores, 50)), 3),
+        'p90_ms': round(float(np.percentile(valores, 90)), 3),
+        'p99_ms': round(float(np.percentile(valores, 99)), 3),
+        'p999_ms': round(float(np.percentile(valores, 99.9)), 3),
+        'max_ms': round(float(valores.max()), 3),
+    }
+
+
+class ConexionHTTP:
+    """Cliente HTTP/1.1 mínimo con keep-alive (Content-Length o chunked)."""
+
+    def __init__(self, host: str, puerto: int):
+        self.host = host
+        self.puerto = puerto
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def abrir(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.puerto)
+
+    async def cerrar(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+    async def solicitar(self, metodo: str, ruta: str, cuerpo: bytes = b'',
+                        tipo: str = 'text/plain', al_primer_byte=None) -> Tuple[int, int, int]:
+        """Envía una solicitud y lee la respuesta; retorna (estado, bytes, líneas)."""
+        cabecera = f'{metodo} {ruta} HTTP/1.1\r\nHost: {self.host}\r\n'
+        if cuerpo:
+            cabecera += f'Content-Type: {tipo}\r\nContent-Length: {len(cuerpo)}\r\n'
+        self._writer.write(cabecera.encode('latin-1') + b'\r\n' + cuerpo)
+        await self._writer.drain()
+
+        respuesta = await self._reader.readuntil(b'\r\n\r\n')
+        if al_primer_byte is not None:
+            al_primer_byte()
+        lineas = respuesta.decode('latin-1').split('\r\n')
+        estado = int(lineas[0].split(' ')[1])
+        encabezados = {}
+        for linea in lineas[1:]:
+            nombre, _, valor = linea.partition(':')
+            encabezados[nombre.strip().lower()] = valor.strip()
+
+        total = filas = 0
+        if encabezados.get('transfer-encoding') == 'chunked':
+            while True:
+                tamano = int(await self._reader.readuntil(b'\r\n'), 16)
+                if tamano == 0:
+                    await self._reader.readuntil(b'\r\n')
+                    break
+                datos = await self._reader.readexactly(tamano + 2)
+                total += tamano
+                filas += datos.count(b'\n') - 1
+        else:
+            datos = await self._reader.readexactly(int(encabezados.get('content-length', 0)))
+            total, filas = len(datos), datos.count(b'\n')
+        return estado, total, filas
+
+
+async def carga_unitaria(host: str, puerto: int, numeros: List[str], conexiones: int) -> Dict:
+    """Consultas GET /validar?numero=... repartidas en varias conexiones keep-alive."""
+    rutas = [f'/validar?numero={quote(numero)}' for numero in numeros]
+    latencias: List[float] = []
+    errores = 0
+
+    async def cliente(inicio: int) -> None:
+        nonlocal errores
+        conexion = ConexionHTTP(host, puerto)
+        await conexion.abrir()
+        try:
+            for ruta in rutas[inicio::conexiones]:
+                t0 = time.perf_counter()
+                estado, _, _ = await conexion.solicitar('GET', ruta)
+                latencias.append(time.perf_counter() - t0)
+                errores += estado != 200
+        finally:
+            await conexion.cerrar()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(i) for i in range(conexiones)))
+    duracion = time.perf_counter() - inicio
+
+    return {
+        'modo': 'unitario',
+        'solicitudes': len(rutas),
+        'conexiones': conexiones,
+        'errores': errores,
+        'segundos': round(duracion, 3),
+        'solicitudes_por_segundo': round(len(rutas) / duracion, 1),
+        **percentiles(latencias),
+    }
+
+
+async def carga_lote(host: str, puerto: int, numeros: List[str], conexiones: int,
+                     formato: str, repeticiones: int) -> Dict:
+    """Lotes POST /lote (un número por línea) enviados en paralelo por varias conexiones."""
+    cuerpo = ('\n'.join(numeros) + '\n').encode('utf-8')
+    latencias: List[float] = []
+    primeros_bytes: List[float] = []
+    filas_recibidas = 0
+    errores = 0
+
+    async def cliente() -> None:
+        nonlocal filas_recibidas, errores
+        conexion = ConexionHTTP(host, puerto)
+        await conexion.abrir()
+        try:
+            for _ in range(repeticiones):
+                t0 = time.perf_counter()
+                estado, _, filas = await conexion.solicitar(
+                    'POST', f'/lote?formato={formato}', cuerpo,
+                    al_primer_byte=lambda: primeros_bytes.append(time.perf_counter() - t0),
+                )
+                latencias.append(time.perf_counter() - t0)
+                filas -= formato == 'csv'  # encabezado
+                filas_recibidas += filas
+                errores += estado != 200 or filas != len(numeros)
+        finally:
+            await conexion.cerrar()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(conexiones)))
+    duracion = time.perf_counter() - inicio
+
+    return {
+        'modo': 'lote',
+        'lotes': conexiones * repeticiones,
+        'filas_por_lote': len(numeros),
+        'formato': formato,
+        'errores': errores,
+        'segundos': round(duracion, 3),
+        'filas_por_segundo': round(filas_recibidas / duracion, 1),
+        'primer_byte_p50_ms': percentiles(primeros_bytes).get('p50_ms'),
+        **percentiles(latencias),
+    }
+
+
+def lanzar_servicio(puerto: int, procesos: int) -> subprocess.Popen:
+    """Inicia validador_servicio.py en un subproceso y espera a que responda."""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'validador_servicio.py')
+    proceso = subprocess.Popen([sys.executable, script, '--puerto', str(puerto), '--procesos', str(procesos)])
+
+    async def esperar() -> None:
+        for _ in range(100):
+            try:
+                conexion = ConexionHTTP('127.0.0.1', puerto)
+                await conexion.abrir()
+                await conexion.solicitar('GET', '/salud')
+                await conexion.cerrar()
+                return
+            except OSError:
+                await asyncio.sleep(0.1)
+        raise SystemExit("❌ El servicio no respondió")
+
+    asyncio.run(esperar())
+    return proceso
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python carga_validador.py',
+        description='Genera carga contra el servicio de validación y mide rendimiento y latencias.',
+    )
+    parser.add_argument('--url', default=f'http://127.0.0.1:{PUERTO}', help='URL del servicio')
+    parser.add_argument('--modo', choices=['unitario', 'lote', 'ambos'], default='ambos',
+                        help='Consultas unitarias, lotes o ambos (por defecto)')
+    parser.add_argument('--solicitudes', type=int, default=20_000, help='Consultas unitarias (por defecto 20,000)')
+    parser.add_argument('--filas', type=int, default=200_000, help='Números por lote (por defecto 200,000)')
+    parser.add_argument('--repeticiones', type=int, default=1, help='Lotes por conexión (por defecto 1)')
+    parser.add_argument('-c', '--conexiones', type=int, default=16, help='Conexiones concurrentes (por defecto 16)')
+    parser.add_argument('--formato', choices=['ndjson', 'csv'], default='ndjson', help='Formato de respuesta del lote')
+    parser.add_argument('--repetidos', type=float, default=0.3, help='Fracción de números repetidos (por defecto 0.3)')
+    parser.add_argument('--lanzar', action='store_true', help='Iniciar un servicio temporal en el puerto de --url')
+    parser.add_argument('-p', '--procesos', type=int, default=1, help='Procesos del servicio temporal (--lanzar)')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de la línea de comandos."""
+    args = _parser().parse_args(argv)
+    url = urlsplit(args.url)
+    host, puerto = url.hostname or '127.0.0.1', url.port or PUERTO
+
+    servicio = lanzar_servicio(puerto, args.procesos) if args.lanzar else None
+    try:
+        resultados = []
+        if args.modo in ('unitario', 'ambos'):
+            numeros = generar_numeros(args.solicitudes, args.repetidos, semilla=1)
+            resultados.append(asyncio.run(carga_unitaria(host, puerto, numeros, args.conexiones)))
+        if args.modo in ('lote', 'ambos'):
+            numeros = generar_numeros(args.filas, args.repetidos, semilla=2)
+            conexiones = min(args.conexiones, 4) if args.modo == 'ambos' else args.conexiones
+            resultados.append(asyncio.run(carga_lote(host, puerto, numeros, conexiones,
+                                                     args.formato, args.repeticiones)))
+    finally:
+        if servicio is not None:
+            servicio.send_signal(signal.SIGINT)
+            servicio.wait()
+
+    for resultado in resultados:
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,31 +10,56 @@ BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 SMS_DIR = DATA_DIR / "mensajes_texto"
 WHATSAPP_DIR = DATA_DIR / "mensajes_whatsapp"
+REPORTS_DIR = BASE_DIR / "reportes_mensajes"
+PARTITIONS_DIR = DATA_DIR / "particiones"  # almacén particionado por mes (partition_store.py)
+RESULT_CACHE_DIR = BASE_DIR / ".cache_resultados"  # caché en disco de data_loader.py (result_cache.py)
 
 # Archivos de datos con fallback automático a muestras pequeñas
-def _resolve_sms_file() -> Path:
-    principal = SMS_DIR / "mensajes_texto.csv"
-    muestra = SMS_DIR / "mensajes_texto_sample.csv"
+def _resolve_sms_file(sms_dir: Path = SMS_DIR) -> Path:
+    principal = sms_dir / "mensajes_texto.csv"
+    muestra = sms_dir / "mensajes_texto_sample.csv"
     return principal if principal.exists() else muestra
 
 
-def _resolve_interacciones_file() -> Path:
-    principal = SMS_DIR / "interacciones.csv"
-    muestra = SMS_DIR / "interacciones_sample.csv"
+def _resolve_interacciones_file(sms_dir: Path = SMS_DIR) -> Path:
+    principal = sms_dir / "interacciones.csv"
+    muestra = sms_dir / "interacciones_sample.csv"
     return principal if principal.exists() else muestra
 
 
-def _resolve_whatsapp_files() -> List[Path]:
-    files = sorted(WHATSAPP_DIR.glob("*.csv"))
+def _resolve_whatsapp_files(whatsapp_dir: Path = WHATSAPP_DIR) -> List[Path]:
+    files = sorted(whatsapp_dir.glob("*.csv"))
     if not files:
         return []
     reales = [f for f in files if "_sample" not in f.name]
     return reales if reales else files
 
 
-SMS_FILE = _resolve_sms_file()
-INTERACCIONES_FILE = _resolve_interacciones_file()
-WHATSAPP_FILES = _resolve_whatsapp_files()
+def resolve_data_files(data_dir: Path = DATA_DIR) -> Dict[str, List[Path]]:
+    """Archivos de cada fuente en un directorio con la misma estructura de data/ (p. ej. uno por cliente)."""
+    data_dir = Path(data_dir)
+    sms_dir = data_dir / "mensajes_texto"
+    return {
+        "sms": [f for f in [_resolve_sms_file(sms_dir)] if f.exists()],
+        "whatsapp": _resolve_whatsapp_files(data_dir / "mensajes_whatsapp"),
+        "interacciones": [f for f in [_resolve_interacciones_file(sms_dir)] if f.exists()],
+    }
+
+
+# SMS_FILE, INTERACCIONES_FILE y WHATSAPP_FILES se resuelven la primera vez
+# que se usan (no al importar config) y quedan fijos para el proceso
+_DATA_FILES = {
+    "SMS_FILE": _resolve_sms_file,
+    "INTERACCIONES_FILE": _resolve_interacciones_file,
+    "WHATSAPP_FILES": _resolve_whatsapp_files,
+}
+
+
+def __getattr__(name: str):
+    if name in _DATA_FILES:
+        value = globals()[name] = _DATA_FILES[name]()
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Configuración de lectura de CSV
 CSV_ENCODING = {
@@ -147,3 +172,41 @@ MESSAGES = {
     "whatsapp_section": "💬 WhatsApp",
     "sankey_section": "🔀 Diagrama de Flujos",
 }
+
+# Diagramas Sankey: los nodos con menos de esta fracción del total de su
+# etapa se agrupan en un nodo "Otros" por etapa
+SANKEY_MIN_SHARE = 0.01
+SANKEY_OTHER_LABEL = "Otros"
+
+# Máximo de enlaces dibujados; los menores se agrupan en "Otros"
+SANKEY_MAX_LINKS = 300
+
+# Series de tiempo: puntos máximos enviados al navegador (~100 KB de JSON);
+# por encima se reduce con LTTB
+TIME_SERIES_MAX_POINTS = 2000
+
+# Figuras ya construidas que se guardan entre reruns (LRU)
+FIGURE_CACHE_SIZE = 64
+
+# Reportes mensuales: columnas con la fecha de envío, en orden de preferencia
+# (las filas sin fecha en la primera se completan con la siguiente)
+SMS_DATE_COLUMNS = ["Fecha y hora procesado", "Fecha de Carga"]
+WHATSAPP_DATE_COLUMNS = ["Date Sent"]
+INTERACCIONES_DATE_COLUMNS = ["Fecha y hora procesado", "Fecha de Carga", "Fecha Envio"]
+
+# Filas por bloque al recorrer un archivo completo para los agregados
+AGGREGATE_CHUNK_SIZE = 200_000
+
+# Hilos que precalientan las cachés de la app al iniciar (cache_warmer.py)
+WARMUP_WORKERS = 2
+
+# Caché de resultados de data_loader.py: tamaño máximo en disco (se borran
+# primero las entradas usadas hace más tiempo) y entradas que se guardan en memoria
+RESULT_CACHE_MAX_MB = 512
+RESULT_CACHE_MEMORY_ENTRIES = 64
+
+# Memoria máxima que ocupan juntas las cachés en memoria del proceso
+# (resultados de data_loader.py y figuras); al pasarla se liberan las entradas
+# usadas hace más tiempo (memory_budget.py). El contenedor tiene 1 GB: el
+# resto queda para los DataFrames que se calculan en cada ejecución.
+MEMORY_BUDGET_MB = 384
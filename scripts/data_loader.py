@@ -8,22 +8,46 @@ import numpy as np
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import streamlit as st
+import config
 from config import (
-    SMS_FILE,
-    WHATSAPP_FILES,
-    INTERACCIONES_FILE,
     SMS_COLUMNS,
     WHATSAPP_COLUMNS,
     CSV_ENCODING,
     DELIMITERS,
+    PARTITIONS_DIR,
 )
+from aggregates import (
+    FILE_DIMENSION,
+    build_cube,
+    concat_cubes,
+    cube_counts,
+    filter_cube,
+    sms_send_days,
+)
+from bitmap_index import BitmapIndex, build_index, fetch_rows
+from partition_store import MANIFEST_FILE, load_month, store_months
+from result_cache import disk_cache
+
+
+# Archivos de cada fuente para @disk_cache: config los resuelve la primera vez
+# que se usan, no al importar este módulo
+def _sms_file() -> Path:
+    return config.SMS_FILE
+
+
+def _whatsapp_files() -> List[Path]:
+    return config.WHATSAPP_FILES
 
 
-@st.cache_data
+def _interacciones_file() -> Path:
+    return config.INTERACCIONES_FILE
+
+
+@disk_cache(_sms_file)
 def load_sms_data(sample: bool = True, sample_size: int = 10000) -> pd.DataFrame:
     """Carga datos SMS optimizados."""
     try:
-        if not SMS_FILE.exists():
+        if not config.SMS_FILE.exists():
             st.warning("No se encontró el archivo SMS. Asegúrate de colocar tus datos en data/mensajes_texto/.")
             return pd.DataFrame()
 
@@ -46,7 +70,7 @@ def load_sms_data(sample: bool = True, sample_size: int = 10000) -> pd.DataFrame
         nrows = sample_size if sample else None
         
         df = pd.read_csv(
-            SMS_FILE,
+            config.SMS_FILE,
             encoding=CSV_ENCODING["sms"],
             delimiter=DELIMITERS["sms"],
             usecols=SMS_COLUMNS,
@@ -61,16 +85,16 @@ def load_sms_data(sample: bool = True, sample_size: int = 10000) -> pd.DataFrame
         return pd.DataFrame()
 
 
-@st.cache_data
+@disk_cache(_whatsapp_files)
 def load_whatsapp_data() -> pd.DataFrame:
     """Carga todos los datos de WhatsApp."""
     try:
-        if not WHATSAPP_FILES:
+        if not config.WHATSAPP_FILES:
             st.warning("No se encontraron archivos de WhatsApp. Coloca tus CSV en data/mensajes_whatsapp/.")
             return pd.DataFrame()
 
         all_dfs = []
-        for wa_file in WHATSAPP_FILES:
+        for wa_file in config.WHATSAPP_FILES:
             if not wa_file.exists():
                 continue
             df = pd.read_csv(
@@ -90,7 +114,7 @@ def load_whatsapp_data() -> pd.DataFrame:
         return pd.DataFrame()
 
 
-@st.cache_data
+@disk_cache(_sms_file)
 def get_sms_statistics() -> Dict:
     """Obtiene estadísticas de SMS."""
     try:
@@ -104,7 +128,7 @@ def get_sms_statistics() -> Dict:
         return {"total": 0, "states": {}}
 
 
-@st.cache_data
+@disk_cache(_whatsapp_files)
 def get_whatsapp_statistics() -> Dict:
     """Obtiene estadísticas de WhatsApp."""
     try:
@@ -121,7 +145,7 @@ def get_whatsapp_statistics() -> Dict:
             states = dict(whatsapp_df[status_col].value_counts())
         
         by_file = {}
-        for wa_file in WHATSAPP_FILES:
+        for wa_file in config.WHATSAPP_FILES:
             try:
                 df = pd.read_csv(
                     wa_file,
@@ -148,14 +172,14 @@ def get_whatsapp_statistics() -> Dict:
         return {"total": 0, "states": {}, "by_file": {}}
 
 
-@st.cache_data
+@disk_cache(_sms_file)
 def get_sms_flow_data() -> Tuple[List, List, List]:
     """Obtiene datos de flujo para SMS."""
     try:
         total_sms = count_total_sms_records()
         
         df = pd.read_csv(
-            SMS_FILE,
+            config.SMS_FILE,
             encoding=CSV_ENCODING["sms"],
             delimiter=DELIMITERS["sms"],
             usecols=["Estado del envio"],
@@ -181,7 +205,7 @@ def get_sms_flow_data() -> Tuple[List, List, List]:
         return [], [], []
 
 
-@st.cache_data
+@disk_cache(_whatsapp_files)
 def get_whatsapp_flow_data() -> Tuple[List, List, List]:
     """Obtiene datos de flujo para WhatsApp."""
     try:
@@ -204,14 +228,14 @@ def get_whatsapp_flow_data() -> Tuple[List, List, List]:
         return [], [], []
 
 
-@st.cache_data
+@disk_cache(_sms_file)
 def count_total_sms_records() -> int:
     """Cuenta total de registros SMS."""
     try:
-        if not SMS_FILE.exists():
+        if not config.SMS_FILE.exists():
             return 0
         import subprocess
-        result = subprocess.run(['wc', '-l', str(SMS_FILE)], 
+        result = subprocess.run(['wc', '-l', str(config.SMS_FILE)], 
                               capture_output=True, text=True, timeout=5)
         if result.returncode == 0:
             return int(result.stdout.split()[0]) - 1
@@ -221,7 +245,7 @@ def count_total_sms_records() -> int:
     count = 0
     chunk_size = 100000
     for chunk in pd.read_csv(
-        SMS_FILE,
+        config.SMS_FILE,
         encoding=CSV_ENCODING["sms"],
         delimiter=DELIMITERS["sms"],
         chunksize=chunk_size,
@@ -231,14 +255,14 @@ def count_total_sms_records() -> int:
     return count
 
 
-@st.cache_data
+@disk_cache(_sms_file)
 def get_sms_states_summary() -> Dict:
     """Obtiene resumen de estados SMS."""
     try:
-        if not SMS_FILE.exists():
+        if not config.SMS_FILE.exists():
             return {}
         df = pd.read_csv(
-            SMS_FILE,
+            config.SMS_FILE,
             encoding=CSV_ENCODING["sms"],
             delimiter=DELIMITERS["sms"],
             usecols=["Estado del envio"],
@@ -263,16 +287,16 @@ def get_sms_states_summary() -> Dict:
         return {}
 
 
-@st.cache_data
+@disk_cache(_sms_file)
 def get_sms_clicks_stats() -> Dict:
     """Calcula estadísticas de clicks SMS."""
     try:
-        if not SMS_FILE.exists():
+        if not config.SMS_FILE.exists():
             return {}
         total_sms = count_total_sms_records()
         
         df = pd.read_csv(
-            SMS_FILE,
+            config.SMS_FILE,
             encoding=CSV_ENCODING["sms"],
             delimiter=DELIMITERS["sms"],
             usecols=["Total Clicks URL 1", "Total Clicks URL 2", "Total Clicks URL 3"],
@@ -329,7 +353,7 @@ def get_sms_clicks_stats() -> Dict:
 def get_sms_file_size() -> str:
     """Obtiene el tamaño del archivo SMS."""
     try:
-        size_bytes = SMS_FILE.stat().st_size
+        size_bytes = config.SMS_FILE.stat().st_size
         size_mb = size_bytes / (1024 * 1024)
         return f"{size_mb:.1f}MB"
     except:
@@ -338,35 +362,35 @@ def get_sms_file_size() -> str:
 
 # ============= FUNCIONES PARA ANÁLISIS DE INTERACCIONES =============
 
-@st.cache_data
+@disk_cache(_interacciones_file)
 def count_total_interacciones_records() -> int:
     """Cuenta total de registros en interacciones.csv."""
     try:
-        if not INTERACCIONES_FILE.exists():
+        if not config.INTERACCIONES_FILE.exists():
             return 0
         import subprocess
-        result = subprocess.run(['wc', '-l', str(INTERACCIONES_FILE)], 
+        result = subprocess.run(['wc', '-l', str(config.INTERACCIONES_FILE)], 
                               capture_output=True, text=True, timeout=5)
         if result.returncode == 0:
             return int(result.stdout.split()[0]) - 1
     except:
         pass
     
-    count = sum(1 for _ in open(INTERACCIONES_FILE, encoding='LATIN1')) - 1
+    count = sum(1 for _ in open(config.INTERACCIONES_FILE, encoding='LATIN1')) - 1
     return count
 
 
-@st.cache_data
+@disk_cache(_interacciones_file)
 def get_interacciones_data(sample: bool = True, sample_size: int = 10000) -> pd.DataFrame:
     """Carga datos de interacciones."""
     try:
-        if not INTERACCIONES_FILE.exists():
+        if not config.INTERACCIONES_FILE.exists():
             st.warning("No se encontró interacciones.csv. Agrega tus datos en data/mensajes_texto/.")
             return pd.DataFrame()
         nrows = sample_size if sample else None
         
         df = pd.read_csv(
-            INTERACCIONES_FILE,
+            config.INTERACCIONES_FILE,
             encoding='LATIN1',
             delimiter=';',
             usecols=['Id Envio', 'Telefono celular', 'Total de mensajes', 'Estado del envio', 'Operador', 'Codigo corto'],
@@ -388,16 +412,16 @@ def get_interacciones_data(sample: bool = True, sample_size: int = 10000) -> pd.
         return pd.DataFrame()
 
 
-@st.cache_data
+@disk_cache(_interacciones_file)
 def get_interacciones_states_summary() -> Dict:
     """Obtiene resumen de estados de interacciones."""
     try:
-        if not INTERACCIONES_FILE.exists():
+        if not config.INTERACCIONES_FILE.exists():
             return {}
         total = count_total_interacciones_records()
         
         df = pd.read_csv(
-            INTERACCIONES_FILE,
+            config.INTERACCIONES_FILE,
             encoding='LATIN1',
             delimiter=';',
             usecols=['Estado del envio'],
@@ -421,14 +445,14 @@ def get_interacciones_states_summary() -> Dict:
         return {}
 
 
-@st.cache_data
+@disk_cache(_interacciones_file)
 def get_interacciones_by_operator() -> Dict:
     """Obtiene estadísticas por operador."""
     try:
         total = count_total_interacciones_records()
         
         df = pd.read_csv(
-            INTERACCIONES_FILE,
+            config.INTERACCIONES_FILE,
             encoding='LATIN1',
             delimiter=';',
             usecols=['Operador'],
@@ -453,14 +477,14 @@ def get_interacciones_by_operator() -> Dict:
         return {}
 
 
-@st.cache_data
+@disk_cache(_interacciones_file)
 def get_interacciones_by_codigo_corto() -> Dict:
     """Obtiene estadísticas por código corto."""
     try:
         total = count_total_interacciones_records()
         
         df = pd.read_csv(
-            INTERACCIONES_FILE,
+            config.INTERACCIONES_FILE,
             encoding='LATIN1',
             delimiter=';',
             usecols=['Codigo corto'],
@@ -485,14 +509,14 @@ def get_interacciones_by_codigo_corto() -> Dict:
         return {}
 
 
-@st.cache_data
+@disk_cache(_interacciones_file)
 def get_interacciones_interaction_flow() -> Tuple[List, List, List]:
     """Obtiene datos para diagrama de flujo de interacciones."""
     try:
         total = count_total_interacciones_records()
         
         df = pd.read_csv(
-            INTERACCIONES_FILE,
+            config.INTERACCIONES_FILE,
             encoding='LATIN1',
             delimiter=';',
             usecols=['Total de mensajes', 'Estado del envio'],
@@ -526,14 +550,14 @@ def get_interacciones_interaction_flow() -> Tuple[List, List, List]:
 
 # ============= FUNCIONES PARA ANÁLISIS DE WHATSAPP FALLIDOS =============
 
-# Importar validador completo
-from phone_validator import validar_numero_colombiano, detectar_patron_sospechoso
-
 def validate_colombian_phone(phone_str: str) -> Dict:
     """
     Valida número celular colombiano usando el validador completo.
     Wrapper para mantener compatibilidad con código existente.
     """
+    # El validador se importa al abrir la pestaña de DQ, no al iniciar la app
+    from phone_validator import validar_numero_colombiano
+
     resultado = validar_numero_colombiano(phone_str)
     
     # Convertir formato del validador al formato esperado por el código existente
@@ -550,28 +574,36 @@ def validate_colombian_phone(phone_str: str) -> Dict:
     return validation
 
 
-@st.cache_data
-def get_whatsapp_failed_analysis() -> Dict:
-    """Analiza números fallidos y en procesamiento en WhatsApp para data quality enriquecido."""
+@disk_cache(_whatsapp_files)
+def get_whatsapp_failed_analysis(filters: Optional[Dict] = None) -> Dict:
+    """
+    Analiza números fallidos y en procesamiento en WhatsApp para data quality enriquecido.
+    Con filtros solo se leen, con el índice de bitmaps, las filas que los cumplen.
+    """
     try:
         all_failed = []
         all_processing = []
         
-        for wa_file in WHATSAPP_FILES:
-            try:
-                df = pd.read_csv(wa_file, encoding='utf-8', delimiter=',')
-                
-                # Mensajes fallidos
-                failed_df = df[df['Status'] == 'Failed'].copy() if 'Status' in df.columns else pd.DataFrame()
-                if not failed_df.empty:
-                    all_failed.append(failed_df)
-                
-                # Mensajes en procesamiento
-                processing_df = df[df['Status'] == 'Processing'].copy() if 'Status' in df.columns else pd.DataFrame()
-                if not processing_df.empty:
-                    all_processing.append(processing_df)
-            except:
-                pass
+        if filters:
+            frames = [get_whatsapp_rows(filters, statuses=["Failed", "Processing"], limit=None)[0]]
+        else:
+            frames = []
+            for wa_file in config.WHATSAPP_FILES:
+                try:
+                    frames.append(pd.read_csv(wa_file, encoding='utf-8', delimiter=','))
+                except:
+                    pass
+        
+        for df in frames:
+            # Mensajes fallidos
+            failed_df = df[df['Status'] == 'Failed'].copy() if 'Status' in df.columns else pd.DataFrame()
+            if not failed_df.empty:
+                all_failed.append(failed_df)
+            
+            # Mensajes en procesamiento
+            processing_df = df[df['Status'] == 'Processing'].copy() if 'Status' in df.columns else pd.DataFrame()
+            if not processing_df.empty:
+                all_processing.append(processing_df)
         
         if not all_failed and not all_processing:
             return {
@@ -697,13 +729,13 @@ def get_whatsapp_failed_analysis() -> Dict:
         return {}
 
 
-@st.cache_data
+@disk_cache(_whatsapp_files)
 def get_whatsapp_failed_details() -> pd.DataFrame:
     """Retorna detalles de mensajes fallidos."""
     try:
         all_failed = []
         
-        for wa_file in WHATSAPP_FILES:
+        for wa_file in config.WHATSAPP_FILES:
             try:
                 df = pd.read_csv(wa_file, encoding='utf-8', delimiter=',')
                 failed_df = df[df['Status'] == 'Failed'].copy() if 'Status' in df.columns else pd.DataFrame()
@@ -723,3 +755,216 @@ def get_whatsapp_failed_details() -> pd.DataFrame:
     
     except Exception as e:
         return pd.DataFrame()
+
+
+# ============= AGREGADOS MENSUALES (ALMACÉN PARTICIONADO) =============
+
+def get_available_months() -> List[str]:
+    """Meses con datos en el almacén particionado (vacío si aún no se ingirió nada)."""
+    return store_months(PARTITIONS_DIR)
+
+
+@disk_cache(PARTITIONS_DIR / MANIFEST_FILE)
+def get_month_aggregates(month: str) -> Dict[str, Dict]:
+    """Agregados de un mes "YYYY-MM" por fuente, leídos solo de su partición."""
+    return load_month(month, PARTITIONS_DIR)
+
+
+# ============= CUBOS Y FILTROS GLOBALES =============
+
+# Filtros de la barra lateral: columna del cubo → etiqueta (además de las fechas)
+FILTER_COLUMNS = {
+    "Operador": "📡 Operador",
+    "Usuario": "👤 Usuario",
+    "Tipo Mensaje": "🏷️ Tipo de Mensaje",
+    FILE_DIMENSION: "📂 Archivo WhatsApp",
+}
+
+
+@disk_cache(_sms_file)
+def get_sms_cube() -> pd.DataFrame:
+    """Cubo de SMS por día, estado, operador, usuario y tipo (una pasada por el archivo)."""
+    try:
+        if not config.SMS_FILE.exists():
+            return concat_cubes([])
+        return build_cube("sms", config.SMS_FILE)
+    except Exception as e:
+        st.warning(f"Error construyendo el cubo de SMS: {e}")
+        return concat_cubes([])
+
+
+@disk_cache(_whatsapp_files)
+def get_whatsapp_cube() -> pd.DataFrame:
+    """Cubo de WhatsApp por archivo, día, estado y código de error."""
+    try:
+        return concat_cubes([build_cube("whatsapp", wa_file) for wa_file in config.WHATSAPP_FILES])
+    except Exception as e:
+        st.warning(f"Error construyendo el cubo de WhatsApp: {e}")
+        return concat_cubes([])
+
+
+@disk_cache(_interacciones_file, _sms_file)
+def get_interacciones_cube() -> pd.DataFrame:
+    """Cubo de interacciones; el día sale del SMS con el mismo Id Envio."""
+    try:
+        if not config.INTERACCIONES_FILE.exists():
+            return concat_cubes([])
+        send_days = sms_send_days(config.SMS_FILE) if config.SMS_FILE.exists() else None
+        return build_cube("interacciones", config.INTERACCIONES_FILE, send_days)
+    except Exception as e:
+        st.warning(f"Error construyendo el cubo de interacciones: {e}")
+        return concat_cubes([])
+
+
+def get_filter_options() -> Dict:
+    """Valores disponibles para los filtros: {"dates": (primer, último día) o None, columna: [valores]}."""
+    cubes = [get_sms_cube(), get_whatsapp_cube(), get_interacciones_cube()]
+    days = pd.concat([cube["day"] for cube in cubes]).dropna()
+    options = {"dates": (days.min().date(), days.max().date()) if len(days) else None}
+    for column in FILTER_COLUMNS:
+        values = set()
+        for cube in cubes:
+            if column in cube.columns:
+                values.update(cube_counts(cube, column))
+        options[column] = sorted(values)
+    return options
+
+
+def flow_from_states(states: Dict[str, int], origin: str = "Enviados") -> Tuple[List, List, List]:
+    """Enlaces origen → estado para el diagrama Sankey."""
+    links = [(origin, str(state), count) for state, count in states.items() if count > 0]
+    return tuple(list(column) for column in zip(*links)) if links else ([], [], [])
+
+
+def get_sms_summary(filters: Optional[Dict] = None) -> Dict:
+    """Totales, estados, operadores, tipos y clicks de los SMS que cumplen los filtros."""
+    cube = filter_cube(get_sms_cube(), filters)
+    total = int(cube["rows"].sum()) if not cube.empty else 0
+    clicks = {column: int(cube[column].sum()) if column in cube.columns else 0
+              for column in ("clicks_url1", "clicks_url2", "clicks_url3",
+                             "total_clicks_url1", "total_clicks_url2", "total_clicks_url3")}
+    with_any_click = int(cube["any_click"].sum()) if "any_click" in cube.columns else 0
+    return {
+        "total": total,
+        "states": cube_counts(cube, "Estado del envio"),
+        "operators": cube_counts(cube, "Operador"),
+        "message_types": cube_counts(cube, "Tipo Mensaje"),
+        "clicks": {
+            "total_with_clicks": with_any_click,
+            "total_sms": total,
+            "percentage": round(with_any_click / total * 100, 2) if total > 0 else 0,
+            **clicks,
+        },
+    }
+
+
+def get_whatsapp_summary(filters: Optional[Dict] = None) -> Dict:
+    """Total, estados y estados por archivo de los WhatsApp que cumplen los filtros."""
+    cube = filter_cube(get_whatsapp_cube(), filters)
+    by_file = {}
+    for file_name in cube_counts(cube, FILE_DIMENSION):
+        file_cube = cube[cube[FILE_DIMENSION] == file_name]
+        by_file[file_name] = {"count": int(file_cube["rows"].sum()), "states": cube_counts(file_cube, "Status")}
+    return {
+        "total": int(cube["rows"].sum()) if not cube.empty else 0,
+        "states": cube_counts(cube, "Status"),
+        "by_file": by_file,
+    }
+
+
+def get_interacciones_summary(filters: Optional[Dict] = None) -> Dict:
+    """Total, estados, operadores, códigos cortos y flujo de las interacciones que cumplen los filtros."""
+    cube = filter_cube(get_interacciones_cube(), filters)
+    source, target, value = [], [], []
+    # Flujo "N msgs" → estado de las 5 cantidades de mensajes más frecuentes
+    for messages in list(cube_counts(cube, "Total de mensajes"))[:5]:
+        for state, count in cube_counts(cube[cube["Total de mensajes"] == messages], "Estado del envio").items():
+            source.append(f"{messages} msgs")
+            target.append(state)
+            value.append(count)
+    return {
+        "total": int(cube["rows"].sum()) if not cube.empty else 0,
+        "states": cube_counts(cube, "Estado del envio"),
+        "operators": cube_counts(cube, "Operador"),
+        "short_codes": cube_counts(cube, "Codigo corto"),
+        "flow": (source, target, value),
+    }
+
+
+# ============= ÍNDICES DE BITMAPS (FILAS QUE CUMPLEN LOS FILTROS) =============
+
+@disk_cache(_sms_file)
+def get_sms_index() -> Optional[BitmapIndex]:
+    """Índice de bitmaps del archivo SMS (una pasada por el archivo)."""
+    try:
+        return build_index("sms", config.SMS_FILE) if config.SMS_FILE.exists() else None
+    except Exception as e:
+        st.warning(f"Error construyendo el índice de SMS: {e}")
+        return None
+
+
+@disk_cache(_whatsapp_files)
+def get_whatsapp_indexes() -> Dict[str, BitmapIndex]:
+    """Índice de bitmaps de cada archivo de WhatsApp: {nombre del archivo: índice}."""
+    try:
+        return {wa_file.name: build_index("whatsapp", wa_file) for wa_file in config.WHATSAPP_FILES}
+    except Exception as e:
+        st.warning(f"Error construyendo los índices de WhatsApp: {e}")
+        return {}
+
+
+@disk_cache(_interacciones_file, _sms_file)
+def get_interacciones_index() -> Optional[BitmapIndex]:
+    """Índice de bitmaps de interacciones; el día sale del SMS con el mismo Id Envio."""
+    try:
+        if not config.INTERACCIONES_FILE.exists():
+            return None
+        send_days = sms_send_days(config.SMS_FILE) if config.SMS_FILE.exists() else None
+        return build_index("interacciones", config.INTERACCIONES_FILE, send_days_by_id=send_days)
+    except Exception as e:
+        st.warning(f"Error construyendo el índice de interacciones: {e}")
+        return None
+
+
+def _matching_rows(source: str, files: Dict[Path, BitmapIndex], filters: Optional[Dict],
+                   limit: Optional[int], columns: Optional[List[str]] = None,
+                   extra: Optional[Dict] = None) -> Tuple[pd.DataFrame, int]:
+    """
+    (primeras limit filas que cumplen los filtros, total de filas que los
+    cumplen) de los archivos de una fuente. extra: condiciones {columna:
+    [valores]} que se suman a los filtros.
+    """
+    parts, total = [], 0
+    for path, index in files.items():
+        rows = index.match({**(filters or {}), **(extra or {})}).rows()
+        total += len(rows)
+        pending = None if limit is None else limit - sum(len(part) for part in parts)
+        if len(rows) and (pending is None or pending > 0):
+            parts.append(fetch_rows(source, path, rows[:pending], columns))
+    return (pd.concat(parts) if parts else pd.DataFrame()), total
+
+
+@disk_cache(_sms_file)
+def get_sms_rows(filters: Optional[Dict] = None, limit: Optional[int] = 100) -> Tuple[pd.DataFrame, int]:
+    """(primeros limit SMS que cumplen los filtros, total que los cumplen)."""
+    index = get_sms_index()
+    return _matching_rows("sms", {config.SMS_FILE: index} if index else {}, filters, limit, SMS_COLUMNS)
+
+
+@disk_cache(_whatsapp_files)
+def get_whatsapp_rows(filters: Optional[Dict] = None, statuses: Optional[List[str]] = None,
+                      limit: Optional[int] = 100) -> Tuple[pd.DataFrame, int]:
+    """(primeros limit WhatsApp que cumplen los filtros y, si se dan, con alguno de los statuses; total)."""
+    indexes = get_whatsapp_indexes()
+    selected = (filters or {}).get(FILE_DIMENSION)
+    files = {wa_file: indexes[wa_file.name] for wa_file in config.WHATSAPP_FILES
+             if wa_file.name in indexes and (not selected or wa_file.name in selected)}
+    return _matching_rows("whatsapp", files, filters, limit, extra={"Status": statuses})
+
+
+@disk_cache(_interacciones_file, _sms_file)
+def get_interacciones_rows(filters: Optional[Dict] = None, limit: Optional[int] = 100) -> Tuple[pd.DataFrame, int]:
+    """(primeras limit interacciones que cumplen los filtros, total que los cumplen)."""
+    index = get_interacciones_index()
+    columns = ['Id Envio', 'Telefono celular', 'Total de mensajes', 'Estado del envio', 'Operador', 'Codigo corto']
+    return _matching_rows("interacciones", {config.INTERACCIONES_FILE: index} if index else {}, filters, limit, columns)
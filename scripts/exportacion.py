@@ -0,0 +1,197 @@
+"""
+Exportación de resultados de validación por bloques.
+Genera CSV, CSV comprimido (gzip / zip) o Parquet solo cuando se pide,
+expandiendo a texto y escribiendo un bloque de filas a la vez.
+"""
+
+import gzip
+import importlib.util
+import io
+import zipfile
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from phone_validator import COLUMNAS_RESULTADO, expandir_resultados
+
+
+# formato → (descripción, extensión, tipo MIME)
+FORMATOS_EXPORTACION = {
+    'csv': ('CSV', '.csv', 'text/csv'),
+    'csv.gz': ('CSV comprimido (gzip)', '.csv.gz', 'application/gzip'),
+    'zip': ('CSV comprimido (zip)', '.zip', 'application/zip'),
+    'parquet': ('Parquet', '.parquet', 'application/vnd.apache.parquet'),
+}
+
+# Parquet necesita pyarrow: Streamlit lo instala, pero este módulo también se
+# usa sin Streamlit (p. ej. desde el servicio HTTP)
+PARQUET_DISPONIBLE = importlib.util.find_spec('pyarrow') is not None
+
+# Filas que se expanden a texto por bloque
+TAMANO_BLOQUE = 100_000
+
+
+class ExportacionResultados:
+    """
+    Exporta un resultado compacto (ver validar_lista_numeros_compacto).
+
+    Cada exportación se genera cuando se pide y por bloques: de cada bloque
+    se expanden a texto solo las filas seleccionadas (p. ej. solo válidos) y
+    se escriben en el destino, comprimiendo al vuelo. No se guarda nada
+    entre exportaciones, así el objeto ocupa lo mismo que el resultado
+    compacto.
+
+    Los números originales pueden ser un arreglo con todas las filas o una
+    función sin argumentos que los retorna por bloques (p. ej. releyendo el
+    archivo cargado), para no tenerlos todos en memoria.
+    """
+
+    def __init__(self, df_compacto: pd.DataFrame, numeros_originales=None,
+                 tamano_bloque: int = TAMANO_BLOQUE):
+        self.compacto = df_compacto
+        self.originales = numeros_originales
+        self.tamano_bloque = tamano_bloque
+
+    def __len__(self) -> int:
+        return len(self.compacto)
+
+    def _bloques_originales(self) -> Iterator[Optional[np.ndarray]]:
+        """Números originales en bloques de tamano_bloque filas (None si no hay)."""
+        if self.originales is None:
+            for _ in range(0, len(self.compacto), self.tamano_bloque):
+                yield None
+        elif not callable(self.originales):
+            for inicio in range(0, len(self.compacto), self.tamano_bloque):
+                yield np.asarray(self.originales[inicio:inicio + self.tamano_bloque], dtype=object)
+        else:
+            # Los bloques de la entrada no tienen por qué ser de tamano_bloque filas
+            pendiente = np.empty(0, dtype=object)
+            for bloque in self.originales():
+                pendiente = np.concatenate((pendiente, np.asarray(bloque, dtype=object)))
+                while len(pendiente) >= self.tamano_bloque:
+                    yield pendiente[:self.tamano_bloque]
+                    pendiente = pendiente[self.tamano_bloque:]
+            if len(pendiente):
+                yield pendiente
+
+    def _bloques_texto(self, mascara: Optional[np.ndarray]) -> Iterator[pd.DataFrame]:
+        """Expande a texto, por bloques, las filas seleccionadas (todas si mascara es None)."""
+        inicios = range(0, len(self.compacto), self.tamano_bloque)
+        for inicio, originales in zip(inicios, self._bloques_originales()):
+            bloque = self.compacto.iloc[inicio:inicio + self.tamano_bloque]
+            if mascara is not None:
+                filas = np.flatnonzero(mascara[inicio:inicio + self.tamano_bloque])
+                if len(filas) == 0:
+                    continue
+                bloque = bloque.iloc[filas]
+                originales = None if originales is None else originales[filas]
+            yield expandir_resultados(bloque, originales)
+
+    def _trozos_csv(self, mascara: Optional[np.ndarray]) -> Iterator[bytes]:
+        """Encabezado y filas seleccionadas en CSV, un trozo por bloque."""
+        yield (','.join(COLUMNAS_RESULTADO) + '\n').encode('utf-8')
+        for df in self._bloques_texto(mascara):
+            yield serializar_filas(df, 'csv')[0]
+
+    def _escribir_parquet(self, destino, mascara: Optional[np.ndarray]) -> None:
+        """Escribe un grupo de filas de Parquet por bloque."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        esquema = pa.schema([
+            (columna, pa.bool_() if columna in ('valido', 'sospechoso', 'en_lista_negra') else pa.string())
+            for columna in COLUMNAS_RESULTADO
+        ])
+        escritor = pq.ParquetWriter(destino, esquema)
+        try:
+            for df in self._bloques_texto(mascara):
+                originales = df['numero_original'].astype(object)
+                df = df.assign(numero_original=originales.where(originales.notna(), None).map(
+                    lambda valor: valor if valor is None else str(valor)
+                ))
+                escritor.write_table(pa.Table.from_pandas(df, schema=esquema, preserve_index=False))
+        finally:
+            escritor.close()
+
+    def escribir(self, destino, formato: str = 'csv', mascara: Optional[np.ndarray] = None,
+                 nombre: str = 'resultados') -> None:
+        """
+        Escribe la exportación en un archivo binario abierto, por bloques.
+
+        Args:
+            destino: Archivo binario (o BytesIO) de salida
+            formato: Una de las claves de FORMATOS_EXPORTACION
+            mascara: Filas a exportar (None = todas)
+            nombre: Nombre del CSV dentro del zip
+        """
+        if formato not in FORMATOS_EXPORTACION:
+            raise ValueError(f"Formato no soportado: {formato}")
+        if formato == 'parquet' and not PARQUET_DISPONIBLE:
+            raise ValueError("Para exportar Parquet instala pyarrow (pip install pyarrow)")
+        if mascara is not None:
+            mascara = np.asarray(mascara, dtype=bool)
+
+        if formato == 'parquet':
+            self._escribir_parquet(destino, mascara)
+        elif formato == 'csv':
+            for trozo in self._trozos_csv(mascara):
+                destino.write(trozo)
+        elif formato == 'csv.gz':
+            with gzip.GzipFile(fileobj=destino, mode='wb', compresslevel=6) as comprimido:
+                for trozo in self._trozos_csv(mascara):
+                    comprimido.write(trozo)
+        else:
+            with zipfile.ZipFile(destino, 'w', compression=zipfile.ZIP_DEFLATED) as archivo_zip:
+                with archivo_zip.open(f'{nombre}.csv', 'w', force_zip64=True) as comprimido:
+                    for trozo in self._trozos_csv(mascara):
+                        comprimido.write(trozo)
+
+    def exportar(self, formato: str = 'csv', mascara: Optional[np.ndarray] = None,
+                 nombre: str = 'resultados') -> bytes:
+        """Igual que escribir, pero retorna los bytes (p. ej. para st.download_button)."""
+        salida = io.BytesIO()
+        self.escribir(salida, formato, mascara, nombre)
+        return salida.getvalue()
+
+
+def serializar_filas(df: pd.DataFrame, formato: str = 'csv') -> Tuple[bytes, np.ndarray]:
+    """
+    Serializa filas de resultados sin encabezado, en CSV o NDJSON.
+
+    Retorna (bytes, posición donde termina cada fila), para poder tomar
+    cualquier subconjunto de filas del buffer sin volver a serializar.
+    """
+    if formato == 'ndjson':
+        # JSON escapa los saltos de línea: cada línea es una fila
+        texto = df.to_json(orient='records', lines=True, force_ascii=False).encode('utf-8') if len(df) else b''
+        return texto, np.flatnonzero(np.frombuffer(texto, dtype=np.uint8) == ord('\n')) + 1
+
+    texto = df.to_csv(index=False, header=False, lineterminator='\n').encode('utf-8')
+    finales = np.flatnonzero(np.frombuffer(texto, dtype=np.uint8) == ord('\n')) + 1
+
+    if len(finales) != len(df):
+        # Algún valor trae saltos de línea (va entre comillas): solo el
+        # último salto de cada fila la termina
+        saltos = sum(
+            df[columna].astype(object).map(lambda valor: valor.count('\n') if isinstance(valor, str) else 0)
+            for columna in df.columns if df[columna].dtype != bool
+        )
+        finales = finales[np.cumsum(np.asarray(saltos, dtype=np.int64) + 1) - 1]
+
+    return texto, finales
+
+
+def nombre_archivo(nombre: str, formato: str) -> str:
+    """Nombre de archivo con la extensión del formato (p. ej. "validacion.csv.gz")."""
+    return nombre + FORMATOS_EXPORTACION[formato][1]
+
+
+def tipo_mime(formato: str) -> str:
+    return FORMATOS_EXPORTACION[formato][2]
+
+
+def descripciones_formatos() -> Dict[str, str]:
+    """{formato: descripción} para un selector (Parquet solo si pyarrow está instalado)."""
+    return {formato: datos[0] for formato, datos in FORMATOS_EXPORTACION.items()
+            if formato != 'parquet' or PARQUET_DISPONIBLE}
@@ -0,0 +1,134 @@
+"""
+Presupuesto de memoria compartido por las cachés en memoria del proceso.
+
+Cada caché (resultados de data_loader.py en result_cache.py y figuras en
+visualizations.py) informa cuántos bytes ocupa y cuándo usó por última vez su
+entrada más antigua. La de resultados cuenta los bytes serializados (pickle)
+que guarda, no el deep_size de los objetos: la copia que recibe cada llamada
+al deserializar no cuenta en el presupuesto. Cuando la suma de todas pasa de MEMORY_BUDGET_MB se
+liberan las entradas usadas hace más tiempo, sin importar de qué caché son:
+los resultados siguen en el disco (la próxima lectura sale de ahí) y las
+figuras se vuelven a construir. Una entrada más grande que el presupuesto no
+se guarda en memoria.
+"""
+
+import os
+import sys
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import MEMORY_BUDGET_MB
+
+
+def deep_size(value) -> int:
+    """
+    Bytes que ocupa value incluyendo lo que contiene: DataFrames y Series
+    (memory_usage profundo), arreglos de NumPy, diccionarios, listas y figuras
+    de Plotly (sus datos como diccionario).
+    """
+    seen = set()
+
+    def size(item) -> int:
+        if id(item) in seen:
+            return 0
+        seen.add(id(item))
+        if isinstance(item, (pd.DataFrame, pd.Series, pd.Index)):
+            usage = item.memory_usage(deep=True)
+            return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+        if isinstance(item, np.ndarray):
+            return sys.getsizeof(item) + (item.nbytes if item.base is None else 0)
+        if isinstance(item, dict):
+            return sys.getsizeof(item) + sum(size(key) + size(val) for key, val in item.items())
+        if isinstance(item, (list, tuple, set, frozenset)):
+            return sys.getsizeof(item) + sum(size(element) for element in item)
+        if hasattr(item, "to_plotly_json"):
+            return sys.getsizeof(item) + size(item.to_plotly_json())
+        return sys.getsizeof(item)
+
+    return size(value)
+
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def process_memory() -> Optional[int]:
+    """Memoria residente del proceso en bytes (None si el sistema no la informa)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class MemoryBudget:
+    """
+    Límite de bytes para varias cachés a la vez. Cada caché registrada debe
+    tener memory_usage() → (entradas, bytes), oldest_use() → momento
+    (time.monotonic) del último uso de su entrada más antigua, None si está
+    vacía, y evict_oldest() → bytes liberados al quitar esa entrada.
+    """
+
+    def __init__(self, max_bytes: int = MEMORY_BUDGET_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._caches: List[Tuple[str, object]] = []
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+    def register(self, name: str, cache) -> None:
+        with self._lock:
+            self._caches.append((name, cache))
+
+    def fits(self, nbytes: int) -> bool:
+        """Si una entrada de este tamaño se puede guardar en memoria."""
+        return nbytes <= self.max_bytes
+
+    def used(self) -> int:
+        return sum(cache.memory_usage()[1] for _, cache in self._caches)
+
+    def enforce(self) -> int:
+        """
+        Quita las entradas usadas hace más tiempo (de cualquier caché) hasta
+        quedar dentro del presupuesto; retorna los bytes liberados. Las cachés
+        lo llaman después de guardar, sin tener tomado su propio candado.
+        """
+        freed = 0
+        with self._lock:
+            while self.used() > self.max_bytes:
+                oldest = [(cache.oldest_use(), cache) for _, cache in self._caches]
+                oldest = [(used, cache) for used, cache in oldest if used is not None]
+                if not oldest:
+                    break
+                _, cache = min(oldest, key=lambda item: item[0])
+                released = cache.evict_oldest()
+                freed += released
+                self.evictions += 1
+                self.evicted_bytes += released
+        return freed
+
+    def info(self) -> Dict:
+        """Bytes usados y límite, por caché, liberaciones y memoria del proceso."""
+        caches = {}
+        for name, cache in self._caches:
+            entries, nbytes = cache.memory_usage()
+            caches[name] = {"entries": entries, "bytes": nbytes}
+        return {
+            "bytes": sum(entry["bytes"] for entry in caches.values()),
+            "max_bytes": self.max_bytes,
+            "caches": caches,
+            "evictions": self.evictions,
+            "evicted_bytes": self.evicted_bytes,
+            "process_bytes": process_memory(),
+        }
+
+
+# Presupuesto del proceso: lo comparten la caché de resultados y la de figuras
+MEMORY_BUDGET = MemoryBudget()
+
+
+def memory_budget_info() -> Dict:
+    """Estado del presupuesto de memoria del proceso (ver MemoryBudget.info)."""
+    return MEMORY_BUDGET.info()
@@ -0,0 +1,385 @@
+"""
+Almacén de datos particionado por mes de envío.
+
+La ingesta recorre cada archivo de SMS, WhatsApp e interacciones una sola vez:
+copia cada fila a la partición de su mes y calcula los agregados de cada
+partición (ver aggregates.py). La app y los reportes leen solo los agregados
+de los meses que muestran, sin volver a recorrer los datos crudos. Un archivo
+cuya huella (tamaño y fecha de modificación) no cambió no se vuelve a ingerir.
+
+Estructura:
+    data/particiones/
+        manifest.json                               # huella y meses de cada archivo ingerido
+        sms/envios/<archivo>.csv                    # Id Envio → día (para fechar interacciones)
+        <fuente>/<YYYY-MM>/filas/<archivo>          # filas del mes, mismo formato que el original
+        <fuente>/<YYYY-MM>/agregados/<archivo>.json # agregados del mes de ese archivo
+        <fuente>/<YYYY-MM>/agregados.json           # agregados del mes (todos los archivos)
+
+Uso (desde la carpeta scripts/):
+    python partition_store.py                       # ingiere lo que cambió en data/
+    python partition_store.py --datos /ruta/cliente/data --forzar
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from aggregates import (
+    AGGREGATES_VERSION,
+    CLICK_COLUMNS,
+    NO_DATE,
+    READ_OPTIONS,
+    SOURCES,
+    aggregate_chunks,
+    merge_counts,
+    read_chunks,
+)
+from config import DATA_DIR, PARTITIONS_DIR, SMS_STATE_MAPPING, WHATSAPP_STATE_MAPPING, resolve_data_files
+from utils import file_fingerprint
+
+
+# Cambia cuando cambia la estructura del almacén (obliga a volver a ingerir todo)
+STORE_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+SEND_DAYS_DIR = "envios"
+ROWS_DIR = "filas"
+FILE_AGGREGATES_DIR = "agregados"
+PARTITION_AGGREGATES_FILE = "agregados.json"
+
+# Estados (ya traducidos con los mapeos de config) que cuentan como fallo
+FAILURE_STATES = ("Fallido", "Rechazado")
+
+
+# ============= ARCHIVOS DEL ALMACÉN =============
+
+def write_json(path: Path, data) -> None:
+    """Escribe un JSON de forma atómica (nunca queda a medio escribir)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + ".tmp")
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(temporary, path)
+
+
+def _read_json(path: Path, default=None):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def store_dir_for(data_dir=None) -> Path:
+    """Almacén de un directorio de datos (por defecto el del proyecto)."""
+    return Path(data_dir) / PARTITIONS_DIR.name if data_dir else PARTITIONS_DIR
+
+
+def read_manifest(store_dir=PARTITIONS_DIR) -> Dict:
+    manifest = _read_json(Path(store_dir) / MANIFEST_FILE, {})
+    if manifest.get("version") != [STORE_VERSION, AGGREGATES_VERSION]:
+        return {"version": [STORE_VERSION, AGGREGATES_VERSION], "files": {}}
+    return manifest
+
+
+def _month_labels(days: np.ndarray) -> np.ndarray:
+    months = days.astype("datetime64[M]")
+    return np.where(np.isnat(months), NO_DATE, months.astype(str))
+
+
+def _load_send_days(store_dir: Path) -> Optional[pd.Series]:
+    """Id Envio → día de envío de los SMS ya ingeridos (None si no hay)."""
+    files = sorted((store_dir / "sms" / SEND_DAYS_DIR).glob("*.csv"))
+    if not files:
+        return None
+    frame = pd.concat([pd.read_csv(f, dtype={"id": str}, parse_dates=["day"]) for f in files], ignore_index=True)
+    frame = frame.drop_duplicates("id")
+    return pd.Series(frame["day"].to_numpy(dtype="datetime64[D]"), index=frame["id"])
+
+
+def _send_days_fingerprint(store_dir: Path) -> str:
+    return ";".join(file_fingerprint(str(f)) for f in sorted((store_dir / "sms" / SEND_DAYS_DIR).glob("*.csv")))
+
+
+# ============= INGESTA =============
+
+def _ingest_file(source: str, path: Path, store_dir: Path) -> Dict[str, Dict]:
+    """
+    Una pasada por el archivo: escribe sus filas en la partición de cada mes y
+    retorna sus agregados por mes. Se ejecuta en el proceso principal o en un worker.
+    """
+    encoding, delimiter, _ = READ_OPTIONS[source]
+    send_days = _load_send_days(store_dir) if source == "interacciones" else None
+    written = set()
+    sent_ids = []
+
+    def chunks():
+        for chunk, days in read_chunks(source, path, all_columns=True):
+            # Interacciones sin fecha propia: el día del SMS con el mismo Id Envio
+            if send_days is not None and "Id Envio" in chunk.columns:
+                missing = np.isnat(days)
+                if missing.any():
+                    ids = chunk["Id Envio"].str.strip().to_numpy(dtype=object)[missing]
+                    days[missing] = send_days.reindex(ids).to_numpy(dtype="datetime64[D]")
+            if source == "sms" and "Id Envio" in chunk.columns:
+                sent = pd.DataFrame({"id": chunk["Id Envio"].str.strip(), "day": days})
+                sent_ids.append(sent[~np.isnat(days)].drop_duplicates("id"))
+
+            for month, rows in chunk.groupby(_month_labels(days), sort=False):
+                target = store_dir / source / month / ROWS_DIR / path.name
+                first = month not in written
+                if first:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                rows.to_csv(target, mode="w" if first else "a", header=first, sep=delimiter,
+                            encoding=encoding, index=False)
+                written.add(month)
+            yield chunk, days
+
+    months = aggregate_chunks(source, chunks(), path.name)
+
+    if source == "sms":
+        target = store_dir / "sms" / SEND_DAYS_DIR / f"{path.name}.csv"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        sent = pd.concat(sent_ids, ignore_index=True).drop_duplicates("id") if sent_ids \
+            else pd.DataFrame({"id": [], "day": []})
+        sent.assign(day=sent["day"].astype(str)).to_csv(target, index=False)
+    return months
+
+
+def _remove_file_outputs(store_dir: Path, source: str, name: str, months: List[str]) -> None:
+    """Borra lo que dejó una ingesta anterior del archivo (filas, agregados y envíos)."""
+    for month in months:
+        partition = store_dir / source / month
+        for stale in (partition / ROWS_DIR / name, partition / FILE_AGGREGATES_DIR / f"{name}.json"):
+            stale.unlink(missing_ok=True)
+    if source == "sms":
+        (store_dir / "sms" / SEND_DAYS_DIR / f"{name}.csv").unlink(missing_ok=True)
+
+
+def _merge_partition(store_dir: Path, source: str, month: str) -> None:
+    """Vuelve a combinar los agregados de los archivos de una partición (o la borra si quedó vacía)."""
+    partition = store_dir / source / month
+    parts = sorted((partition / FILE_AGGREGATES_DIR).glob("*.json"))
+    if not parts:
+        shutil.rmtree(partition, ignore_errors=True)
+        return
+    merged: Dict = {}
+    for part in parts:
+        merge_counts(merged, _read_json(part, {}))
+    write_json(partition / PARTITION_AGGREGATES_FILE, merged)
+
+
+def ingest(files: Optional[Dict[str, List[Path]]] = None, data_dir=None, store_dir=None,
+           workers: int = 1, force: bool = False,
+           progress: Callable[[str], None] = lambda message: None) -> List[Path]:
+    """
+    Particiona por mes los archivos nuevos o modificados y actualiza los agregados.
+
+    Args:
+        files: {fuente: [archivos]} explícitos (por defecto los de data_dir)
+        data_dir: Directorio con la estructura de data/ (por defecto el del proyecto)
+        store_dir: Directorio del almacén (por defecto <data_dir>/particiones)
+        workers: Procesos para ingerir varios archivos a la vez
+        force: Volver a ingerir todo aunque no haya cambiado
+        progress: Función que recibe los mensajes de avance
+
+    Returns:
+        Archivos que se ingirieron
+    """
+    files = files or resolve_data_files(data_dir or DATA_DIR)
+    store_dir = Path(store_dir) if store_dir else store_dir_for(data_dir)
+    manifest = read_manifest(store_dir)
+    if force or not manifest["files"]:
+        # Sin manifiesto válido no se sabe qué hay en disco: se empieza de cero
+        for source in SOURCES:
+            shutil.rmtree(store_dir / source, ignore_errors=True)
+        manifest["files"] = {}
+
+    touched = set()
+    current = {str(Path(path).resolve()) for paths in files.values() for path in paths}
+    for key in [key for key in manifest["files"] if key not in current]:
+        entry = manifest["files"].pop(key)
+        _remove_file_outputs(store_dir, entry["source"], Path(key).name, entry["months"])
+        touched.update((entry["source"], month) for month in entry["months"])
+        progress(f"  ✓ Retirado {Path(key).name}")
+
+    ingested: List[Path] = []
+    # Los SMS van antes que las interacciones: de ellos sale la fecha de las interacciones
+    for phase in (("sms", "whatsapp"), ("interacciones",)):
+        depends = _send_days_fingerprint(store_dir)
+        stale: List[Tuple[str, Path, str]] = []
+        for source in phase:
+            for path in map(Path, files.get(source, [])):
+                key = str(path.resolve())
+                fingerprint = file_fingerprint(key)
+                entry = manifest["files"].get(key)
+                if entry and entry["fingerprint"] == fingerprint and \
+                        entry.get("depends", "") == (depends if source == "interacciones" else ""):
+                    continue
+                if entry:
+                    _remove_file_outputs(store_dir, source, path.name, entry["months"])
+                    touched.update((source, month) for month in entry["months"])
+                stale.append((source, path, fingerprint))
+
+        if workers > 1 and len(stale) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(stale))) as pool:
+                results = list(pool.map(_ingest_file, [s[0] for s in stale], [s[1] for s in stale],
+                                        [store_dir] * len(stale)))
+        else:
+            results = [_ingest_file(source, path, store_dir) for source, path, _ in stale]
+
+        for (source, path, fingerprint), months in zip(stale, results):
+            for month, aggregates in months.items():
+                write_json(store_dir / source / month / FILE_AGGREGATES_DIR / f"{path.name}.json", aggregates)
+            manifest["files"][str(path.resolve())] = {
+                "source": source,
+                "fingerprint": fingerprint,
+                "depends": depends if source == "interacciones" else "",
+                "months": sorted(months),
+            }
+            touched.update((source, month) for month in months)
+            ingested.append(path)
+            progress(f"  ✓ Particionado {path.name}: {len(months)} mes(es)")
+
+    for source, month in sorted(touched):
+        _merge_partition(store_dir, source, month)
+    if touched or not (store_dir / MANIFEST_FILE).exists():
+        write_json(store_dir / MANIFEST_FILE, manifest)
+    return ingested
+
+
+# ============= LECTURA DE AGREGADOS =============
+
+def store_months(store_dir=PARTITIONS_DIR) -> List[str]:
+    """Meses con datos fechados en alguna fuente (solo lista directorios)."""
+    store_dir = Path(store_dir)
+    months = {
+        partition.name
+        for source in SOURCES if (store_dir / source).is_dir()
+        for partition in (store_dir / source).iterdir()
+        if (partition / PARTITION_AGGREGATES_FILE).exists()
+    }
+    return sorted(months - {NO_DATE})
+
+
+def load_month(month: str, store_dir=PARTITIONS_DIR) -> Dict[str, Dict]:
+    """{fuente: agregados del mes} leyendo solo los agregados de esa partición ({} si no hay)."""
+    store_dir = Path(store_dir)
+    return {source: _read_json(store_dir / source / month / PARTITION_AGGREGATES_FILE, {}) for source in SOURCES}
+
+
+def load_months(months: Optional[List[str]] = None, store_dir=PARTITIONS_DIR) -> Dict[str, Dict[str, Dict]]:
+    """{fuente: {mes: agregados}} de los meses pedidos (por defecto todos, incluido NO_DATE)."""
+    store_dir = Path(store_dir)
+    if months is None:
+        months = store_months(store_dir) + [NO_DATE]
+    loaded: Dict[str, Dict[str, Dict]] = {source: {} for source in SOURCES}
+    for month in months:
+        for source, aggregates in load_month(month, store_dir).items():
+            if aggregates:
+                loaded[source][month] = aggregates
+    return loaded
+
+
+# ============= COMPARACIÓN ENTRE MESES =============
+
+def previous_month(month: str) -> str:
+    """Mes calendario anterior ("2026-01" → "2025-12")."""
+    return str(np.datetime64(month, "M") - 1)
+
+
+def is_failure(state: str) -> bool:
+    """True si el estado (de SMS, WhatsApp o interacciones) es un fallo o rechazo."""
+    return SMS_STATE_MAPPING.get(state, WHATSAPP_STATE_MAPPING.get(state, state)) in FAILURE_STATES
+
+
+def failure_counts(states: Dict[str, int]) -> Dict[str, int]:
+    """Solo los estados que son fallos."""
+    return {state: count for state, count in states.items() if is_failure(state)}
+
+
+def month_metrics(aggregates: Dict[str, Dict]) -> Dict[str, int]:
+    """Indicadores principales de un mes (los de month-over-month)."""
+    sms = aggregates.get("sms") or {}
+    whatsapp = aggregates.get("whatsapp") or {}
+    interacciones = aggregates.get("interacciones") or {}
+    clicks = sms.get("clicks", {})
+    return {
+        "SMS": sms.get("total", 0),
+        "WhatsApp": whatsapp.get("total", 0),
+        "Interacciones": interacciones.get("total", 0),
+        "SMS con clicks": clicks.get("total_with_clicks", 0),
+        "Total clicks": sum(clicks.get(f"total_clicks_url{i}", 0) for i in range(1, len(CLICK_COLUMNS) + 1)),
+        "SMS fallidos": sum(failure_counts(sms.get("states", {})).values()),
+        "WhatsApp fallidos": sum(failure_counts(whatsapp.get("states", {})).values()),
+        "Interacciones fallidas": sum(failure_counts(interacciones.get("states", {})).values()),
+    }
+
+
+def compare_counts(current: Dict[str, int], previous: Dict[str, int], label: str) -> pd.DataFrame:
+    """
+    Tabla [label, Mes, Anterior, Cambio, Cambio %] de dos conteos, de mayor a menor
+    en el mes actual. "Cambio %" queda vacío si el valor anterior es 0.
+    """
+    keys = list(dict.fromkeys(list(current) + list(previous)))
+    now = np.array([current.get(key, 0) for key in keys], dtype=np.int64)
+    before = np.array([previous.get(key, 0) for key in keys], dtype=np.int64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent = np.where(before > 0, (now - before) / np.maximum(before, 1) * 100, np.nan)
+    table = pd.DataFrame({label: keys, "Mes": now, "Anterior": before, "Cambio": now - before,
+                          "Cambio %": np.round(percent, 1)})
+    return table.sort_values(["Mes", "Anterior"], ascending=False, kind="stable").reset_index(drop=True)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python partition_store.py",
+        description="Particiona por mes de envío los datos de SMS, WhatsApp e interacciones y precalcula sus agregados.",
+    )
+    parser.add_argument("--datos", help="Directorio con la estructura de data/ (por defecto el del proyecto)")
+    parser.add_argument("--almacen", help="Directorio del almacén (por defecto <datos>/particiones)")
+    parser.add_argument("-p", "--procesos", type=int, default=1, help="Archivos ingeridos en paralelo (por defecto 1)")
+    parser.add_argument("--forzar", action="store_true", help="Volver a particionar todo aunque no haya cambiado")
+    parser.add_argument("-q", "--silencioso", action="store_true", help="No mostrar el progreso")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de la línea de comandos."""
+    args = _parser().parse_args(argv)
+
+    def progress(message: str) -> None:
+        if not args.silencioso:
+            print(message, file=sys.stderr, flush=True)
+
+    if args.datos and not Path(args.datos).is_dir():
+        print(f"❌ No existe el directorio de datos: {args.datos}", file=sys.stderr)
+        return 1
+
+    start = time.time()
+    store_dir = Path(args.almacen) if args.almacen else store_dir_for(args.datos)
+    try:
+        ingested = ingest(data_dir=args.datos, store_dir=store_dir, workers=args.procesos,
+                          force=args.forzar, progress=progress)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"❌ Error al particionar: {e}", file=sys.stderr)
+        return 1
+
+    if not ingested:
+        progress("✓ Sin cambios: el almacén ya estaba al día")
+    progress(f"✓ Meses disponibles: {', '.join(store_months(store_dir)) or 'ninguno'}")
+    progress(f"✓ Tiempo total: {time.time() - start:.2f} segundos")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
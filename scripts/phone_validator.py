@@ -3,10 +3,19 @@ Módulo para validación de números telefónicos de Colombia.
 Validación completa de números móviles con detección de operadores y patrones sospechosos.
 """
 
+import json
+import os
 import re
+import tempfile
+import threading
+import unicodedata
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from collections import Counter
+from itertools import islice
+
+from utils import file_fingerprint
 
 
 # Definición de prefijos válidos por operador (después del +57 y 3)
@@ -115,6 +124,10 @@ def identificar_operador(numero_movil: str) -> str:
     return 'Desconocido'
 
 
+# Operador de cada prefijo de 3 dígitos (índice = prefijo), para la validación por lotes
+_OPERADORES_POR_PREFIJO = np.array([identificar_operador(f'{p:03d}') for p in range(1000)], dtype=object)
+
+
 def detectar_patron_sospechoso(numero_movil: str) -> Tuple[bool, str]:
     """
     Detecta si el número tiene patrones sospechosos.
@@ -169,6 +182,270 @@ def detectar_patron_sospechoso(numero_movil: str) -> Tuple[bool, str]:
     return False, ""
 
 
+# Tabla de razones de sospecha: el código de cada razón es su posición en la lista.
+# El código 0 ("") indica que el número no es sospechoso.
+RAZONES_SOSPECHA = [
+    "",
+    "Todos los dígitos son iguales",
+    "Termina en 4 o más ceros",
+    "Contiene secuencia ascendente",
+    "Contiene secuencia descendente",
+    "Más de 4 dígitos consecutivos iguales",
+]
+_BASE_REPETITIVO = len(RAZONES_SOSPECHA)
+RAZONES_SOSPECHA += [f"Patrón repetitivo ({a}{b} x 4)" for a in range(10) for b in range(10)]
+_BASE_ALTERNANTE = len(RAZONES_SOSPECHA)
+RAZONES_SOSPECHA += [f"Patrón alternante detectado: {a}{b} x 3" for a in range(10) for b in range(10)]
+
+CODIGOS_SOSPECHA = {razon: codigo for codigo, razon in enumerate(RAZONES_SOSPECHA)}
+
+
+def matriz_digitos(numeros_moviles) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convierte números móviles de 10 dígitos en una matriz N×10 de dígitos.
+    
+    Args:
+        numeros_moviles: Secuencia de números sin código de país (str) o
+            arreglo entero (uint64) con los números ya convertidos
+        
+    Returns:
+        Tupla (matriz uint8 N×10, máscara de filas con 10 dígitos ASCII)
+    """
+    numeros = np.asarray(numeros_moviles)
+    
+    if numeros.dtype.kind in 'iu':
+        valores = numeros.astype(np.uint64)
+        digitos = np.empty((len(valores), 10), dtype=np.uint8)
+        resto = valores.copy()
+        for posicion in range(9, -1, -1):
+            digitos[:, posicion] = resto % 10
+            resto //= 10
+        return digitos, valores < 10 ** 10
+    
+    # Cada carácter como su código Unicode; las filas cortas quedan con ceros de relleno
+    texto = numeros.astype('U10')
+    codigos = texto.view(np.uint32).reshape(len(texto), 10).astype(np.int64) - ord('0')
+    ok = ((codigos >= 0) & (codigos <= 9)).all(axis=1)
+    ok &= np.char.str_len(numeros.astype(str)) == 10
+    
+    digitos = np.where(ok[:, None], codigos, 0).astype(np.uint8)
+    return digitos, ok
+
+
+def _ventanas(mascara: np.ndarray, ancho: int) -> np.ndarray:
+    """Ventanas deslizantes (sobre el eje 0) donde todos los valores son True."""
+    largo = len(mascara) - ancho + 1
+    resultado = mascara[:largo].copy()
+    for desplazamiento in range(1, ancho):
+        resultado &= mascara[desplazamiento:desplazamiento + largo]
+    return resultado
+
+
+def detectar_patrones_sospechosos_lote(numeros_moviles) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Versión vectorizada de detectar_patron_sospechoso para muchos números.
+    
+    Evalúa las mismas reglas, en el mismo orden, sobre una matriz de dígitos
+    usando diferencias, comparaciones desplazadas y ventanas deslizantes.
+    Las filas que no tienen exactamente 10 dígitos ASCII se evalúan con la
+    función individual para conservar el mismo resultado.
+    
+    Args:
+        numeros_moviles: Secuencia de números sin código de país (str) o
+            arreglo entero (uint64)
+        
+    Returns:
+        Tupla (es_sospechoso: bool[N], codigos: uint8[N]) donde
+        RAZONES_SOSPECHA[codigo] es la razón (igual a la de la versión individual)
+    """
+    digitos, ok = matriz_digitos(numeros_moviles)
+    n = len(digitos)
+    codigos = np.zeros(n, dtype=np.uint8)
+    pendiente = ok.copy()
+    filas = np.arange(n)
+    
+    # Matriz transpuesta (10×N): cada posición es un vector contiguo
+    d = np.ascontiguousarray(digitos.T).astype(np.int8)
+    
+    def asignar(mascara: np.ndarray, codigo) -> None:
+        mascara = mascara & pendiente
+        codigos[mascara] = codigo[mascara] if isinstance(codigo, np.ndarray) else codigo
+        pendiente[mascara] = False
+    
+    diferencias = d[1:] - d[:-1]
+    
+    # 1. Todos los dígitos iguales
+    asignar(np.logical_and.reduce(diferencias == 0, axis=0), 1)
+    
+    # 2. Termina en muchos ceros
+    asignar(np.logical_and.reduce(d[6:] == 0, axis=0), 2)
+    
+    # 3. Secuencia ascendente/descendente de 5 dígitos (4 diferencias de ±1)
+    ascendente = _ventanas(diferencias == 1, 4)
+    descendente = _ventanas(diferencias == -1, 4)
+    secuencia = ascendente | descendente
+    primera = secuencia.argmax(axis=0)
+    es_ascendente = ascendente[primera, filas]
+    asignar(secuencia.any(axis=0), np.where(es_ascendente, 3, 4).astype(np.uint8))
+    
+    # 4. Más de 4 dígitos consecutivos iguales (5 iguales = 4 diferencias nulas)
+    asignar(_ventanas(diferencias == 0, 4).any(axis=0), 5)
+    
+    # 5. Patrón repetitivo ABABABAB al inicio
+    repetitivo = np.logical_and.reduce(d[0:8:2] == d[0], axis=0)
+    repetitivo &= np.logical_and.reduce(d[1:8:2] == d[1], axis=0)
+    pares = d[0].astype(np.int16) * 10 + d[1]
+    asignar(repetitivo, (_BASE_REPETITIVO + pares).astype(np.uint8))
+    
+    # 5b. Patrón alternante ABABAB en cualquier ventana de 6 dígitos
+    alternante = _ventanas(d[2:] == d[:-2], 4) & (diferencias[:5] != 0)
+    inicio = alternante.argmax(axis=0)
+    pares_alternantes = d[inicio, filas].astype(np.int16) * 10 + d[inicio + 1, filas]
+    asignar(alternante.any(axis=0), (_BASE_ALTERNANTE + pares_alternantes).astype(np.uint8))
+    
+    # Filas fuera del formato de 10 dígitos: misma lógica de la versión individual
+    numeros = np.asarray(numeros_moviles)
+    for i in np.flatnonzero(~ok):
+        _, razon = detectar_patron_sospechoso(str(numeros[i]))
+        codigos[i] = CODIGOS_SOSPECHA[razon]
+    
+    return codigos > 0, codigos
+
+
+# ==================== MEMO DE VALIDACIÓN ====================
+
+# Máximo de números limpios que se recuerdan entre llamadas (y reruns de Streamlit)
+MEMO_MAX_ENTRADAS = 500_000
+
+# Campos del resultado que dependen solo del número limpio y se guardan en el memo
+CAMPOS_MEMO = ('categoria', 'operador', 'mensaje_error', 'razon_sospecha')
+
+COLUMNAS_RESULTADO = [
+    'numero_original',
+    'numero_limpio',
+    'numero_completo',
+    'valido',
+    'categoria',
+    'operador',
+    'mensaje_error',
+    'sospechoso',
+    'razon_sospecha',
+    'en_lista_negra',
+]
+
+
+class MemoValidacion:
+    """
+    Memo LRU acotado y seguro entre hilos: número limpio → resultado.
+    
+    Los resultados son tuplas (ver CAMPOS_MEMO) compartidas entre todas las
+    entradas que resultan iguales, así que cada entrada solo ocupa su clave.
+    Al ser un objeto del módulo, sobrevive entre llamadas y reruns de Streamlit.
+    """
+    
+    def __init__(self, max_entradas: int = MEMO_MAX_ENTRADAS):
+        self.max_entradas = max_entradas
+        self._datos: Dict[str, Tuple] = {}
+        self._compartidas: Dict[Tuple, Tuple] = {}
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+    
+    def obtener_varios(self, claves) -> List[Optional[Tuple]]:
+        """Busca varias claves; las encontradas pasan a ser las más recientes."""
+        resultados = []
+        with self._lock:
+            datos = self._datos
+            for clave in claves:
+                valor = datos.pop(clave, None)
+                if valor is not None:
+                    datos[clave] = valor
+                resultados.append(valor)
+            encontrados = sum(valor is not None for valor in resultados)
+            self.aciertos += encontrados
+            self.fallos += len(resultados) - encontrados
+        return resultados
+    
+    def guardar_varios(self, claves, valores) -> None:
+        """Guarda resultados y descarta los menos usados si se supera el límite."""
+        with self._lock:
+            datos = self._datos
+            for clave, valor in zip(claves, valores):
+                datos.pop(clave, None)
+                datos[clave] = self._compartidas.setdefault(valor, valor)
+            exceso = len(datos) - self.max_entradas
+            if exceso > 0:
+                for clave in list(islice(datos, exceso)):
+                    del datos[clave]
+    
+    def limpiar(self) -> None:
+        with self._lock:
+            self._datos.clear()
+            self._compartidas.clear()
+            self.aciertos = 0
+            self.fallos = 0
+    
+    def info(self) -> Dict:
+        with self._lock:
+            return {
+                'entradas': len(self._datos),
+                'max_entradas': self.max_entradas,
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+            }
+
+
+_MEMO = MemoValidacion()
+
+
+def info_memo_validacion() -> Dict:
+    """Retorna el estado del memo de validación (entradas, aciertos, fallos)."""
+    return _MEMO.info()
+
+
+def limpiar_memo_validacion() -> None:
+    """Vacía el memo de validación compartido por el proceso."""
+    _MEMO.limpiar()
+
+
+def _validar_limpio(numero_limpio: str) -> Tuple[str, str, str, str]:
+    """
+    Valida un número ya limpio.
+    
+    Returns:
+        Tupla (categoria, operador, mensaje_error, razon_sospecha)
+    """
+    if not numero_limpio:
+        return 'Vacío', 'N/A', 'Número vacío o nulo', ''
+    
+    # Extraer número móvil (sin +57)
+    numero_movil, tiene_57 = extraer_numero_movil(numero_limpio)
+    
+    # Validar que solo tenga dígitos
+    if not numero_movil.isdigit():
+        return 'Formato inválido', 'N/A', 'Contiene caracteres no numéricos después de limpiar', ''
+    
+    # Validar longitud (debe ser 10 dígitos)
+    if len(numero_movil) != 10:
+        return 'Longitud inválida', 'N/A', f'Longitud inválida: {len(numero_movil)} dígitos (esperado: 10)', ''
+    
+    # Validar que comience con 3 (celular)
+    if not numero_movil.startswith('3'):
+        return 'No es celular', 'N/A', 'No comienza con 3 (no es celular)', ''
+    
+    # Identificar operador (la tabla de portabilidad, si hay, tiene prioridad sobre el prefijo)
+    operador = (_PORTABILIDAD and _PORTABILIDAD.operador(numero_movil)) or identificar_operador(numero_movil)
+    
+    if operador == 'Desconocido':
+        prefijo = numero_movil[:3]
+        return 'Prefijo inválido', operador, f'Prefijo {prefijo} no corresponde a ningún operador colombiano', ''
+    
+    # Detectar patrones sospechosos
+    es_sospechoso, razon = detectar_patron_sospechoso(numero_movil)
+    
+    return ('Válido (Sospechoso)' if es_sospechoso else 'Válido'), operador, '', razon
+
+
 def validar_numero_colombiano(numero: str) -> Dict:
     """
     Valida un número telefónico colombiano completo.
@@ -187,102 +464,917 @@ def validar_numero_colombiano(numero: str) -> Dict:
         - mensaje_error: mensaje de error si aplica
         - sospechoso: True si tiene patrón sospechoso
         - razon_sospecha: razón si es sospechoso
+        - en_lista_negra: True si está en alguna lista negra activa
     """
-    resultado = {
+    numero_limpio = limpiar_numero(numero)
+    
+    tupla, = _MEMO.obtener_varios([numero_limpio])
+    if tupla is None:
+        tupla = _validar_limpio(numero_limpio)
+        _MEMO.guardar_varios([numero_limpio], [tupla])
+    
+    categoria, operador, mensaje_error, razon = tupla
+    numero_movil = extraer_numero_movil(numero_limpio)[0] if numero_limpio else ''
+    
+    return {
         'numero_original': numero,
-        'numero_limpio': '',
-        'numero_completo': '',
-        'valido': False,
-        'categoria': 'No procesado',
-        'operador': 'N/A',
-        'mensaje_error': '',
-        'sospechoso': False,
-        'razon_sospecha': '',
+        'numero_limpio': numero_movil,
+        'numero_completo': f'+57{numero_movil}' if numero_limpio else '',
+        'valido': categoria.startswith('Válido'),
+        'categoria': categoria,
+        'operador': operador,
+        'mensaje_error': mensaje_error,
+        'sospechoso': bool(razon),
+        'razon_sospecha': razon,
+        'en_lista_negra': bool(numero_movil and en_lista_negra(claves_numeros([numero_movil]))[0]),
     }
+
+
+# ==================== VALIDACIÓN POR LOTES ====================
+
+def normalizar_numeros(numeros) -> pd.Series:
+    """
+    Versión vectorizada de limpiar_numero para una secuencia de números.
     
-    # 1. Limpiar número
-    numero_limpio = limpiar_numero(numero)
+    Args:
+        numeros: Lista, arreglo o Series de números
+        
+    Returns:
+        Series de strings limpios (vacío para nulos), con índice 0..N-1
+    """
+    valores = np.asarray(numeros, dtype=object)
+    limpios = pd.Series(valores.copy(), dtype=object)
     
-    if not numero_limpio:
-        resultado['categoria'] = 'Vacío'
-        resultado['mensaje_error'] = 'Número vacío o nulo'
-        return resultado
+    # Los textos que ya son solo dígitos (lo más común) no pasan por la expresión regular
+    ya_limpios = np.fromiter((type(x) is str and x.isdecimal() for x in valores), dtype=bool, count=len(valores))
+    otros = ~ya_limpios
+    if otros.any():
+        resto = limpios[otros]
+        nulos = resto.isna().to_numpy()
+        resto = resto.astype(str).astype(object).str.replace(r'[^\d+]', '', regex=True)
+        resto[nulos] = ''
+        limpios[otros] = resto
+    return limpios
+
+
+def _numeros_moviles(limpios) -> np.ndarray:
+    """
+    Versión vectorizada de extraer_numero_movil (sin + y sin 57 inicial).
     
-    # 2. Extraer número móvil (sin +57)
-    numero_movil, tiene_57 = extraer_numero_movil(numero_limpio)
-    resultado['numero_limpio'] = numero_movil
-    resultado['numero_completo'] = f'+57{numero_movil}'
+    Returns:
+        Arreglo de texto (dtype U) con los números móviles
+    """
+    texto = np.char.replace(np.asarray(limpios, dtype=str), '+', '')
+    ancho = texto.dtype.itemsize // 4
+    if ancho < 2 or len(texto) == 0:
+        return texto
     
-    # 3. Validar que solo tenga dígitos
-    if not numero_movil.isdigit():
-        resultado['categoria'] = 'Formato inválido'
-        resultado['mensaje_error'] = 'Contiene caracteres no numéricos después de limpiar'
-        return resultado
+    # Quitar "57" desplazando dos posiciones los códigos Unicode de esas filas
+    codigos = texto.view(np.uint32).reshape(len(texto), ancho)
+    con_57 = (codigos[:, 0] == ord('5')) & (codigos[:, 1] == ord('7'))
+    corridos = np.zeros_like(codigos)
+    corridos[:, :ancho - 2] = codigos[:, 2:]
+    codigos = np.where(con_57[:, None], corridos, codigos)
+    return np.ascontiguousarray(codigos).view(texto.dtype).ravel()
+
+
+def _validar_limpios_lote(limpios: np.ndarray) -> List[Tuple[str, str, str, str]]:
+    """
+    Versión vectorizada de _validar_limpio para números limpios (sin repetir).
     
-    # 4. Validar longitud (debe ser 10 dígitos)
-    if len(numero_movil) != 10:
-        resultado['categoria'] = 'Longitud inválida'
-        resultado['mensaje_error'] = f'Longitud inválida: {len(numero_movil)} dígitos (esperado: 10)'
-        return resultado
+    Returns:
+        Lista de tuplas (categoria, operador, mensaje_error, razon_sospecha)
+    """
+    n = len(limpios)
+    if n == 0:
+        return []
     
-    # 5. Validar que comience con 3 (celular)
-    if not numero_movil.startswith('3'):
-        resultado['categoria'] = 'No es celular'
-        resultado['mensaje_error'] = 'No comienza con 3 (no es celular)'
-        return resultado
+    movil = _numeros_moviles(limpios)
+    vacio = np.char.str_len(np.asarray(limpios, dtype=str)) == 0
+    solo_digitos = np.char.isdigit(movil)
+    largo = np.char.str_len(movil)
+    celular = np.char.startswith(movil, '3')
     
-    # 6. Identificar operador
-    operador = identificar_operador(numero_movil)
-    resultado['operador'] = operador
+    categoria = np.full(n, 'Válido', dtype=object)
+    operador = np.full(n, 'N/A', dtype=object)
+    mensaje = np.full(n, '', dtype=object)
+    razon = np.full(n, '', dtype=object)
     
-    if operador == 'Desconocido':
-        resultado['categoria'] = 'Prefijo inválido'
-        prefijo = numero_movil[:3]
-        resultado['mensaje_error'] = f'Prefijo {prefijo} no corresponde a ningún operador colombiano'
-        return resultado
+    formato = ~vacio & ~solo_digitos
+    longitud = ~vacio & solo_digitos & (largo != 10)
+    no_celular = ~vacio & solo_digitos & (largo == 10) & ~celular
+    candidatos = ~vacio & solo_digitos & (largo == 10) & celular
     
-    # 7. Detectar patrones sospechosos
-    es_sospechoso, razon = detectar_patron_sospechoso(numero_movil)
-    resultado['sospechoso'] = es_sospechoso
-    resultado['razon_sospecha'] = razon
+    categoria[vacio] = 'Vacío'
+    mensaje[vacio] = 'Número vacío o nulo'
+    categoria[formato] = 'Formato inválido'
+    mensaje[formato] = 'Contiene caracteres no numéricos después de limpiar'
+    categoria[longitud] = 'Longitud inválida'
+    mensajes_longitud = {l: f'Longitud inválida: {l} dígitos (esperado: 10)' for l in np.unique(largo[longitud])}
+    mensaje[longitud] = [mensajes_longitud[l] for l in largo[longitud]]
+    categoria[no_celular] = 'No es celular'
+    mensaje[no_celular] = 'No comienza con 3 (no es celular)'
     
-    # 8. Si llegó aquí, es válido
-    resultado['valido'] = True
-    resultado['categoria'] = 'Válido'
+    # Operador por prefijo con la tabla precalculada (dígitos no ASCII: función individual).
+    # Sin candidatos el ancho de movil puede ser menor que 3 (p. ej. todos vacíos o cortos)
+    indices = np.flatnonzero(candidatos)
+    if len(indices):
+        ancho = movil.dtype.itemsize // 4
+        digitos_prefijo = (
+            movil[indices].view(np.uint32).reshape(len(indices), ancho)[:, :3].astype(np.int64) - ord('0')
+        )
+        ascii_ok = ((digitos_prefijo >= 0) & (digitos_prefijo <= 9)).all(axis=1)
+        operadores = np.empty(len(indices), dtype=object)
+        operadores[ascii_ok] = _OPERADORES_POR_PREFIJO[digitos_prefijo[ascii_ok] @ np.array([100, 10, 1])]
+        for i in np.flatnonzero(~ascii_ok):
+            operadores[i] = identificar_operador(str(movil[indices[i]]))
+        
+        # Números portados: el operador actual de la tabla reemplaza al del prefijo
+        if _PORTABILIDAD is not None:
+            portados, codigos_portados = _PORTABILIDAD.buscar(claves_numeros(movil[indices]))
+            operadores[portados] = np.asarray(OPERADORES, dtype=object)[codigos_portados[portados]]
+        operador[indices] = operadores
     
-    if es_sospechoso:
-        resultado['categoria'] = 'Válido (Sospechoso)'
+    prefijo_invalido = candidatos & (operador == 'Desconocido')
+    mensajes_prefijo = {}
+    for i in np.flatnonzero(prefijo_invalido):
+        prefijo = str(movil[i])[:3]
+        if prefijo not in mensajes_prefijo:
+            mensajes_prefijo[prefijo] = f'Prefijo {prefijo} no corresponde a ningún operador colombiano'
+        mensaje[i] = mensajes_prefijo[prefijo]
+    categoria[prefijo_invalido] = 'Prefijo inválido'
     
-    return resultado
+    # Patrones sospechosos sobre los válidos
+    validos = candidatos & ~prefijo_invalido
+    sospechosos, codigos = detectar_patrones_sospechosos_lote(movil[validos])
+    razon[validos] = np.asarray(RAZONES_SOSPECHA, dtype=object)[codigos]
+    categoria[np.flatnonzero(validos)[sospechosos]] = 'Válido (Sospechoso)'
+    
+    return list(zip(categoria, operador, mensaje, razon))
+
+
+def _validar_unicos(limpios: np.ndarray) -> List[Tuple[str, str, str, str]]:
+    """Valida números limpios sin repetir, usando el memo y validando solo los faltantes."""
+    tuplas = _MEMO.obtener_varios(limpios)
+    faltantes = [i for i, tupla in enumerate(tuplas) if tupla is None]
+    
+    if faltantes:
+        claves = limpios[faltantes]
+        nuevas = _validar_limpios_lote(claves)
+        _MEMO.guardar_varios(claves, nuevas)
+        for i, tupla in zip(faltantes, nuevas):
+            tuplas[i] = tupla
+    
+    return tuplas
+
+
+def factorizar_numeros(numeros) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Agrupa los números por su forma limpia (ver limpiar_numero).
+    
+    Si todos los valores son texto, primero agrupa los valores originales
+    repetidos para limpiar cada forma distinta una sola vez.
+    
+    Args:
+        numeros: Lista, arreglo o Series de números
+        
+    Returns:
+        Tupla (códigos: int[N] con la posición de cada fila en los únicos,
+        únicos: números limpios distintos en orden de aparición)
+    """
+    originales = np.asarray(numeros, dtype=object)
+    
+    if pd.api.types.infer_dtype(originales, skipna=True) in ('string', 'empty'):
+        codigos_crudos, crudos = pd.factorize(originales)
+        # Los nulos (código -1) se limpian como un valor más al final
+        limpios = normalizar_numeros(np.append(np.asarray(crudos, dtype=object), None))
+        codigos_crudos = np.where(codigos_crudos < 0, len(crudos), codigos_crudos)
+    else:
+        codigos_crudos = np.arange(len(originales))
+        limpios = normalizar_numeros(originales)
+    
+    codigos, unicos = pd.factorize(limpios)
+    return codigos[codigos_crudos], np.asarray(unicos, dtype=object)
+
+
+def claves_numeros(numeros_limpios) -> np.ndarray:
+    """
+    Convierte números limpios (solo dígitos) en claves enteras comparables.
+    
+    La clave combina el valor y la cantidad de dígitos (valor * 32 + largo),
+    así "0312" y "312" no colisionan. Los vacíos, los de más de 17 dígitos o
+    con dígitos no ASCII reciben la clave 0 (sin clave).
+    
+    Args:
+        numeros_limpios: Secuencia de números sin código de país
+        
+    Returns:
+        Arreglo uint64 con una clave por número
+    """
+    texto = np.asarray(numeros_limpios, dtype=str)
+    n = len(texto)
+    claves = np.zeros(n, dtype=np.uint64)
+    if n == 0:
+        return claves
+    
+    ancho = texto.dtype.itemsize // 4
+    columnas = min(ancho, 17)
+    largo = np.char.str_len(texto)
+    digitos = texto.view(np.uint32).reshape(n, ancho)[:, :columnas].astype(np.int64) - ord('0')
+    dentro = np.arange(columnas) < largo[:, None]
+    ok = (((digitos >= 0) & (digitos <= 9)) | ~dentro).all(axis=1) & (largo >= 1) & (largo <= 17)
+    
+    # Valor alineado a la izquierda y luego corrido según el largo de cada número
+    pesos = np.uint64(10) ** np.arange(columnas - 1, -1, -1, dtype=np.uint64)
+    valor = np.where(dentro & ok[:, None], digitos, 0).astype(np.uint64) @ pesos
+    valor //= np.uint64(10) ** (columnas - np.minimum(largo, columnas)).astype(np.uint64)
+    
+    claves[ok] = valor[ok] * np.uint64(32) + largo[ok].astype(np.uint64)
+    return claves
+
+
+def numero_desde_clave(clave: int) -> str:
+    """Inversa de claves_numeros para una clave distinta de 0."""
+    clave = int(clave)
+    return str(clave >> 5).zfill(clave & 31)
 
 
 def validar_lista_numeros(numeros: List[str]) -> pd.DataFrame:
     """
     Valida una lista completa de números y retorna un DataFrame.
     
+    Primero agrupa los números por su forma limpia: cada número distinto se
+    valida una sola vez (o se toma del memo) y el resultado se replica a sus filas.
+    
     Args:
         numeros: Lista de números a validar
         
     Returns:
         DataFrame con resultados de validación
     """
-    resultados = []
+    if not hasattr(numeros, '__len__'):
+        numeros = list(numeros)
+    originales = np.asarray(numeros, dtype=object)
+    codigos, unicos = factorizar_numeros(originales)
     
-    for numero in numeros:
-        resultado = validar_numero_colombiano(numero)
-        resultados.append(resultado)
+    tabla = pd.DataFrame.from_records(_validar_unicos(unicos), columns=list(CAMPOS_MEMO))
+    movil = _numeros_moviles(unicos).astype(object)
+    vacio = unicos == ''
+    tabla['numero_limpio'] = np.where(vacio, '', movil)
+    tabla['numero_completo'] = np.where(vacio, '', '+57' + movil)
+    tabla['valido'] = tabla['categoria'].str.startswith('Válido').astype(bool)
+    tabla['sospechoso'] = (tabla['razon_sospecha'] != '').astype(bool)
+    tabla['en_lista_negra'] = en_lista_negra(claves_numeros(movil))
+    
+    df = tabla.take(codigos).reset_index(drop=True)
+    df['numero_original'] = originales
+    
+    return df[COLUMNAS_RESULTADO]
+
+
+# ==================== RESULTADOS COMPACTOS ====================
+
+# Tablas de códigos: el código de cada texto es su posición en la lista
+CATEGORIAS = [
+    'Vacío',
+    'Formato inválido',
+    'Longitud inválida',
+    'No es celular',
+    'Prefijo inválido',
+    'Válido',
+    'Válido (Sospechoso)',
+]
+OPERADORES = ['N/A', 'Desconocido'] + list(PREFIJOS_OPERADORES)
+
+# Mensajes de error; {detalle} es la longitud o el prefijo según el caso
+MENSAJES_ERROR = [
+    '',
+    'Número vacío o nulo',
+    'Contiene caracteres no numéricos después de limpiar',
+    'Longitud inválida: {detalle} dígitos (esperado: 10)',
+    'No comienza con 3 (no es celular)',
+    'Prefijo {detalle:03d} no corresponde a ningún operador colombiano',
+]
+
+CODIGOS_CATEGORIA = {categoria: codigo for codigo, categoria in enumerate(CATEGORIAS)}
+CODIGOS_OPERADOR = {operador: codigo for codigo, operador in enumerate(OPERADORES)}
+CATEGORIAS_VALIDAS = np.array([CODIGOS_CATEGORIA['Válido'], CODIGOS_CATEGORIA['Válido (Sospechoso)']], dtype=np.uint8)
+
+# Código de error de cada categoría (índice = código de categoría)
+_ERROR_POR_CATEGORIA = np.array([1, 2, 3, 4, 5, 0, 0], dtype=np.uint8)
+
+# Columnas del resultado compacto: ~15 bytes por fila en lugar de 10 objetos de texto
+COLUMNAS_COMPACTAS = {
+    'numero_limpio': np.uint64,   # clave de claves_numeros (0 = vacío o sin clave)
+    'categoria': np.uint8,        # CATEGORIAS
+    'operador': np.uint8,         # OPERADORES
+    'error': np.uint8,            # MENSAJES_ERROR
+    'detalle': np.uint16,         # longitud o prefijo del mensaje de error
+    'sospecha': np.uint8,         # RAZONES_SOSPECHA
+    'en_lista_negra': np.bool_,   # está en alguna lista negra activa
+}
+
+
+def _codificar_unicos(unicos: np.ndarray, tuplas: List[Tuple[str, str, str, str]]) -> Dict[str, np.ndarray]:
+    """Convierte los resultados de texto de los números únicos en columnas de códigos."""
+    n = len(tuplas)
+    movil = _numeros_moviles(unicos)
+    
+    # Hay pocas tuplas distintas: se codifica cada una una vez y se replica por índice
+    distintas: Dict[Tuple, int] = {}
+    indices = np.fromiter((distintas.setdefault(t, len(distintas)) for t in tuplas), dtype=np.int64, count=n)
+    categoria = np.array([CODIGOS_CATEGORIA[t[0]] for t in distintas], dtype=np.uint8)[indices]
+    operador = np.array([CODIGOS_OPERADOR[t[1]] for t in distintas], dtype=np.uint8)[indices]
+    sospecha = np.array([CODIGOS_SOSPECHA[t[3]] for t in distintas], dtype=np.uint8)[indices]
+    
+    detalle = np.zeros(n, dtype=np.uint16)
+    longitud = categoria == CODIGOS_CATEGORIA['Longitud inválida']
+    detalle[longitud] = np.minimum(np.char.str_len(movil[longitud]), np.iinfo(np.uint16).max)
+    prefijo = np.flatnonzero(categoria == CODIGOS_CATEGORIA['Prefijo inválido'])
+    detalle[prefijo] = [int(movil[i][:3]) for i in prefijo]
+    
+    claves = claves_numeros(movil)
+    
+    return {
+        'numero_limpio': claves,
+        'categoria': categoria,
+        'operador': operador,
+        'error': _ERROR_POR_CATEGORIA[categoria],
+        'detalle': detalle,
+        'sospecha': sospecha,
+        'en_lista_negra': en_lista_negra(claves),
+    }
+
+
+def validar_lista_numeros_compacto(numeros) -> pd.DataFrame:
+    """
+    Igual que validar_lista_numeros, pero con columnas de códigos enteros.
+    
+    El texto (categorías, mensajes, números) se genera solo al mostrar o
+    exportar con expandir_resultados. Un resultado de 5 millones de filas
+    ocupa ~75 MB en lugar de varios GB de columnas de texto.
+    
+    Args:
+        numeros: Lista, arreglo o Series de números
+        
+    Returns:
+        DataFrame con las columnas de COLUMNAS_COMPACTAS (sin numero_original)
+    """
+    if not hasattr(numeros, '__len__'):
+        numeros = list(numeros)
+    codigos, unicos = factorizar_numeros(numeros)
+    tabla = _codificar_unicos(unicos, _validar_unicos(unicos))
+    return pd.DataFrame({columna: valores[codigos] for columna, valores in tabla.items()})
+
+
+def es_resultado_compacto(df_validacion: pd.DataFrame) -> bool:
+    """True si el DataFrame viene de validar_lista_numeros_compacto."""
+    return 'error' in df_validacion.columns and df_validacion['categoria'].dtype.kind == 'u'
+
+
+def numeros_desde_claves(claves) -> np.ndarray:
+    """Versión vectorizada de numero_desde_clave (la clave 0 se convierte en "")."""
+    claves = np.asarray(claves, dtype=np.uint64)
+    valores = claves >> np.uint64(5)
+    largos = (claves & np.uint64(31)).astype(np.int64)
+    ancho = max(int(largos.max()) if len(claves) else 0, 1)
+    # Matriz N×ancho de dígitos (con ceros a la izquierda hasta el largo de
+    # cada clave) que se ve como texto; las posiciones sobrantes quedan en \0
+    exponentes = largos[:, None] - 1 - np.arange(ancho)
+    potencias = np.uint64(10) ** np.clip(exponentes, 0, 19).astype(np.uint64)
+    digitos = (valores[:, None] // potencias) % np.uint64(10)
+    codigos = np.where(exponentes >= 0, digitos + np.uint64(ord('0')), 0).astype(np.uint32)
+    numeros = np.ascontiguousarray(codigos).view(f'U{ancho}').ravel()
+    return np.where(claves == 0, '', numeros).astype(object)
+
+
+def expandir_resultados(df_compacto: pd.DataFrame, numeros_originales=None) -> pd.DataFrame:
+    """
+    Genera las columnas de texto de validar_lista_numeros a partir de un resultado compacto.
+    
+    Conviene expandir solo las filas que se van a mostrar o exportar
+    (p. ej. df_compacto.head(100)). Los números sin clave entera (más de
+    17 dígitos o con dígitos no ASCII) solo se reconstruyen exactos si se
+    pasan los números originales; si no, quedan con numero_limpio vacío.
+    
+    Args:
+        df_compacto: Resultado de validar_lista_numeros_compacto
+        numeros_originales: Números de entrada de esas mismas filas (opcional)
+        
+    Returns:
+        DataFrame con las columnas de COLUMNAS_RESULTADO
+    """
+    categoria = df_compacto['categoria'].to_numpy()
+    sospecha = df_compacto['sospecha'].to_numpy()
+    claves = df_compacto['numero_limpio'].to_numpy()
+    # En object: '+57' + arreglo unicode no existe en NumPy 1.x
+    limpio = numeros_desde_claves(claves).astype(object)
+    completo = np.where(categoria == CODIGOS_CATEGORIA['Vacío'], '', '+57' + limpio).astype(object)
+    
+    # Cada combinación distinta (error, detalle) se formatea una sola vez
+    combinado = df_compacto['error'].to_numpy().astype(np.int64) << 16 | df_compacto['detalle'].to_numpy()
+    combinaciones, inversa = np.unique(combinado, return_inverse=True)
+    mensajes = np.array(
+        [MENSAJES_ERROR[c >> 16].format(detalle=c & 0xFFFF) for c in combinaciones.tolist()], dtype=object
+    )[inversa.ravel()]
+    
+    if numeros_originales is None:
+        originales = np.full(len(df_compacto), None, dtype=object)
+    else:
+        originales = np.asarray(numeros_originales, dtype=object)
+        # Con el original a mano, los números sin clave (raros) se expanden con el texto exacto
+        for i in np.flatnonzero((claves == 0) & (categoria != CODIGOS_CATEGORIA['Vacío'])):
+            resultado = validar_numero_colombiano(originales[i])
+            limpio[i] = resultado['numero_limpio']
+            completo[i] = resultado['numero_completo']
+            mensajes[i] = resultado['mensaje_error']
+    
+    df = pd.DataFrame({
+        'numero_original': originales,
+        'numero_limpio': limpio,
+        'numero_completo': completo,
+        'valido': np.isin(categoria, CATEGORIAS_VALIDAS),
+        'categoria': np.asarray(CATEGORIAS, dtype=object)[categoria],
+        'operador': np.asarray(OPERADORES, dtype=object)[df_compacto['operador'].to_numpy()],
+        'mensaje_error': mensajes,
+        'sospechoso': sospecha > 0,
+        'razon_sospecha': np.asarray(RAZONES_SOSPECHA, dtype=object)[sospecha],
+        'en_lista_negra': df_compacto['en_lista_negra'].to_numpy(dtype=bool),
+    }, index=df_compacto.index)
+    
+    return df[COLUMNAS_RESULTADO]
+
+
+def _conteos_compactos(codigos: np.ndarray, nombres: List[str]) -> Dict[str, int]:
+    """Conteo por código como {nombre: cantidad}, de mayor a menor (igual que value_counts)."""
+    conteos = np.bincount(codigos, minlength=len(nombres))
+    orden = np.argsort(-conteos, kind='stable')
+    return {nombres[i]: int(conteos[i]) for i in orden if conteos[i] > 0}
+
+
+# ==================== TABLAS LOCALES COMPILADAS ====================
+
+def claves_moviles(numeros) -> np.ndarray:
+    """Clave entera (claves_numeros) del número móvil de cada número crudo; 0 si no tiene."""
+    return claves_numeros(_numeros_moviles(normalizar_numeros(numeros)))
+
+
+def _detectar_separador(ruta: str, encoding: str = 'utf-8') -> str:
+    with open(ruta, encoding=encoding, errors='replace') as archivo:
+        primera = archivo.readline()
+    return ';' if primera.count(';') > primera.count(',') else ','
+
+
+def leer_columnas(origen, columnas: List, separador: Optional[str], encoding: str,
+                  tamano_bloque: int, sin_encabezado: Optional[bool] = None):
+    """
+    Lee por bloques solo las columnas pedidas (por nombre o posición) como texto.
+    
+    origen es una ruta o un archivo abierto (p. ej. stdin). Si sin_encabezado
+    es None se detecta: si la primera fila ya trae un número, el archivo se lee
+    sin encabezado. La detección (y la del separador) relee el inicio del
+    archivo, así que con un archivo abierto hay que indicar ambos.
+    """
+    if sin_encabezado is None:
+        separador = separador or _detectar_separador(origen, encoding)
+        primera = pd.read_csv(origen, sep=separador, encoding=encoding, nrows=0).columns
+        sin_encabezado = len(limpiar_numero(primera[0])) >= 7
+        if sin_encabezado:
+            columnas = [c if isinstance(c, int) else list(primera).index(c) for c in columnas]
+        else:
+            columnas = [primera[c] if isinstance(c, int) else c for c in columnas]
+    
+    lector = pd.read_csv(origen, sep=separador, encoding=encoding, usecols=columnas, dtype=str,
+                         header=None if sin_encabezado else 0, chunksize=tamano_bloque)
+    # Con encabezado, las posiciones se buscan en el bloque, que trae las
+    # columnas en el orden del archivo
+    posiciones = sorted(c for c in columnas if isinstance(c, int))
+    with lector:
+        for bloque in lector:
+            yield [
+                bloque[c].to_numpy(dtype=object) if sin_encabezado or not isinstance(c, int)
+                else bloque.iloc[:, posiciones.index(c)].to_numpy(dtype=object)
+                for c in columnas
+            ]
+
+
+def _guardar_tabla(destino: str, arreglos: Dict[str, np.ndarray], meta: Dict) -> None:
+    """Guarda arreglos .npy y meta.json en un directorio (meta al final: marca la tabla completa)."""
+    os.makedirs(destino, exist_ok=True)
+    for nombre, arreglo in arreglos.items():
+        temporal = os.path.join(destino, f'{nombre}.tmp.npy')
+        np.save(temporal, arreglo)
+        os.replace(temporal, os.path.join(destino, f'{nombre}.npy'))
+    temporal = os.path.join(destino, 'meta.json.tmp')
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(meta, archivo, ensure_ascii=False)
+    os.replace(temporal, os.path.join(destino, 'meta.json'))
+
+
+def _leer_meta(directorio: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(directorio, 'meta.json'), encoding='utf-8') as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        return None
+
+
+def _tabla_al_dia(origen: str, sufijo: str, compilar) -> str:
+    """
+    Retorna el directorio compilado de `origen`, compilándolo solo si no
+    existe o si el archivo cambió desde la última compilación.
+    """
+    if _leer_meta(origen) is not None:
+        return origen
+    destino = origen + sufijo
+    meta = _leer_meta(destino)
+    if meta is None or meta.get('huella') != file_fingerprint(origen):
+        compilar(origen, destino)
+    return destino
+
+
+# ==================== PORTABILIDAD NUMÉRICA ====================
+
+# Nombres con los que suelen venir los operadores en las bases de portabilidad
+ALIAS_OPERADORES = {
+    'comcel': 'Claro',
+    'colombia movil': 'Tigo',
+    'telefonica': 'Movistar',
+    'partners telecom': 'WOM',
+    'virgin': 'Virgin Mobile',
+    'exito': 'Éxito Móvil',
+    'flash': 'Flash Mobile',
+}
+
+
+def _normalizar_nombre(nombre: str) -> str:
+    sin_tildes = unicodedata.normalize('NFKD', nombre).encode('ascii', 'ignore').decode()
+    return ' '.join(sin_tildes.lower().split())
+
+
+def nombre_operador(nombre) -> str:
+    """Nombre canónico de un operador (p. ej. "COMCEL" → "Claro", "movistar" → "Movistar")."""
+    if pd.isna(nombre) or not str(nombre).strip():
+        return 'Desconocido'
+    normalizado = _normalizar_nombre(str(nombre))
+    for operador in OPERADORES:
+        if _normalizar_nombre(operador) == normalizado:
+            return operador
+    return ALIAS_OPERADORES.get(normalizado, str(nombre).strip())
+
+
+def _codigo_operador(nombre: str) -> int:
+    """Código en OPERADORES; los operadores nuevos se agregan al final de la tabla."""
+    if nombre not in CODIGOS_OPERADOR:
+        if len(OPERADORES) > np.iinfo(np.uint8).max:
+            raise ValueError("Demasiados operadores distintos en la tabla de portabilidad")
+        CODIGOS_OPERADOR[nombre] = len(OPERADORES)
+        OPERADORES.append(nombre)
+    return CODIGOS_OPERADOR[nombre]
+
+
+def compilar_portabilidad(origen: str, destino: Optional[str] = None, columna_numero=0,
+                          columna_operador=1, separador: Optional[str] = None,
+                          encoding: str = 'utf-8', tamano_bloque: int = 1_000_000) -> str:
+    """
+    Compila un CSV de portabilidad (número → operador actual) a arreglos ordenados.
+    
+    Resultado: un directorio con claves.npy (uint64 ordenado, ver claves_numeros),
+    operadores.npy (uint8, índice en meta['nombres']) y meta.json. Si un número
+    aparece varias veces, gana el último registro (la portación más reciente).
+    
+    Args:
+        origen: CSV con encabezado
+        destino: Directorio de salida (por defecto origen + ".portabilidad")
+        columna_numero, columna_operador: Nombre o posición de cada columna
+        separador: Separador del CSV (por defecto se detecta "," o ";")
+        
+    Returns:
+        Ruta del directorio compilado
+    """
+    destino = destino or origen + '.portabilidad'
+    nombres: Dict[str, int] = {}
+    partes_claves, partes_operadores = [], []
+    
+    for numeros, operadores in leer_columnas(origen, [columna_numero, columna_operador],
+                                             separador, encoding, tamano_bloque):
+        codigos, distintos = pd.factorize(operadores, use_na_sentinel=False)
+        canonicos = [nombre_operador(nombre) for nombre in distintos]
+        locales = np.array([nombres.setdefault(nombre, len(nombres)) for nombre in canonicos], dtype=np.uint8)
+        conocidos = np.array([nombre != 'Desconocido' for nombre in canonicos], dtype=bool)
+        
+        # Solo números móviles de 10 dígitos con operador
+        claves = claves_moviles(numeros)
+        usar = ((claves & np.uint64(31)) == 10) & conocidos[codigos]
+        partes_claves.append(claves[usar])
+        partes_operadores.append(locales[codigos[usar]])
+    
+    claves = np.concatenate(partes_claves) if partes_claves else np.zeros(0, dtype=np.uint64)
+    operadores = np.concatenate(partes_operadores) if partes_operadores else np.zeros(0, dtype=np.uint8)
+    
+    # Ordenar; ante claves repetidas queda el último registro
+    orden = np.argsort(claves, kind='stable')
+    claves, operadores = claves[orden], operadores[orden]
+    ultimo = np.append(claves[1:] != claves[:-1], True) if len(claves) else np.zeros(0, dtype=bool)
+    
+    _guardar_tabla(
+        destino,
+        {'claves': claves[ultimo], 'operadores': operadores[ultimo]},
+        {'huella': file_fingerprint(origen), 'registros': int(ultimo.sum()), 'nombres': list(nombres)},
+    )
+    return destino
+
+
+class TablaPortabilidad:
+    """
+    Tabla compilada de portabilidad abierta con mmap: cargarla es casi
+    instantáneo y las búsquedas son binarias (np.searchsorted) por lotes.
+    """
+    
+    def __init__(self, directorio: str):
+        meta = _leer_meta(directorio)
+        if meta is None:
+            raise FileNotFoundError(f"No hay una tabla de portabilidad compilada en {directorio}")
+        self.directorio = directorio
+        self.claves = np.load(os.path.join(directorio, 'claves.npy'), mmap_mode='r')
+        self._operadores = np.load(os.path.join(directorio, 'operadores.npy'), mmap_mode='r')
+        self._codigos = np.array([_codigo_operador(nombre) for nombre in meta['nombres']], dtype=np.uint8)
+    
+    def __len__(self) -> int:
+        return len(self.claves)
+    
+    def buscar(self, claves: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Busca claves de números móviles (ver claves_moviles).
+        
+        Returns:
+            Tupla (encontrado: bool[N], operador: uint8[N] con códigos de OPERADORES)
+        """
+        claves = np.asarray(claves, dtype=np.uint64)
+        encontrado = np.zeros(len(claves), dtype=bool)
+        operador = np.zeros(len(claves), dtype=np.uint8)
+        if len(claves) == 0 or len(self.claves) == 0:
+            return encontrado, operador
+        
+        # Consultas ordenadas: searchsorted recorre el mmap hacia adelante
+        orden = np.argsort(claves)
+        posicion = np.minimum(np.searchsorted(self.claves, claves[orden]), len(self.claves) - 1)
+        encontrado[orden] = self.claves[posicion] == claves[orden]
+        operador[orden] = self._codigos[self._operadores[posicion]]
+        operador[~encontrado] = 0
+        return encontrado, operador
+    
+    def operador(self, numero_movil: str) -> Optional[str]:
+        """Operador actual de un número móvil, o None si no está en la tabla."""
+        encontrado, operador = self.buscar(claves_numeros([numero_movil]))
+        return OPERADORES[operador[0]] if encontrado[0] else None
+
+
+_PORTABILIDAD: Optional[TablaPortabilidad] = None
+
+
+def cargar_portabilidad(ruta: str, **opciones) -> TablaPortabilidad:
+    """
+    Activa una tabla de portabilidad para todas las validaciones del proceso.
+    
+    Acepta el CSV original (se compila junto a él la primera vez y cada vez
+    que cambia) o el directorio ya compilado. Vacía el memo de validación.
+    
+    Args:
+        ruta: CSV de portabilidad o directorio compilado
+        **opciones: Opciones de compilar_portabilidad (columnas, separador...)
+    """
+    global _PORTABILIDAD
+    directorio = _tabla_al_dia(
+        ruta, '.portabilidad', lambda origen, destino: compilar_portabilidad(origen, destino, **opciones)
+    )
+    _PORTABILIDAD = TablaPortabilidad(directorio)
+    _MEMO.limpiar()
+    return _PORTABILIDAD
+
+
+def desactivar_portabilidad() -> None:
+    """Vuelve a identificar los operadores solo por prefijo."""
+    global _PORTABILIDAD
+    _PORTABILIDAD = None
+    _MEMO.limpiar()
+
+
+# ==================== LISTAS NEGRAS ====================
+
+def _ordenadas_sin_repetir(claves: np.ndarray) -> np.ndarray:
+    """Como np.unique, pero ordenando directamente (más rápido para claves uint64)."""
+    claves = np.sort(claves)
+    return claves[np.append(True, claves[1:] != claves[:-1])] if len(claves) else claves
+
+
+def compilar_lista_negra(origen: str, destino: Optional[str] = None, columna=0,
+                         separador: Optional[str] = None, encoding: str = 'utf-8',
+                         tamano_bloque: int = 1_000_000) -> str:
+    """
+    Compila una lista negra / de exclusión (CSV o un número por línea) a un
+    arreglo ordenado y sin repetidos de claves uint64 (ver claves_moviles).
     
-    df = pd.DataFrame(resultados)
+    Args:
+        origen: Archivo con los números
+        destino: Directorio de salida (por defecto origen + ".lista_negra")
+        columna: Nombre o posición de la columna con los números
+        separador: Separador del CSV (por defecto se detecta "," o ";")
+        
+    Returns:
+        Ruta del directorio compilado
+    """
+    destino = destino or origen + '.lista_negra'
+    partes = []
     
-    return df
+    for numeros, in leer_columnas(origen, [columna], separador, encoding, tamano_bloque):
+        claves = claves_moviles(numeros)
+        # Ordenar y quitar repetidos por bloque reduce la memoria del paso final
+        partes.append(_ordenadas_sin_repetir(claves[claves > 0]))
+    
+    claves = _ordenadas_sin_repetir(np.concatenate(partes)) if partes else np.zeros(0, dtype=np.uint64)
+    _guardar_tabla(destino, {'claves': claves}, {'huella': file_fingerprint(origen), 'registros': len(claves)})
+    return destino
 
 
-def analizar_resultados(df_validacion: pd.DataFrame) -> Dict:
+class ListaNegra:
+    """
+    Una o más listas negras compiladas, abiertas con mmap. La pertenencia se
+    resuelve con búsqueda binaria exacta (sin falsos positivos) por lotes.
+    """
+    
+    def __init__(self, directorios: List[str]):
+        self.directorios = list(directorios)
+        self._claves = [np.load(os.path.join(d, 'claves.npy'), mmap_mode='r') for d in self.directorios]
+    
+    def __len__(self) -> int:
+        return sum(len(claves) for claves in self._claves)
+    
+    def contiene(self, claves: np.ndarray) -> np.ndarray:
+        """Retorna bool[N]: True si la clave (ver claves_moviles) está en alguna lista."""
+        claves = np.asarray(claves, dtype=np.uint64)
+        resultado = np.zeros(len(claves), dtype=bool)
+        if len(claves) == 0:
+            return resultado
+        
+        # Consultas ordenadas: searchsorted recorre el mmap hacia adelante
+        orden = np.argsort(claves)
+        consultas = claves[orden]
+        for lista in self._claves:
+            if len(lista) == 0:
+                continue
+            posicion = np.minimum(np.searchsorted(lista, consultas), len(lista) - 1)
+            resultado[orden] |= (lista[posicion] == consultas) & (consultas > 0)
+        return resultado
+
+
+_LISTA_NEGRA: Optional[ListaNegra] = None
+
+
+def cargar_listas_negras(*rutas: str, **opciones) -> ListaNegra:
+    """
+    Activa una o más listas negras para todas las validaciones del proceso.
+    
+    Cada archivo se compila junto a él (".lista_negra/") la primera vez y cada
+    vez que cambia; después se abre con mmap casi al instante. El resultado
+    de la validación incluye en_lista_negra.
+    
+    Args:
+        *rutas: Archivos de lista negra o directorios ya compilados
+        **opciones: Opciones de compilar_lista_negra (columna, separador...)
+    """
+    global _LISTA_NEGRA
+    directorios = [
+        _tabla_al_dia(ruta, '.lista_negra', lambda origen, destino: compilar_lista_negra(origen, destino, **opciones))
+        for ruta in rutas
+    ]
+    _LISTA_NEGRA = ListaNegra(directorios)
+    return _LISTA_NEGRA
+
+
+def desactivar_listas_negras() -> None:
+    """Deja de marcar números en lista negra."""
+    global _LISTA_NEGRA
+    _LISTA_NEGRA = None
+
+
+def en_lista_negra(claves: np.ndarray) -> np.ndarray:
+    """Pertenencia a las listas negras activas (todo False si no hay ninguna)."""
+    if _LISTA_NEGRA is None:
+        return np.zeros(len(claves), dtype=bool)
+    return _LISTA_NEGRA.contiene(claves)
+
+
+# ==================== NÚMEROS REPETIDOS ====================
+
+# Claves desde 2**63 (fuera del rango de claves_numeros) para los números sin clave entera
+_CLAVE_EXTRA = np.uint64(1 << 63)
+
+
+def _claves_agrupables(numeros_limpios: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Claves enteras para agrupar cualquier número limpio (incluso vacío o muy largo).
+    
+    Returns:
+        Tupla (claves uint64, textos de las claves extra: clave - 2**63 → texto)
+    """
+    claves = claves_numeros(numeros_limpios)
+    sin_clave = np.flatnonzero(claves == 0)
+    codigos, textos = pd.factorize(np.asarray(numeros_limpios, dtype=object)[sin_clave])
+    claves[sin_clave] = _CLAVE_EXTRA + codigos.astype(np.uint64)
+    return claves, np.asarray(textos, dtype=object)
+
+
+def _claves_con_originales(claves: np.ndarray, numeros_originales) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    En un resultado compacto, da a las filas sin clave (0) una clave extra
+    según su número limpio, recalculado desde el original (igual que
+    _claves_agrupables en un resultado de texto).
+    
+    Returns:
+        Tupla (claves uint64, textos de las claves extra)
+    """
+    sin_clave = np.flatnonzero(claves == 0)
+    if len(sin_clave) == 0:
+        return claves, np.empty(0, dtype=object)
+    
+    limpios = _numeros_moviles(normalizar_numeros(np.asarray(numeros_originales, dtype=object)[sin_clave]))
+    codigos, textos = pd.factorize(limpios.astype(object))
+    claves = claves.copy()
+    claves[sin_clave] = _CLAVE_EXTRA + codigos.astype(np.uint64)
+    return claves, np.asarray(textos, dtype=object)
+
+
+def _textos_claves(claves: np.ndarray, extras: np.ndarray) -> List[str]:
+    """Número limpio de cada clave (normal o extra)."""
+    return [
+        extras[clave - _CLAVE_EXTRA] if clave >= _CLAVE_EXTRA else (numero_desde_clave(clave) if clave else '')
+        for clave in claves
+    ]
+
+
+def _top_repetidos(claves: np.ndarray, top: int = 10) -> Tuple[int, np.ndarray, np.ndarray]:
+    """
+    Cuenta las claves repetidas y elige las `top` más repetidas.
+    
+    Ante empates gana la que apareció primero (mismo orden de Counter + sorted).
+    
+    Returns:
+        Tupla (cantidad de claves repetidas, claves top, conteos top)
+    """
+    unicas, primera, conteos = np.unique(claves, return_index=True, return_counts=True)
+    repetidas = conteos > 1
+    unicas, primera, conteos = unicas[repetidas], primera[repetidas], conteos[repetidas]
+    
+    # Un solo entero ordena por conteo (desc) y primera aparición (asc)
+    puntaje = (conteos.astype(np.int64) << 40) - primera.astype(np.int64)
+    elegidas = np.argpartition(-puntaje, top)[:top] if len(puntaje) > top else np.arange(len(puntaje))
+    elegidas = elegidas[np.argsort(-puntaje[elegidas])]
+    return len(unicas), unicas[elegidas], conteos[elegidas]
+
+
+def _formatos_originales(grupos: np.ndarray, originales: np.ndarray) -> Dict[int, Counter]:
+    """
+    Cuenta los formatos originales por grupo.
+    
+    Args:
+        grupos: Grupo de cada fila (-1 = fila que no interesa)
+        originales: Número original de cada fila
+        
+    Returns:
+        {grupo: Counter(formato → filas)}; los nulos se cuentan como ""
+    """
+    en_grupo = grupos >= 0
+    textos = pd.Series(np.asarray(originales, dtype=object)[en_grupo], dtype=object)
+    textos = textos.where(textos.notna(), '').astype(str)
+    conteos = pd.DataFrame({'grupo': grupos[en_grupo], 'formato': textos.to_numpy()}).value_counts(sort=False)
+    
+    formatos: Dict[int, Counter] = {}
+    for (grupo, formato), n in conteos.items():
+        formatos.setdefault(int(grupo), Counter())[formato] = int(n)
+    return formatos
+
+
+def _grupos_repetidos(top: List[Tuple[str, int]], formatos: Dict[int, Counter]) -> Dict[str, Dict]:
+    """Arma {número: {'repeticiones', 'formatos'}} con los formatos de más a menos frecuentes."""
+    return {
+        numero: {'repeticiones': conteo, 'formatos': dict(formatos.get(i, Counter()).most_common())}
+        for i, (numero, conteo) in enumerate(top)
+    }
+
+
+def analizar_resultados(df_validacion: pd.DataFrame, numeros_originales=None) -> Dict:
     """
     Analiza los resultados de validación y genera estadísticas.
     
+    Los repetidos se cuentan sobre claves enteras (ver claves_numeros), así
+    "+57 300 123 4567" y "300-123-4567" se agrupan en el mismo número.
+    
     Args:
-        df_validacion: DataFrame con resultados de validación
+        df_validacion: DataFrame con resultados de validación (de texto o compacto)
+        numeros_originales: Números de entrada de un resultado compacto, para
+            agrupar exacto los números sin clave y dar los formatos de los
+            repetidos (en uno de texto se usa numero_original)
         
     Returns:
         Diccionario con estadísticas
@@ -292,22 +1384,51 @@ def analizar_resultados(df_validacion: pd.DataFrame) -> Dict:
     if total == 0:
         return {'total': 0}
     
-    validos = df_validacion['valido'].sum()
-    invalidos = total - validos
-    
-    # Contar por categoría
-    categorias = df_validacion['categoria'].value_counts().to_dict()
+    if es_resultado_compacto(df_validacion):
+        categoria = df_validacion['categoria'].to_numpy()
+        valido = np.isin(categoria, CATEGORIAS_VALIDAS)
+        validos = int(valido.sum())
+        categorias = _conteos_compactos(categoria, CATEGORIAS)
+        operadores = _conteos_compactos(df_validacion['operador'].to_numpy()[valido], OPERADORES)
+        sospechosos = int((df_validacion['sospecha'].to_numpy() > 0).sum())
+        
+        filas = np.arange(total)
+        claves, extras = df_validacion['numero_limpio'].to_numpy(), np.empty(0, dtype=object)
+        if numeros_originales is not None:
+            claves, extras = _claves_con_originales(claves, numeros_originales)
+    else:
+        validos = df_validacion['valido'].sum()
+        
+        # Contar por categoría
+        categorias = df_validacion['categoria'].value_counts().to_dict()
+        
+        # Contar por operador (solo válidos)
+        operadores = df_validacion[df_validacion['valido']]['operador'].value_counts().to_dict()
+        
+        # Contar sospechosos
+        sospechosos = df_validacion['sospechoso'].sum()
+        
+        # Detectar repetidos
+        limpios = df_validacion['numero_limpio']
+        filas = np.flatnonzero(limpios.notna().to_numpy())
+        claves, extras = _claves_agrupables(limpios.to_numpy(dtype=object)[filas])
+        
+        if numeros_originales is None and 'numero_original' in df_validacion.columns:
+            numeros_originales = df_validacion['numero_original'].to_numpy(dtype=object)
     
-    # Contar por operador (solo válidos)
-    operadores = df_validacion[df_validacion['valido']]['operador'].value_counts().to_dict()
+    cantidad_repetidos, claves_top, conteos_top = _top_repetidos(claves)
+    numeros_top = _textos_claves(claves_top, extras)
     
-    # Contar sospechosos
-    sospechosos = df_validacion['sospechoso'].sum()
+    # Formatos originales de los más repetidos (p. ej. "+57 300..." y "300-..." en un mismo grupo)
+    formatos = {}
+    if numeros_originales is not None and len(claves_top):
+        grupos = np.full(total, -1, dtype=np.int64)
+        grupos[filas] = pd.Index(claves_top).get_indexer(claves)
+        formatos = _formatos_originales(grupos, numeros_originales)
     
-    # Detectar repetidos
-    numeros_limpios = df_validacion['numero_limpio'].dropna()
-    repeticiones = Counter(numeros_limpios)
-    numeros_repetidos = {num: count for num, count in repeticiones.items() if count > 1}
+    invalidos = total - validos
+    en_lista = int(df_validacion['en_lista_negra'].sum()) if 'en_lista_negra' in df_validacion.columns else 0
+    top = list(zip(numeros_top, conteos_top.tolist()))
     
     estadisticas = {
         'total': total,
@@ -319,13 +1440,330 @@ def analizar_resultados(df_validacion: pd.DataFrame) -> Dict:
         'operadores': operadores,
         'sospechosos': int(sospechosos),
         'porcentaje_sospechosos': round(sospechosos / total * 100, 2),
-        'numeros_repetidos': len(numeros_repetidos),
-        'top_repetidos': dict(sorted(numeros_repetidos.items(), key=lambda x: x[1], reverse=True)[:10]),
+        'en_lista_negra': en_lista,
+        'numeros_repetidos': cantidad_repetidos,
+        'top_repetidos': dict(top),
+        'grupos_repetidos': _grupos_repetidos(top, formatos),
     }
     
     return estadisticas
 
 
+class ResumenValidacion:
+    """
+    Acumula, bloque a bloque, las mismas estadísticas de analizar_resultados.
+    
+    Los conteos de números repetidos se reparten por clave en archivos
+    temporales (una partición por archivo), así la memoria no crece con el
+    tamaño de la entrada. Usar como context manager o llamar a cerrar().
+    """
+    
+    _REGISTRO = np.dtype([('clave', '<u8'), ('n', '<u8'), ('primera', '<u8')])
+    
+    def __init__(self, particiones: int = 64, directorio: Optional[str] = None):
+        self.particiones = particiones
+        self._tmp = tempfile.TemporaryDirectory(prefix='resumen_validacion_', dir=directorio)
+        self.total = 0
+        self.validos = 0
+        self.sospechosos = 0
+        self.en_lista_negra = 0
+        self.categorias = Counter()
+        self.operadores = Counter()
+        # Números sin clave entera (vacíos, muy largos): número → [repeticiones, primera fila]
+        self._sin_clave: Dict[str, List[int]] = {}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.cerrar()
+    
+    def cerrar(self) -> None:
+        """Elimina los archivos temporales."""
+        self._tmp.cleanup()
+    
+    def _archivo(self, particion: int) -> str:
+        return os.path.join(self._tmp.name, f'{particion:03d}.bin')
+    
+    def agregar(self, df_validacion: pd.DataFrame, numeros_originales=None) -> None:
+        """
+        Suma un bloque de resultados (de validar_lista_numeros o su versión compacta).
+        
+        Con un bloque compacto, pasar sus números originales permite agrupar
+        exacto los números sin clave (ver analizar_resultados).
+        """
+        n = len(df_validacion)
+        if n == 0:
+            return
+        
+        filas = np.arange(self.total, self.total + n, dtype=np.uint64)
+        self.total += n
+        if 'en_lista_negra' in df_validacion.columns:
+            self.en_lista_negra += int(df_validacion['en_lista_negra'].sum())
+        
+        if es_resultado_compacto(df_validacion):
+            categoria = df_validacion['categoria'].to_numpy()
+            valido = np.isin(categoria, CATEGORIAS_VALIDAS)
+            self.validos += int(valido.sum())
+            self.sospechosos += int((df_validacion['sospecha'].to_numpy() > 0).sum())
+            self.categorias.update(_conteos_compactos(categoria, CATEGORIAS))
+            self.operadores.update(_conteos_compactos(df_validacion['operador'].to_numpy()[valido], OPERADORES))
+            
+            # Sin originales, la clave 0 agrupa los vacíos (y los números sin clave) como ""
+            claves = df_validacion['numero_limpio'].to_numpy()
+            con_clave = claves > 0
+            sin_clave = np.flatnonzero(~con_clave)
+            if len(sin_clave):
+                if numeros_originales is None:
+                    textos, codigos = np.array([''], dtype=object), np.zeros(len(sin_clave), dtype=np.int64)
+                else:
+                    extra, textos = _claves_con_originales(claves, numeros_originales)
+                    codigos = (extra[sin_clave] - _CLAVE_EXTRA).astype(np.int64)
+                conteos = np.bincount(codigos, minlength=len(textos))
+                _, primeras = np.unique(codigos, return_index=True)
+                for texto, conteo, primera in zip(textos, conteos, filas[sin_clave][primeras]):
+                    registro = self._sin_clave.setdefault(texto, [0, int(primera)])
+                    registro[0] += int(conteo)
+        else:
+            valido = df_validacion['valido'].to_numpy(dtype=bool)
+            self.validos += int(valido.sum())
+            self.sospechosos += int(df_validacion['sospechoso'].to_numpy(dtype=bool).sum())
+            self.categorias.update(df_validacion['categoria'].value_counts().to_dict())
+            self.operadores.update(df_validacion.loc[valido, 'operador'].value_counts().to_dict())
+            
+            # Repetidos: claves enteras a disco, el resto (raro) en memoria
+            limpios = df_validacion['numero_limpio']
+            presentes = limpios.notna().to_numpy()
+            limpios = limpios[presentes].to_numpy(dtype=object)
+            filas = filas[presentes]
+            claves = claves_numeros(limpios)
+            con_clave = claves > 0
+            
+            for numero, fila in zip(limpios[~con_clave], filas[~con_clave]):
+                registro = self._sin_clave.setdefault(numero, [0, int(fila)])
+                registro[0] += 1
+        
+        unicas, inicio, conteos = np.unique(claves[con_clave], return_index=True, return_counts=True)
+        registros = np.empty(len(unicas), dtype=self._REGISTRO)
+        registros['clave'] = unicas
+        registros['n'] = conteos
+        registros['primera'] = filas[con_clave][inicio]
+        
+        particion = (unicas % np.uint64(self.particiones)).astype(np.int64)
+        orden = np.argsort(particion, kind='stable')
+        limites = np.cumsum(np.bincount(particion, minlength=self.particiones))
+        for p, bloque in enumerate(np.split(registros[orden], limites[:-1])):
+            if len(bloque):
+                with open(self._archivo(p), 'ab') as archivo:
+                    bloque.tofile(archivo)
+    
+    def _repetidos(self) -> Tuple[int, List[Tuple[int, int, str]]]:
+        """Retorna (cantidad de números repetidos, top 10 como (n, primera, número))."""
+        cantidad = 0
+        candidatos = []
+        
+        for p in range(self.particiones):
+            if not os.path.exists(self._archivo(p)):
+                continue
+            datos = np.fromfile(self._archivo(p), dtype=self._REGISTRO)
+            unicas, inversa = np.unique(datos['clave'], return_inverse=True)
+            conteos = np.zeros(len(unicas), dtype=np.uint64)
+            np.add.at(conteos, inversa, datos['n'])
+            primera = np.full(len(unicas), np.iinfo(np.uint64).max, dtype=np.uint64)
+            np.minimum.at(primera, inversa, datos['primera'])
+            
+            repetidas = np.flatnonzero(conteos > 1)
+            cantidad += len(repetidas)
+            top = repetidas[np.lexsort((primera[repetidas], -conteos[repetidas].astype(np.int64)))[:10]]
+            candidatos += [(int(conteos[i]), int(primera[i]), numero_desde_clave(unicas[i])) for i in top]
+        
+        for numero, (conteo, primera_fila) in self._sin_clave.items():
+            if conteo > 1:
+                cantidad += 1
+                candidatos.append((conteo, primera_fila, numero))
+        
+        return cantidad, sorted(candidatos, key=lambda x: (-x[0], x[1]))[:10]
+    
+    def resultado(self, bloques_originales=None) -> Dict:
+        """
+        Estadísticas con las mismas claves de analizar_resultados.
+        
+        Args:
+            bloques_originales: Iterable con los mismos números de entrada, en
+                el mismo orden y por bloques (p. ej. releyendo el archivo),
+                para contar los formatos originales de los más repetidos.
+                Sin él, los formatos quedan vacíos.
+        """
+        total = self.total
+        
+        if total == 0:
+            return {'total': 0}
+        
+        validos = self.validos
+        invalidos = total - validos
+        numeros_repetidos, top = self._repetidos()
+        top = [(numero, conteo) for conteo, _, numero in top]
+        
+        formatos: Dict[int, Counter] = {}
+        if bloques_originales is not None and top:
+            indice = pd.Index([numero for numero, _ in top])
+            for bloque in bloques_originales:
+                grupos = indice.get_indexer(_numeros_moviles(normalizar_numeros(bloque)))
+                for grupo, conteo in _formatos_originales(grupos, bloque).items():
+                    formatos.setdefault(grupo, Counter()).update(conteo)
+        
+        return {
+            'total': total,
+            'validos': validos,
+            'invalidos': invalidos,
+            'porcentaje_validos': round(validos / total * 100, 2),
+            'porcentaje_invalidos': round(invalidos / total * 100, 2),
+            'categorias': dict(self.categorias.most_common()),
+            'operadores': dict(self.operadores.most_common()),
+            'sospechosos': self.sospechosos,
+            'porcentaje_sospechosos': round(self.sospechosos / total * 100, 2),
+            'en_lista_negra': self.en_lista_negra,
+            'numeros_repetidos': numeros_repetidos,
+            'top_repetidos': dict(top),
+            'grupos_repetidos': _grupos_repetidos(top, formatos),
+        }
+
+
+# ==================== CASI DUPLICADOS ====================
+
+TIPOS_CASI_DUPLICADO = ['Un dígito distinto', 'Dígitos vecinos invertidos']
+
+COLUMNAS_CASI_DUPLICADOS = ['numero', 'similar', 'tipo', 'posicion', 'veces_numero', 'veces_similar']
+
+
+def _pares_misma_marca(marcas: np.ndarray, max_grupo: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pares de posiciones (i, j) con la misma marca.
+    
+    Se ordena una vez y solo se comparan vecinos a menos de max_grupo lugares
+    (el tamaño máximo posible de un grupo), en lugar de todos contra todos.
+    """
+    orden = np.argsort(marcas)
+    ordenadas = marcas[orden]
+    izquierda, derecha = [], []
+    for salto in range(1, max_grupo):
+        iguales = np.flatnonzero(ordenadas[:-salto] == ordenadas[salto:])
+        if len(iguales) == 0:
+            # Sin grupos de salto + 1 elementos tampoco los hay más grandes
+            break
+        izquierda.append(orden[iguales])
+        derecha.append(orden[iguales + salto])
+    if not izquierda:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(izquierda), np.concatenate(derecha)
+
+
+def _pares_casi_duplicados(valores: np.ndarray, largo: int,
+                           transposiciones: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pares de números distintos del mismo largo a un dígito de distancia.
+    
+    Para cada posición p, los números que solo difieren en p comparten el
+    valor con ese dígito puesto en 0; para cada par de posiciones vecinas,
+    los que solo las tienen invertidas comparten el valor con esos dos
+    dígitos ordenados.
+    
+    Returns:
+        Tupla (i, j, tipo, posición) con índices en `valores`
+    """
+    pesos = [np.uint64(10 ** (largo - 1 - p)) for p in range(largo)]
+    digitos = [(valores // peso) % np.uint64(10) for peso in pesos]
+    pares = []
+    
+    for p in range(largo):
+        i, j = _pares_misma_marca(valores - digitos[p] * pesos[p], 10)
+        pares.append((i, j, 0, p + 1))
+    
+    if transposiciones:
+        for p in range(largo - 1):
+            a, b = digitos[p], digitos[p + 1]
+            candidatos = np.flatnonzero(a != b)
+            a, b = a[candidatos], b[candidatos]
+            marcas = (valores[candidatos] - a * pesos[p] - b * pesos[p + 1]
+                      + np.minimum(a, b) * pesos[p] + np.maximum(a, b) * pesos[p + 1])
+            i, j = _pares_misma_marca(marcas, 2)
+            pares.append((candidatos[i], candidatos[j], 1, p + 1))
+    
+    return (
+        np.concatenate([i for i, _, _, _ in pares]),
+        np.concatenate([j for _, j, _, _ in pares]),
+        np.concatenate([np.full(len(i), tipo, dtype=np.uint8) for i, _, tipo, _ in pares]),
+        np.concatenate([np.full(len(i), posicion, dtype=np.uint8) for i, _, _, posicion in pares]),
+    )
+
+
+def detectar_casi_duplicados(datos, transposiciones: bool = True) -> pd.DataFrame:
+    """
+    Detecta números que parecen errores de digitación de otro de la lista:
+    un dígito distinto (distancia de Hamming 1) o, opcionalmente, dos dígitos
+    vecinos invertidos.
+    
+    Se trabaja sobre los números distintos (claves enteras) con un índice
+    por posición enmascarada, así el costo crece casi lineal con la lista
+    (~10 ordenamientos por posición) y no con todos los pares.
+    
+    Args:
+        datos: Números crudos, o un resultado de validación (de texto o compacto)
+        transposiciones: Buscar también dígitos vecinos invertidos
+        
+    Returns:
+        DataFrame con una fila por par (COLUMNAS_CASI_DUPLICADOS):
+        - numero / similar: el más frecuente y el otro (probable error)
+        - tipo: uno de TIPOS_CASI_DUPLICADO
+        - posicion: dígito (desde 1) donde difieren; en una inversión, el primero
+        - veces_numero / veces_similar: apariciones de cada uno en la lista
+    """
+    if isinstance(datos, pd.DataFrame):
+        if es_resultado_compacto(datos):
+            claves = datos['numero_limpio'].to_numpy()
+        else:
+            claves = claves_numeros(datos['numero_limpio'].fillna('').to_numpy(dtype=str))
+    else:
+        claves = claves_moviles(datos) if len(datos) else np.empty(0, dtype=np.uint64)
+    
+    # Números distintos y sus apariciones (ordenando, como en _ordenadas_sin_repetir)
+    claves = np.sort(claves[claves != 0])
+    inicio = np.flatnonzero(np.append(True, claves[1:] != claves[:-1])) if len(claves) else np.empty(0, dtype=np.int64)
+    unicas = claves[inicio]
+    veces = np.diff(np.append(inicio, len(claves)))
+    
+    izquierda, derecha, tipos, posiciones = [], [], [], []
+    largos = unicas & np.uint64(31)
+    for largo in np.unique(largos).tolist():
+        indices = np.flatnonzero(largos == largo)
+        i, j, tipo, posicion = _pares_casi_duplicados(unicas[indices] >> np.uint64(5), largo, transposiciones)
+        izquierda.append(indices[i])
+        derecha.append(indices[j])
+        tipos.append(tipo)
+        posiciones.append(posicion)
+    
+    if not izquierda:
+        return pd.DataFrame({columna: pd.Series(dtype=object) for columna in COLUMNAS_CASI_DUPLICADOS})
+    
+    i, j = np.concatenate(izquierda), np.concatenate(derecha)
+    tipo, posicion = np.concatenate(tipos), np.concatenate(posiciones)
+    
+    # El más frecuente va primero (el otro es el probable error); ante empate, el menor
+    invertir = (veces[j] > veces[i]) | ((veces[j] == veces[i]) & (j < i))
+    i, j = np.where(invertir, j, i), np.where(invertir, i, j)
+    orden = np.lexsort((unicas[j], unicas[i], -veces[i]))
+    i, j, tipo, posicion = i[orden], j[orden], tipo[orden], posicion[orden]
+    
+    return pd.DataFrame({
+        'numero': numeros_desde_claves(unicas[i]),
+        'similar': numeros_desde_claves(unicas[j]),
+        'tipo': np.asarray(TIPOS_CASI_DUPLICADO, dtype=object)[tipo],
+        'posicion': posicion.astype(np.int64),
+        'veces_numero': veces[i],
+        'veces_similar': veces[j],
+    })
+
+
 # ==================== EJEMPLO DE USO CON STREAMLIT ====================
 
 def ejemplo_streamlit():
@@ -442,8 +1880,8 @@ def ejemplo_streamlit():
         )
 
 
-if __name__ == "__main__":
-    # Prueba rápida
+def demo_consola():
+    """Prueba rápida en consola con algunos números de ejemplo."""
     numeros_prueba = [
         "573001234567",
         "+573151234567",
@@ -470,3 +1908,12 @@ if __name__ == "__main__":
     
     print("\n" + "=" * 60)
     print("\nPara usar en Streamlit, importa y llama a ejemplo_streamlit()")
+
+
+if __name__ == "__main__":
+    # python -m phone_validator → validador por línea de comandos (ver validador_cli.py)
+    import sys
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from validador_cli import main
+    sys.exit(main())
@@ -0,0 +1,568 @@
+"""
+Generador de reportes mensuales sin interfaz (no requiere abrir la app).
+Escribe en reportes_mensajes/<YYYY-MM>/ un HTML autocontenido con los gráficos,
+las tablas en CSV, los agregados en JSON y el resumen de utils.generate_summary_text.
+
+Es incremental: los datos se leen del almacén particionado por mes (ver
+partition_store.py, que solo vuelve a ingerir los archivos que cambiaron) y
+solo se regeneran las secciones cuyos datos cambiaron.
+
+Uso (desde la carpeta scripts/):
+    python report_generator.py                          # todos los meses con datos
+    python report_generator.py --mes 2026-01 --mes 2026-02
+    python report_generator.py --datos /ruta/cliente/data --salida /ruta/cliente/reportes -p 4
+"""
+
+import argparse
+import html
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from aggregates import MISSING_LABEL, NO_DATE, sorted_counts
+from config import DATA_DIR, MESSAGES, REPORTS_DIR, resolve_data_files
+from partition_store import compare_counts, ingest, load_months, month_metrics, previous_month, store_dir_for
+from phone_validator import CATEGORIAS, OPERADORES, validar_lista_numeros_compacto
+from utils import generate_summary_text
+from visualizations import (
+    create_comparison_chart,
+    create_donut_chart,
+    create_horizontal_bar_chart,
+    create_sankey_diagram,
+    create_status_bar_chart,
+    create_time_series_chart,
+    stable_hash,
+)
+
+
+# Cambia cuando cambia el contenido de las secciones (fuerza regenerarlas)
+REPORT_VERSION = 2
+
+SECTIONS = {
+    "resumen": "📊 Resumen",
+    "sms": "📱 SMS",
+    "whatsapp": "💬 WhatsApp",
+    "interacciones": "💌 Interacciones",
+}
+
+REPORT_FILE = "reporte.html"
+SUMMARY_FILE = "resumen.txt"
+MANIFEST_FILE = "manifest.json"
+FRAGMENTS_DIR = ".secciones"
+TABLES_DIR = "tablas"
+DATA_SUBDIR = "datos"
+
+
+# ============= DATOS DE CADA SECCIÓN =============
+
+def available_months(aggregates: Dict[str, Dict[str, Dict]]) -> List[str]:
+    """Meses con datos fechados en alguna fuente (o solo NO_DATE si nada tiene fecha)."""
+    months = sorted({month for by_month in aggregates.values() for month in by_month} - {NO_DATE})
+    if not months and any(NO_DATE in by_month for by_month in aggregates.values()):
+        months = [NO_DATE]
+    return months
+
+
+def _sorted_section(aggregates: Dict, keys: Tuple[str, ...]) -> Dict:
+    """Copia de los agregados con los conteos indicados de mayor a menor (tras combinar archivos)."""
+    return {key: sorted_counts(value) if key in keys else value for key, value in aggregates.items()}
+
+
+def section_payloads(aggregates: Dict[str, Dict[str, Dict]], month: str) -> Dict[str, Dict]:
+    """
+    Datos de cada sección del reporte de un mes (solo tipos JSON).
+
+    Las interacciones sin fecha de envío (el archivo no trae una columna de
+    fecha) se incluyen completas en todos los meses, indicándolo.
+    """
+    sms = _sorted_section(aggregates["sms"].get(month, {}), ("states", "operators", "message_types"))
+    whatsapp = _sorted_section(aggregates["whatsapp"].get(month, {}), ("states", "replies", "error_codes"))
+
+    by_month = aggregates["interacciones"]
+    undated = month != NO_DATE and month not in by_month and set(by_month) == {NO_DATE}
+    interacciones = _sorted_section(by_month.get(NO_DATE if undated else month, {}),
+                                    ("states", "operators", "short_codes"))
+
+    # Mes anterior (si hay datos de él) para la comparación
+    previous = previous_month(month) if month != NO_DATE else None
+    previous_metrics = None
+    if previous and any(previous in by_source for by_source in aggregates.values()):
+        previous_metrics = month_metrics({source: aggregates[source].get(previous, {}) for source in aggregates})
+
+    sms_total, whatsapp_total = sms.get("total", 0), whatsapp.get("total", 0)
+    return {
+        "resumen": {
+            "month": month,
+            "metrics": month_metrics({"sms": sms, "whatsapp": whatsapp, "interacciones": interacciones}),
+            "previous_month": previous if previous_metrics else None,
+            "previous_metrics": previous_metrics,
+            "sms_total": sms_total,
+            "sms_states": sms.get("states", {}),
+            "whatsapp_total": whatsapp_total,
+            "whatsapp_states": whatsapp.get("states", {}),
+            "interacciones_total": interacciones.get("total", 0),
+            "summary": generate_summary_text(sms_total, whatsapp_total,
+                                             sms.get("states", {}), whatsapp.get("states", {})),
+        },
+        "sms": {"month": month, **sms},
+        "whatsapp": {"month": month, **whatsapp},
+        "interacciones": {"month": month, "undated": undated, **interacciones},
+    }
+
+
+# ============= RENDERIZADO (HTML Y TABLAS) =============
+
+def _figure_html(fig) -> str:
+    return fig.to_html(full_html=False, include_plotlyjs=False,
+                       config={"displaylogo": False, "responsive": True})
+
+
+def _metrics_html(metrics: Dict[str, str]) -> str:
+    cards = "".join(
+        f'<div class="metric"><div class="label">{html.escape(name)}</div>'
+        f'<div class="value">{html.escape(str(value))}</div></div>'
+        for name, value in metrics.items()
+    )
+    return f'<div class="metrics">{cards}</div>'
+
+
+def _table_html(df: pd.DataFrame, title: str) -> str:
+    return f"<h4>{html.escape(title)}</h4>" + df.to_html(index=False, border=0, classes="tabla", escape=True)
+
+
+def _row(*blocks: str) -> str:
+    return '<div class="row">' + "".join(f'<div class="col">{block}</div>' for block in blocks) + "</div>"
+
+
+def _empty(text: str) -> str:
+    return f'<p class="empty">{html.escape(text)}</p>'
+
+
+def _percent_table(counts: Dict[str, int], total: int, label: str) -> pd.DataFrame:
+    """Tabla [label, Cantidad, Porcentaje] como las de la app."""
+    return pd.DataFrame(
+        [(name, count, f"{count / total * 100:.1f}%" if total else "0.0%") for name, count in counts.items()],
+        columns=[label, "Cantidad", "Porcentaje"],
+    )
+
+
+def _daily_frame(daily: Dict[str, int]) -> pd.DataFrame:
+    return pd.DataFrame({"Fecha": pd.to_datetime(list(daily)), "Cantidad": list(daily.values())})
+
+
+def _top_state(states: Dict[str, int]) -> str:
+    return next(iter(states), "-")
+
+
+def _render_resumen(payload: Dict) -> Tuple[str, Dict[str, pd.DataFrame]]:
+    metrics, previous = payload["metrics"], payload["previous_metrics"]
+    parts = [
+        _metrics_html({
+            "📱 SMS": f"{payload['sms_total']:,}",
+            "💬 WhatsApp": f"{payload['whatsapp_total']:,}",
+            "💌 Interacciones": f"{payload['interacciones_total']:,}",
+        }),
+        f'<pre class="summary">{html.escape(payload["summary"].strip())}</pre>',
+    ]
+    tables = {"indicadores": pd.DataFrame(list(metrics.items()), columns=["Indicador", "Mes"])}
+    if previous:
+        # Mismo orden de indicadores que en month_metrics
+        comparison = compare_counts(metrics, previous, "Indicador").set_index("Indicador")
+        tables["indicadores"] = comparison.loc[list(metrics)].reset_index()
+        parts.append(_table_html(tables["indicadores"], f"Comparación con {payload['previous_month']}"))
+
+    if payload["sms_states"] or payload["whatsapp_states"]:
+        fig = create_comparison_chart({"states": payload["sms_states"]}, {"states": payload["whatsapp_states"]})
+        parts.append(_figure_html(fig))
+    return "".join(parts), tables
+
+
+def _render_sms(payload: Dict) -> Tuple[str, Dict[str, pd.DataFrame]]:
+    total = payload.get("total", 0)
+    if not total:
+        return _empty("No hay SMS enviados en este mes."), {}
+
+    states, clicks = payload["states"], payload["clicks"]
+    total_clicks = sum(clicks[f"total_clicks_url{i}"] for i in (1, 2, 3))
+    with_clicks = clicks["total_with_clicks"]
+    parts = [_metrics_html({
+        "📊 Total SMS": f"{total:,}",
+        "🏷️ Estados Únicos": f"{len(states)}",
+        "🔝 Estado Principal": _top_state(states),
+        "👥 Personas con Clicks": f"{with_clicks:,} ({with_clicks / total * 100:.1f}%)",
+        "🔗 Total de Clicks": f"{total_clicks:,}",
+    })]
+
+    parts.append(_row(_figure_html(create_status_bar_chart(states, "SMS por Estado")),
+                      _figure_html(create_donut_chart(states, "Proporción de Estados"))))
+
+    flows = pd.DataFrame(
+        [(operator, state, count) for operator, by_state in payload["operator_states"].items()
+         for state, count in by_state.items()],
+        columns=["Operador", "Estado", "Cantidad"],
+    )
+    parts.append(_figure_html(create_sankey_diagram(flows, stages=["Operador", "Estado"], value_col="Cantidad",
+                                                    title="Flujo SMS: Operador → Estado")))
+
+    engagement = {f"URL {i}": clicks[f"total_clicks_url{i}"] for i in (1, 2, 3)}
+    daily = _daily_frame(payload.get("daily", {}))
+    parts.append(_row(_figure_html(create_horizontal_bar_chart(engagement, "Total Clicks por URL")),
+                      _figure_html(create_time_series_chart(daily, "Fecha", "SMS por Día", value_col="Cantidad"))
+                      if len(daily) else ""))
+
+    tables = {
+        "estados": _percent_table(states, total, "Estado"),
+        "operadores": _percent_table(payload["operators"], total, "Operador"),
+        "tipos_mensaje": _percent_table(payload["message_types"], total, "Tipo Mensaje"),
+        "clicks": pd.DataFrame(
+            [(f"URL {i}", clicks[f"clicks_url{i}"], clicks[f"total_clicks_url{i}"]) for i in (1, 2, 3)],
+            columns=["URL", "Personas", "Total Clicks"],
+        ),
+        "diario": daily,
+    }
+    parts.append(_row(_table_html(tables["estados"], "Detalles de Estados"),
+                      _table_html(tables["operadores"], "Detalles por Operador")))
+    return "".join(parts), tables
+
+
+def _phone_quality(phones: List[str]) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Conteo por categoría de validación y por operador de los teléfonos únicos."""
+    if not phones:
+        return {}, {}
+    compacto = validar_lista_numeros_compacto(phones)
+    categories = np.bincount(compacto["categoria"].to_numpy(), minlength=len(CATEGORIAS))
+    operators = np.bincount(compacto["operador"].to_numpy(), minlength=len(OPERADORES))
+    return (sorted_counts({CATEGORIAS[i]: int(n) for i, n in enumerate(categories) if n}),
+            sorted_counts({OPERADORES[i]: int(n) for i, n in enumerate(operators) if n}))
+
+
+def _render_whatsapp(payload: Dict) -> Tuple[str, Dict[str, pd.DataFrame]]:
+    total = payload.get("total", 0)
+    if not total:
+        return _empty("No hay mensajes de WhatsApp enviados en este mes."), {}
+
+    states = payload["states"]
+    failed, processing = states.get("Failed", 0), states.get("Processing", 0)
+    parts = [_metrics_html({
+        "💬 Total WhatsApp": f"{total:,}",
+        "📂 Archivos": f"{len(payload['by_file'])}",
+        "🔝 Estado Principal": _top_state(states),
+        "🔴 Fallidos": f"{failed:,} ({failed / total * 100:.1f}%)",
+        "🟡 En Procesamiento": f"{processing:,}",
+    })]
+
+    parts.append(_row(_figure_html(create_status_bar_chart(states, "WhatsApp por Estado")),
+                      _figure_html(create_donut_chart(states, "Proporción de Estados"))))
+
+    daily = _daily_frame(payload.get("daily", {}))
+    parts.append(_row(
+        _figure_html(create_sankey_diagram(["Enviados"] * len(states), list(states), list(states.values()),
+                                           "Flujo WhatsApp")),
+        _figure_html(create_time_series_chart(daily, "Fecha", "WhatsApp por Día", value_col="Cantidad"))
+        if len(daily) else "",
+    ))
+
+    # Calidad de datos de los números fallidos / en procesamiento
+    problem_phones = sorted(set(payload["failed_phones"]) | set(payload["processing_phones"]))
+    by_category, by_operator = _phone_quality(problem_phones)
+    repeated = sorted_counts({phone: n for phone, n in payload["failed_phones"].items() if n > 1})
+    tables = {
+        "estados": _percent_table(states, total, "Estado"),
+        "por_archivo": pd.DataFrame(
+            [(name, state, count) for name, data in payload["by_file"].items()
+             for state, count in sorted_counts(data["states"]).items()],
+            columns=["Archivo", "Estado", "Cantidad"],
+        ),
+        "codigos_error": pd.DataFrame(list(payload["error_codes"].items()), columns=["Código", "Cantidad"]),
+        "numeros_repetidos": pd.DataFrame(list(repeated.items())[:20],
+                                          columns=["Número Teléfono", "Intentos Fallidos"]),
+        "calidad_categoria": pd.DataFrame(list(by_category.items()), columns=["Categoría", "Números"]),
+        "diario": daily,
+    }
+
+    parts.append("<h3>🔍 Calidad de Datos: Mensajes Problemáticos</h3>")
+    if problem_phones:
+        parts.append(_metrics_html({
+            "📱 Teléfonos Únicos": f"{len(problem_phones):,}",
+            "✓ Números Válidos": f"{by_category.get('Válido', 0) + by_category.get('Válido (Sospechoso)', 0):,}",
+            "⚠️ Sospechosos": f"{by_category.get('Válido (Sospechoso)', 0):,}",
+        }))
+        parts.append(_row(
+            _figure_html(create_horizontal_bar_chart(by_category, "Distribución por Categoría")),
+            _figure_html(create_horizontal_bar_chart(by_operator, "Números con Problemas por Operador")),
+        ))
+        if payload["error_codes"]:
+            parts.append(_figure_html(create_horizontal_bar_chart(payload["error_codes"],
+                                                                  "Códigos de Error Más Frecuentes")))
+        if repeated:
+            parts.append(_table_html(tables["numeros_repetidos"], "Números con Múltiples Intentos Fallidos"))
+    else:
+        parts.append(_empty("✅ No hay mensajes con estado 'Failed' o 'Processing'."))
+
+    parts.append(_row(_table_html(tables["estados"], "Detalles de Estados"),
+                      _table_html(tables["por_archivo"], "Distribución por Archivo")))
+    return "".join(parts), tables
+
+
+def _render_interacciones(payload: Dict) -> Tuple[str, Dict[str, pd.DataFrame]]:
+    total = payload.get("total", 0)
+    if not total:
+        return _empty("No hay interacciones en este mes."), {}
+
+    states, operators, codes = payload["states"], payload["operators"], payload["short_codes"]
+    parts = []
+    if payload["undated"]:
+        parts.append(_empty("El archivo de interacciones no tiene fecha de envío: se muestra completo."))
+    parts.append(_metrics_html({
+        "💌 Total Interacciones": f"{total:,}",
+        "🏷️ Estados Únicos": f"{len(states)}",
+        "📡 Operadores": f"{len([o for o in operators if o != MISSING_LABEL])}",
+        "🔢 Códigos Cortos": f"{len([c for c in codes if c != MISSING_LABEL])}",
+    }))
+
+    parts.append(_row(_figure_html(create_status_bar_chart(states, "Interacciones por Estado")),
+                      _figure_html(create_donut_chart(states, "Proporción de Estados"))))
+    parts.append(_row(_figure_html(create_horizontal_bar_chart(operators, "Interacciones por Operador")),
+                      _figure_html(create_horizontal_bar_chart(codes, "Interacciones por Código"))))
+
+    flows = [(f"{messages} msgs", state, count) for messages, by_state in payload["message_states"].items()
+             for state, count in by_state.items()]
+    if flows:
+        source, target, value = (list(column) for column in zip(*flows))
+        parts.append(_figure_html(create_sankey_diagram(source, target, value, "Flujo de Interacciones")))
+
+    tables = {
+        "estados": _percent_table(states, total, "Estado"),
+        "operadores": _percent_table(operators, total, "Operador"),
+        "codigos_cortos": _percent_table(codes, total, "Código Corto"),
+    }
+    parts.append(_row(_table_html(tables["estados"], "Detalles de Estados"),
+                      _table_html(tables["operadores"], "Detalles por Operador")))
+    return "".join(parts), tables
+
+
+_RENDERERS: Dict[str, Callable[[Dict], Tuple[str, Dict[str, pd.DataFrame]]]] = {
+    "resumen": _render_resumen,
+    "sms": _render_sms,
+    "whatsapp": _render_whatsapp,
+    "interacciones": _render_interacciones,
+}
+
+
+def render_section(section: str, payload: Dict) -> Tuple[str, Dict[str, pd.DataFrame]]:
+    """HTML (sin plotly.js) y tablas de una sección. Se ejecuta en el proceso principal o en un worker."""
+    return _RENDERERS[section](payload)
+
+
+# ============= ESCRITURA DEL REPORTE =============
+
+_STYLE = """
+body { font-family: Arial, sans-serif; margin: 0 auto; max-width: 1400px; padding: 1rem 2rem; color: #333; }
+h1 { color: #0d47a1; margin-bottom: 0.2rem; }
+.sub { color: #555; font-style: italic; margin-bottom: 1.5rem; }
+nav a { margin-right: 1.2rem; color: #1f77b4; text-decoration: none; font-weight: 600; }
+h2 { color: #0d47a1; border-left: 5px solid #1f77b4; padding-left: 12px; margin-top: 2.5rem;
+     text-transform: uppercase; }
+.metrics { display: flex; flex-wrap: wrap; gap: 12px; margin: 1rem 0; }
+.metric { background: #e3f2fd; border-left: 4px solid #1f77b4; border-radius: 6px; padding: 10px 16px;
+          min-width: 160px; }
+.metric .label { font-size: 0.85rem; color: #555; }
+.metric .value { font-size: 1.4rem; font-weight: 700; }
+.row { display: flex; flex-wrap: wrap; gap: 16px; }
+.col { flex: 1 1 500px; min-width: 0; }
+.summary { background: #f5f5f5; padding: 1rem; border-radius: 6px; }
+.tabla { border-collapse: collapse; margin-bottom: 1rem; }
+.tabla th, .tabla td { padding: 4px 12px; border-bottom: 1px solid #ddd; text-align: left; }
+.empty { color: #888; font-style: italic; }
+footer { text-align: center; color: #888; font-size: 0.85rem; margin: 3rem 0 1rem; }
+"""
+
+
+def _month_title(month: str) -> str:
+    return "Sin fecha de envío" if month == NO_DATE else month
+
+
+def _report_html(month: str, fragments: Dict[str, str]) -> str:
+    """Página completa: plotly.js embebido una vez y las secciones en orden."""
+    from plotly.offline import get_plotlyjs
+
+    nav = "".join(f'<a href="#{section}">{html.escape(title)}</a>' for section, title in SECTIONS.items())
+    body = "".join(
+        f'<section id="{section}"><h2>{html.escape(title)}</h2>{fragments[section]}</section>'
+        for section, title in SECTIONS.items()
+    )
+    return (
+        '<!DOCTYPE html>\n<html lang="es"><head><meta charset="utf-8">'
+        f"<title>{html.escape(MESSAGES['title'])} · {html.escape(_month_title(month))}</title>"
+        f"<style>{_STYLE}</style><script>{get_plotlyjs()}</script></head><body>"
+        f"<h1>{html.escape(MESSAGES['title'])} · {html.escape(_month_title(month))}</h1>"
+        f'<div class="sub">{html.escape(MESSAGES["subtitle"])} · generado el '
+        f'{datetime.now().strftime("%Y-%m-%d %H:%M")}</div><nav>{nav}</nav>{body}'
+        "<footer>📊 Análisis de Campañas de Comunicación · Cuántico Tecnología</footer></body></html>"
+    )
+
+
+def _read_manifest(month_dir: Path) -> Dict:
+    try:
+        with open(month_dir / MANIFEST_FILE, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get("version") == REPORT_VERSION else {}
+
+
+def _write_text(path: Path, text: str) -> None:
+    """Escribe un archivo de forma atómica (nunca queda a medio escribir)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_text(text, encoding="utf-8")
+    os.replace(temporary, path)
+
+
+def _write_section(month_dir: Path, section: str, payload: Dict, fragment: str,
+                   tables: Dict[str, pd.DataFrame]) -> None:
+    """Fragmento HTML, agregados (JSON) y tablas (CSV) de una sección."""
+    _write_text(month_dir / FRAGMENTS_DIR / f"{section}.html", fragment)
+    _write_text(month_dir / DATA_SUBDIR / f"{section}.json", json.dumps(payload, ensure_ascii=False, indent=2))
+
+    tables_dir = month_dir / TABLES_DIR
+    tables_dir.mkdir(parents=True, exist_ok=True)
+    for old in tables_dir.glob(f"{section}_*.csv"):
+        old.unlink()
+    for name, table in tables.items():
+        table.to_csv(tables_dir / f"{section}_{name}.csv", index=False)
+
+    if section == "resumen":
+        _write_text(month_dir / SUMMARY_FILE, payload["summary"].strip() + "\n")
+
+
+def generate_reports(months: Optional[List[str]] = None, data_dir=None, files: Optional[Dict] = None,
+                     output_dir=REPORTS_DIR, workers: int = 1, force: bool = False,
+                     store_dir=None, reingest: bool = False,
+                     progress: Callable[[str], None] = lambda message: None) -> Dict[str, List[str]]:
+    """
+    Genera (o actualiza) los reportes mensuales.
+
+    Args:
+        months: Meses "YYYY-MM" a generar (por defecto todos los que tienen datos)
+        data_dir: Directorio con la estructura de data/ (por defecto el del proyecto)
+        files: {fuente: [archivos]} explícitos, en lugar de data_dir
+        output_dir: Directorio de reportes (un subdirectorio por mes)
+        workers: Procesos para leer archivos y construir las secciones en paralelo
+        force: Regenerar todo aunque nada haya cambiado
+        store_dir: Almacén particionado por mes (por defecto el de data_dir)
+        reingest: Volver a particionar todos los archivos
+        progress: Función que recibe los mensajes de avance
+
+    Returns:
+        {mes: secciones regeneradas} (lista vacía si el mes ya estaba al día)
+    """
+    output_dir = Path(output_dir)
+    files = files or resolve_data_files(data_dir or DATA_DIR)
+
+    store = Path(store_dir) if store_dir else store_dir_for(data_dir or DATA_DIR)
+    ingest(files, data_dir or DATA_DIR, store, workers, force=reingest, progress=progress)
+    aggregates = load_months(store_dir=store)
+
+    available = available_months(aggregates)
+    for month in months or []:
+        if month not in available:
+            progress(f"  ⚠️ {month}: sin datos, se omite")
+    months = [month for month in (months or available) if month in available]
+
+    # Secciones cuyo contenido cambió (o que faltan en disco)
+    pending: List[Tuple[str, str, Dict, str]] = []
+    manifests: Dict[str, Dict] = {}
+    for month in months:
+        month_dir = output_dir / month
+        manifest = _read_manifest(month_dir).get("sections", {})
+        manifests[month] = dict(manifest)
+        for section, payload in section_payloads(aggregates, month).items():
+            digest = stable_hash(REPORT_VERSION, section, payload)
+            if force or manifest.get(section) != digest or not (month_dir / FRAGMENTS_DIR / f"{section}.html").exists():
+                pending.append((month, section, payload, digest))
+
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            rendered = list(pool.map(render_section, [p[1] for p in pending], [p[2] for p in pending]))
+    else:
+        rendered = [render_section(section, payload) for _, section, payload, _ in pending]
+
+    regenerated: Dict[str, List[str]] = {month: [] for month in months}
+    for (month, section, payload, digest), (fragment, tables) in zip(pending, rendered):
+        _write_section(output_dir / month, section, payload, fragment, tables)
+        manifests[month][section] = digest
+        regenerated[month].append(section)
+
+    for month in months:
+        month_dir = output_dir / month
+        if regenerated[month] or not (month_dir / REPORT_FILE).exists():
+            fragments = {section: (month_dir / FRAGMENTS_DIR / f"{section}.html").read_text(encoding="utf-8")
+                         for section in SECTIONS}
+            _write_text(month_dir / REPORT_FILE, _report_html(month, fragments))
+            _write_text(month_dir / MANIFEST_FILE, json.dumps(
+                {"version": REPORT_VERSION, "sections": manifests[month],
+                 "generated": datetime.now().isoformat(timespec="seconds")}, indent=2))
+            progress(f"  ✓ {month}: {', '.join(regenerated[month]) or 'reporte'} actualizado")
+        else:
+            progress(f"  ✓ {month}: sin cambios")
+
+    return regenerated
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python report_generator.py",
+        description="Genera los reportes mensuales (HTML, CSV, JSON y resumen) en reportes_mensajes/<YYYY-MM>/.",
+    )
+    parser.add_argument("--mes", action="append", metavar="YYYY-MM",
+                        help="Mes a generar; se puede repetir (por defecto todos los meses con datos)")
+    parser.add_argument("--datos", help="Directorio con la estructura de data/ (p. ej. el de un cliente)")
+    parser.add_argument("--salida", default=str(REPORTS_DIR), help="Directorio de reportes (por defecto reportes_mensajes/)")
+    parser.add_argument("-p", "--procesos", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Procesos en paralelo para leer archivos y construir gráficos")
+    parser.add_argument("--forzar", action="store_true", help="Regenerar todas las secciones aunque no hayan cambiado")
+    parser.add_argument("--almacen", help="Almacén particionado por mes (por defecto <datos>/particiones)")
+    parser.add_argument("--reparticionar", action="store_true",
+                        help="Volver a particionar todos los archivos aunque no hayan cambiado")
+    parser.add_argument("-q", "--silencioso", action="store_true", help="No mostrar el progreso")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de la línea de comandos."""
+    args = _parser().parse_args(argv)
+
+    def progress(message: str) -> None:
+        if not args.silencioso:
+            print(message, file=sys.stderr, flush=True)
+
+    if args.datos and not Path(args.datos).is_dir():
+        print(f"❌ No existe el directorio de datos: {args.datos}", file=sys.stderr)
+        return 1
+
+    start = time.time()
+    try:
+        regenerated = generate_reports(args.mes, args.datos, output_dir=args.salida,
+                                       workers=args.procesos, force=args.forzar, store_dir=args.almacen,
+                                       reingest=args.reparticionar, progress=progress)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"❌ Error al generar los reportes: {e}", file=sys.stderr)
+        return 1
+
+    if not regenerated:
+        progress("⚠️ No hay meses con datos para reportar")
+    progress(f"✓ Tiempo total: {time.time() - start:.2f} segundos")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,373 @@
+"""
+Caché de resultados en disco para las funciones de data_loader.py.
+
+A diferencia de @st.cache_data (solo en memoria, se pierde al reiniciar y no
+sabe si el CSV cambió), @disk_cache guarda cada resultado en disco con una
+clave que incluye la función, sus argumentos y la huella (tamaño y fecha de
+modificación) de los archivos que lee. Reemplazar un archivo cambia la clave,
+así que nunca se sirven datos viejos; al reiniciar, los resultados se leen del
+disco. Las entradas más recientes se guardan también en memoria, dentro del
+presupuesto de memoria del proceso (memory_budget.py), y el disco se limita
+por tamaño, borrando primero las usadas hace más tiempo.
+
+Si varias sesiones piden a la vez un resultado que no está en caché (p. ej.
+tras un despliegue o al cambiar un archivo), solo una lo calcula: las demás
+esperan ese mismo cálculo y comparten su resultado (SingleFlight), en lugar
+de leer cada una el archivo completo.
+
+Uso (desde la carpeta scripts/):
+    python result_cache.py                                   # entradas por función
+    python result_cache.py --limpiar                         # borrar todo
+    python result_cache.py --limpiar --funcion get_sms_statistics
+"""
+
+import argparse
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import RESULT_CACHE_DIR, RESULT_CACHE_MAX_MB, RESULT_CACHE_MEMORY_ENTRIES
+from memory_budget import MEMORY_BUDGET, MemoryBudget
+from utils import file_fingerprint
+
+
+ENTRY_SUFFIX = ".pkl"
+
+# Marca de compute(): el resultado se encontró en la caché, no se calculó
+_FROM_CACHE = object()
+
+
+class ResultCache:
+    """
+    Caché de dos niveles segura entre hilos: memoria (LRU por número de
+    entradas y, con budget, por bytes junto con las demás cachés del
+    presupuesto) y disco (LRU por tamaño, según la fecha de último uso).
+    Guarda bytes (resultados serializados): cada lectura retorna una copia.
+    """
+
+    def __init__(self, cache_dir=RESULT_CACHE_DIR, max_bytes: int = RESULT_CACHE_MAX_MB * 1024 * 1024,
+                 memory_entries: int = RESULT_CACHE_MEMORY_ENTRIES, budget: Optional[MemoryBudget] = None):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.budget = budget
+        # nombre de la entrada → (bytes, último uso)
+        self._memory: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, name: str, key: str) -> Path:
+        return self.cache_dir / f"{name}-{key}{ENTRY_SUFFIX}"
+
+    def _forget(self, entry: str) -> int:
+        data, _ = self._memory.pop(entry)
+        self._memory_bytes -= len(data)
+        return len(data)
+
+    def _remember(self, path: Path, data: bytes) -> None:
+        if path.name in self._memory:
+            self._forget(path.name)
+        if self.budget is not None and not self.budget.fits(len(data)):
+            return  # más grande que todo el presupuesto: solo en disco
+        self._memory[path.name] = (data, time.monotonic())
+        self._memory_bytes += len(data)
+        while len(self._memory) > self.memory_entries:
+            self._forget(next(iter(self._memory)))
+
+    def _enforce_budget(self) -> None:
+        if self.budget is not None:
+            self.budget.enforce()
+
+    def memory_usage(self) -> Tuple[int, int]:
+        """(entradas, bytes) en memoria."""
+        with self._lock:
+            return len(self._memory), self._memory_bytes
+
+    def oldest_use(self) -> Optional[float]:
+        with self._lock:
+            return next(iter(self._memory.values()))[1] if self._memory else None
+
+    def evict_oldest(self) -> int:
+        """Quita de la memoria la entrada usada hace más tiempo (sigue en disco); retorna sus bytes."""
+        with self._lock:
+            return self._forget(next(iter(self._memory))) if self._memory else 0
+
+    def get(self, name: str, key: str) -> Optional[bytes]:
+        path = self._path(name, key)
+        with self._lock:
+            entry = self._memory.get(path.name)
+            if entry is not None:
+                self._memory[path.name] = (entry[0], time.monotonic())
+                self._memory.move_to_end(path.name)
+                self.hits += 1
+                return entry[0]
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # marca el uso para el LRU del disco
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self._remember(path, data)
+            self.disk_hits += 1
+        self._enforce_budget()
+        return data
+
+    def put(self, name: str, key: str, data: bytes) -> None:
+        path = self._path(name, key)
+        with self._lock:
+            self._remember(path, data)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            self._evict()
+        except OSError:
+            pass  # sin disco (p. ej. solo lectura) sigue sirviendo desde memoria
+        # Después de escribir en disco: lo que salga de la memoria se vuelve a leer de ahí
+        self._enforce_budget()
+
+    def _entries(self) -> List[Tuple[Path, os.stat_result]]:
+        entries = []
+        for path in self.cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+            try:
+                entries.append((path, path.stat()))
+            except OSError:
+                pass
+        return entries
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+
+    def clear(self, name: Optional[str] = None) -> int:
+        """Borra las entradas (de una función, o todas); retorna cuántas había en disco."""
+        prefix = f"{name}-" if name else ""
+        with self._lock:
+            for entry in [entry for entry in self._memory if entry.startswith(prefix)]:
+                self._forget(entry)
+        removed = 0
+        for path, _ in self._entries():
+            if path.name.startswith(prefix):
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def info(self) -> Dict:
+        """Entradas en disco por función (cantidad, bytes, último uso) y aciertos de este proceso."""
+        functions: Dict[str, Dict] = {}
+        for path, stat in self._entries():
+            name = path.name[:-len(ENTRY_SUFFIX)].rsplit("-", 1)[0]
+            entry = functions.setdefault(name, {"entries": 0, "bytes": 0, "last_used": 0.0})
+            entry["entries"] += 1
+            entry["bytes"] += stat.st_size
+            entry["last_used"] = max(entry["last_used"], stat.st_mtime)
+        with self._lock:
+            return {
+                "functions": functions,
+                "bytes": sum(entry["bytes"] for entry in functions.values()),
+                "max_bytes": self.max_bytes,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+
+class SingleFlight:
+    """
+    Una sola ejecución en curso por clave: quien llega mientras otro hilo
+    calcula la misma clave espera ese cálculo y recibe su resultado (o su error).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self.shared = 0
+
+    def do(self, key: str, func: Callable[[], object]) -> Tuple[object, bool]:
+        """Retorna (resultado, compartido); compartido es True si lo calculó otro hilo."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.shared += 1
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+_RESULT_CACHE = ResultCache(budget=MEMORY_BUDGET)
+MEMORY_BUDGET.register("resultados", _RESULT_CACHE)
+_IN_FLIGHT = SingleFlight()
+
+
+def _input_paths(inputs) -> List[Path]:
+    paths = []
+    for item in inputs:
+        if isinstance(item, (list, tuple)):
+            paths.extend(_input_paths(item))
+        elif callable(item):
+            paths.extend(_input_paths([item()]))
+        elif item is not None:
+            paths.append(Path(item))
+    return paths
+
+
+def _fingerprint(path: Path) -> str:
+    try:
+        return file_fingerprint(path)
+    except OSError:
+        return "sin-archivo"
+
+
+@functools.lru_cache(maxsize=None)
+def _file_hash(path: str) -> str:
+    return hashlib.blake2b(Path(path).read_bytes(), digest_size=8).hexdigest()
+
+
+def _source_hash(func) -> str:
+    """Hash del código del módulo de la función: cambiar el código invalida sus resultados."""
+    try:
+        # Una lectura por módulo, no una por función decorada
+        return _file_hash(inspect.getfile(func))
+    except (OSError, TypeError):
+        return hashlib.blake2b(func.__code__.co_code, digest_size=8).hexdigest()
+
+
+def disk_cache(*inputs):
+    """
+    Decorador: guarda el resultado en memoria y en disco, con la clave de la
+    función, sus argumentos (con los valores por defecto aplicados) y la huella
+    de los archivos `inputs` que lee (rutas, listas de rutas o funciones que
+    las retornan, que se llaman al usar la función y no al decorarla).
+
+    La función original queda en `.uncached`; `.clear()` borra sus entradas.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        code_hash = _source_hash(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = hashlib.blake2b(repr((
+                func.__qualname__,
+                code_hash,
+                sorted(bound.arguments.items()),
+                [(str(path), _fingerprint(path)) for path in _input_paths(inputs)],
+            )).encode(), digest_size=16).hexdigest()
+
+            data = _RESULT_CACHE.get(func.__name__, key)
+            if data is not None:
+                return pickle.loads(data)
+
+            def compute():
+                # Otro hilo pudo guardarlo entre la consulta y este cálculo
+                data = _RESULT_CACHE.get(func.__name__, key)
+                if data is not None:
+                    return data, _FROM_CACHE
+                result = func(*args, **kwargs)
+                try:
+                    data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+                except (pickle.PicklingError, TypeError, AttributeError):
+                    return None, result
+                _RESULT_CACHE.put(func.__name__, key, data)
+                return data, result
+
+            (data, result), shared = _IN_FLIGHT.do(key, compute)
+            # Quien calculó se queda con su objeto; los demás reciben una copia
+            # (si no se pudo serializar, todos comparten el mismo objeto)
+            if data is not None and (shared or result is _FROM_CACHE):
+                return pickle.loads(data)
+            return result
+
+        wrapper.uncached = func
+        wrapper.clear = lambda: _RESULT_CACHE.clear(func.__name__)
+        return wrapper
+
+    return decorator
+
+
+def result_cache_info() -> Dict:
+    """Estado de la caché de resultados (entradas en disco por función, aciertos, cálculos compartidos)."""
+    return {**_RESULT_CACHE.info(), "shared": _IN_FLIGHT.shared, "in_flight": _IN_FLIGHT.in_flight()}
+
+
+def clear_result_cache(name: Optional[str] = None) -> int:
+    """Vacía la caché de resultados (o solo la de una función)."""
+    return _RESULT_CACHE.clear(name)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python result_cache.py",
+        description="Muestra o borra la caché en disco de los resultados de data_loader.py.",
+    )
+    parser.add_argument("--limpiar", action="store_true", help="Borrar las entradas (todas o las de --funcion)")
+    parser.add_argument("--funcion", help="Solo las entradas de esta función (p. ej. get_sms_statistics)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de la línea de comandos."""
+    args = _parser().parse_args(argv)
+
+    if args.limpiar:
+        removed = clear_result_cache(args.funcion)
+        print(f"✓ {removed} entrada(s) borrada(s) de {RESULT_CACHE_DIR}")
+        return 0
+
+    info = result_cache_info()
+    functions = {name: entry for name, entry in info["functions"].items()
+                 if not args.funcion or name == args.funcion}
+    if not functions:
+        print(f"⚠️ La caché está vacía ({RESULT_CACHE_DIR})")
+        return 0
+    print(f"📦 {RESULT_CACHE_DIR}: {info['bytes'] / 1024 / 1024:.1f} de {info['max_bytes'] / 1024 / 1024:.0f} MB")
+    for name, entry in sorted(functions.items(), key=lambda item: -item[1]["bytes"]):
+        last_used = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["last_used"]))
+        print(f"  {name}: {entry['entries']} entrada(s), {entry['bytes'] / 1024:.1f} KB, último uso {last_used}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
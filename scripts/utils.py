@@ -3,12 +3,19 @@ Utilidades y funciones auxiliares para la aplicación.
 Incluye funciones de helper, conversiones y funciones de procesamiento.
 """
 
+import os
 import pandas as pd
 from typing import Dict, List, Tuple
 from datetime import datetime, timedelta
 import re
 
 
+def file_fingerprint(path) -> str:
+    """Huella barata de un archivo (tamaño y fecha de modificación) para saber si cambió."""
+    stat = os.stat(path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
 def normalize_phone(phone: str) -> str:
     """Normaliza números telefónicos."""
     if isinstance(phone, str):
@@ -99,20 +106,23 @@ def generate_summary_text(sms_total: int, whatsapp_total: int, sms_states: Dict,
     wpp_read = whatsapp_states.get("Read", 0)
     wpp_failed = whatsapp_states.get("Failed", 0)
     
+    def pct(count: int, total: int) -> float:
+        return count / total * 100 if total > 0 else 0
+    
     summary = f"""
     📊 RESUMEN EJECUTIVO
     
     Total de Mensajes Enviados: {total:,}
     
     📱 SMS ({sms_total:,} mensajes)
-    - Entregados: {sms_delivered:,} ({sms_delivered/sms_total*100:.1f}% if sms_total > 0 else 0)
-    - Fallidos: {sms_failed:,} ({sms_failed/sms_total*100:.1f}% if sms_total > 0 else 0)
-    - Rechazados: {sms_rejected:,} ({sms_rejected/sms_total*100:.1f}% if sms_total > 0 else 0)
+    - Entregados: {sms_delivered:,} ({pct(sms_delivered, sms_total):.1f}%)
+    - Fallidos: {sms_failed:,} ({pct(sms_failed, sms_total):.1f}%)
+    - Rechazados: {sms_rejected:,} ({pct(sms_rejected, sms_total):.1f}%)
     
     💬 WhatsApp ({whatsapp_total:,} mensajes)
-    - Entregados: {wpp_delivered:,} ({wpp_delivered/whatsapp_total*100:.1f}% if whatsapp_total > 0 else 0)
-    - Leídos: {wpp_read:,} ({wpp_read/whatsapp_total*100:.1f}% if whatsapp_total > 0 else 0)
-    - Fallidos: {wpp_failed:,} ({wpp_failed/whatsapp_total*100:.1f}% if whatsapp_total > 0 else 0)
+    - Entregados: {wpp_delivered:,} ({pct(wpp_delivered, whatsapp_total):.1f}%)
+    - Leídos: {wpp_read:,} ({pct(wpp_read, whatsapp_total):.1f}%)
+    - Fallidos: {wpp_failed:,} ({pct(wpp_failed, whatsapp_total):.1f}%)
     """
     
     return summary
@@ -2,14 +2,27 @@
 Aplicación Streamlit para validación de números telefónicos colombianos.
 """
 
+import collections.abc
+import typing
+from functools import partial
+
 import streamlit as st
+import numpy as np
 import pandas as pd
 from phone_validator import (
     validar_numero_colombiano,
-    validar_lista_numeros,
-    analizar_resultados,
+    validar_lista_numeros_compacto,
+    expandir_resultados,
+    ResumenValidacion,
+    CATEGORIAS_VALIDAS,
+    CODIGOS_OPERADOR,
+    info_memo_validacion,
+    detectar_casi_duplicados,
+    cargar_listas_negras,
+    desactivar_listas_negras,
     PREFIJOS_OPERADORES
 )
+from exportacion import ExportacionResultados, descripciones_formatos, nombre_archivo, tipo_mime
 
 # Configuración de página
 st.set_page_config(
@@ -74,13 +87,164 @@ st.markdown("""
 - 🔍 **Detección de patrones sospechosos:** Encuentra números con patrones repetitivos
 - 📊 **Análisis estadístico:** Genera métricas y reportes completos
 - 🔄 **Detección de duplicados:** Identifica números repetidos en la lista
+- 🔤 **Errores de digitación:** Encuentra números que difieren de otro en un dígito
 """)
 
-# Crear tabs principales
-tab1, tab2, tab3 = st.tabs(["🔍 Validar Número", "📋 Validar Lista", "📘 Documentación"])
+# Filas por bloque al validar listas y archivos cargados
+TAMANO_BLOQUE = 100_000
 
-# ==================== TAB 1: VALIDAR NÚMERO INDIVIDUAL ====================
-with tab1:
+# Máximo de filas que se muestran en la tabla de resultados
+MAX_FILAS_TABLA = 5_000
+
+
+def detectar_separador(archivo) -> str:
+    """Detecta "," o ";" en la primera línea de un archivo cargado."""
+    archivo.seek(0)
+    primera = archivo.readline().decode('utf-8', errors='replace')
+    archivo.seek(0)
+    return ';' if primera.count(';') > primera.count(',') else ','
+
+
+def leer_columna_por_bloques(archivo, columna: str, separador: str):
+    """
+    Lee por bloques solo la columna elegida de un archivo cargado. Las celdas
+    vacías se conservan para que se cuenten como "Vacío" y las filas del
+    resultado coincidan con las del archivo.
+    """
+    archivo.seek(0)
+    with pd.read_csv(archivo, sep=separador, usecols=[columna], dtype=str, chunksize=TAMANO_BLOQUE) as lector:
+        for bloque in lector:
+            yield bloque[columna]
+
+
+def bloques_de_lista(numeros: list):
+    """Parte una lista de números ingresados en Series de TAMANO_BLOQUE."""
+    for inicio in range(0, len(numeros), TAMANO_BLOQUE):
+        yield pd.Series(numeros[inicio:inicio + TAMANO_BLOQUE], dtype=object)
+
+
+def originales_de_filas(leer_bloques, filas: np.ndarray) -> np.ndarray:
+    """
+    Números de entrada de las filas pedidas (en orden ascendente), releyendo
+    la entrada por bloques hasta encontrar la última.
+    """
+    resultado = np.empty(len(filas), dtype=object)
+    inicio = 0
+    for bloque in leer_bloques():
+        fin = inicio + len(bloque)
+        desde, hasta = np.searchsorted(filas, [inicio, fin])
+        if desde < hasta:
+            resultado[desde:hasta] = bloque.to_numpy(dtype=object)[filas[desde:hasta] - inicio]
+        if hasta == len(filas):
+            break
+        inicio = fin
+    return resultado
+
+
+def validar_en_bloques(leer_bloques, avance) -> dict:
+    """
+    Valida bloque a bloque mostrando progreso y métricas parciales.
+    
+    Guarda solo el resultado compacto: los números originales se vuelven a
+    leer de la entrada (leer_bloques) cuando hacen falta, para los formatos
+    de los repetidos, la tabla y las descargas. Si un rerun de Streamlit
+    interrumpe el ciclo, los archivos temporales del resumen se eliminan.
+    
+    Args:
+        leer_bloques: Función sin argumentos que retorna, cada vez que se
+            llama, los números de entrada como Series por bloques
+        avance: Función (números procesados) → fracción completada
+    """
+    barra = st.progress(0.0, text="Validando...")
+    metricas = st.empty()
+    partes = []
+    
+    with ResumenValidacion() as resumen:
+        for bloque in leer_bloques():
+            valores = bloque.to_numpy(dtype=object)
+            compacto = validar_lista_numeros_compacto(valores)
+            resumen.agregar(compacto, valores)
+            partes.append(compacto)
+            
+            barra.progress(min(avance(resumen.total), 1.0), text=f"Validando... {resumen.total:,} números")
+            with metricas.container():
+                col1, col2, col3 = st.columns(3)
+                col1.metric("📱 Procesados", f"{resumen.total:,}")
+                col2.metric("✅ Válidos", f"{resumen.validos:,}")
+                col3.metric("⚠️ Sospechosos", f"{resumen.sospechosos:,}")
+        
+        # Los formatos de los repetidos se cuentan releyendo la entrada
+        stats = resumen.resultado(leer_bloques())
+    
+    barra.empty()
+    metricas.empty()
+    
+    return {
+        'compacto': pd.concat(partes, ignore_index=True) if partes else validar_lista_numeros_compacto([]),
+        'leer_originales': leer_bloques,
+        'stats': stats,
+    }
+
+
+
+def acepta_funcion_en_descarga() -> bool:
+    """
+    Si st.download_button acepta una función en data (un Callable en el tipo
+    de ese parámetro) y solo la llama al hacer clic.
+    """
+    try:
+        tipo = typing.get_type_hints(st.download_button)['data']
+    except (NameError, TypeError, KeyError):
+        return False
+    return any(typing.get_origin(opcion) is collections.abc.Callable for opcion in typing.get_args(tipo))
+
+
+# Las versiones recientes de Streamlit aceptan una función en download_button;
+# en las anteriores se prepara con un botón aparte
+DESCARGA_DIFERIDA = acepta_funcion_en_descarga()
+
+
+def boton_descarga(etiqueta: str, generar, nombre: str, formato: str, clave: str):
+    """
+    Botón de descarga que genera el archivo solo cuando se pide.
+    
+    Args:
+        etiqueta: Texto del botón
+        generar: Función sin argumentos que retorna los bytes del archivo
+        nombre: Nombre del archivo descargado
+        formato: Formato de exportación (para el tipo MIME)
+        clave: Clave única del botón en la sesión
+    """
+    if DESCARGA_DIFERIDA:
+        st.download_button(etiqueta, generar, nombre, tipo_mime(formato),
+                           key=clave, use_container_width=True)
+        return
+    
+    # Lo preparado se guarda por nombre: al cambiar el formato se vuelve a preparar
+    preparado = st.session_state.get(clave)
+    if preparado is None or preparado[0] != nombre:
+        if st.button(f"⚙️ Preparar: {etiqueta}", key=f"{clave}_preparar", use_container_width=True):
+            with st.spinner("Generando archivo..."):
+                preparado = (nombre, generar())
+            st.session_state[clave] = preparado
+        else:
+            return
+    if st.download_button(etiqueta, preparado[1], nombre, tipo_mime(formato),
+                          key=clave + "_boton", use_container_width=True):
+        # Ya se descargó: el botón se muestra en esta ejecución (el navegador
+        # puede estar leyendo el archivo) y en la siguiente se libera
+        st.session_state.pop(clave, None)
+
+
+# Fragmentos de Streamlit (st.fragment desde 1.37, experimental desde 1.33): al
+# usar un widget de adentro se vuelve a ejecutar solo esa función y no toda la
+# página. En versiones anteriores se ejecuta la página completa, como antes.
+fragmento = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda funcion: funcion)
+
+
+@fragmento
+def validar_numero_individual():
+    """Pestaña de número individual: al escribir el número se ejecuta solo esta función."""
     st.subheader("Validar Número Individual")
     
     col1, col2 = st.columns([2, 1])
@@ -143,10 +307,14 @@ with tab1:
             if resultado['sospechoso']:
                 st.warning(f"**Sospechoso:** {resultado['razon_sospecha']}")
 
-# ==================== TAB 2: VALIDAR LISTA ====================
-with tab2:
-    st.subheader("Validar Lista de Números")
-    
+
+@fragmento
+def entrada_lista():
+    """
+    Entrada de la lista (método, texto o archivo y listas negras) y botón de
+    validación. Al terminar se ejecuta la página completa para mostrar el
+    resultado guardado en st.session_state['resultado_lista'].
+    """
     # Opción de entrada
     input_method = st.radio(
         "Método de entrada:",
@@ -155,6 +323,7 @@ with tab2:
     )
     
     numeros_lista = []
+    archivo_csv = None
     
     if input_method == "📝 Pegar lista":
         texto_numeros = st.text_area(
@@ -169,11 +338,14 @@ with tab2:
         uploaded_file = st.file_uploader("Sube un archivo CSV", type=['csv'])
         if uploaded_file:
             try:
-                df_upload = pd.read_csv(uploaded_file)
-                columna = st.selectbox("Selecciona la columna con los números:", df_upload.columns)
+                # Solo el encabezado: el archivo se lee por bloques al validar
+                separador = detectar_separador(uploaded_file)
+                columnas = pd.read_csv(uploaded_file, sep=separador, nrows=0).columns
+                uploaded_file.seek(0)
+                columna = st.selectbox("Selecciona la columna con los números:", columnas)
                 if columna:
-                    numeros_lista = df_upload[columna].dropna().astype(str).tolist()
-                    st.success(f"✅ {len(numeros_lista)} números cargados")
+                    archivo_csv = (uploaded_file, columna, separador)
+                    st.success(f"✅ Archivo listo: {uploaded_file.name} ({uploaded_file.size / 1024 ** 2:.1f} MB)")
             except Exception as e:
                 st.error(f"Error al leer archivo: {e}")
     
@@ -199,142 +371,276 @@ with tab2:
         ]
         st.code('\n'.join(numeros_lista[:5]) + '\n...', language='text')
     
+    with st.expander("🚫 Listas negras (opcional)"):
+        rutas_listas = st.text_area(
+            "Rutas locales de listas negras / exclusión (una por línea):",
+            placeholder="/datos/lista_negra.csv\n/datos/opt_out.txt",
+            help="Se compilan la primera vez y se reutilizan mientras el archivo no cambie",
+        )
+    rutas_listas = [ruta.strip() for ruta in rutas_listas.split('\n') if ruta.strip()]
+    
     # Botón de validación
-    if st.button("🚀 Validar Lista", type="primary", disabled=len(numeros_lista) == 0):
-        with st.spinner('Validando números...'):
-            # Validar
-            df_resultados = validar_lista_numeros(numeros_lista)
-            
-            # Analizar
-            stats = analizar_resultados(df_resultados)
-            
-            st.success(f"✅ Validación completada: {stats['total']} números procesados")
-            
-            st.markdown("---")
-            
-            # ========== ESTADÍSTICAS GENERALES ==========
-            st.subheader("📊 Resumen Estadístico")
-            
-            col1, col2, col3, col4, col5 = st.columns(5)
-            
-            with col1:
-                st.metric("📱 Total", stats['total'])
-            with col2:
-                st.metric("✅ Válidos", stats['validos'], f"{stats['porcentaje_validos']}%")
-            with col3:
-                st.metric("❌ Inválidos", stats['invalidos'], f"{stats['porcentaje_invalidos']}%")
-            with col4:
-                st.metric("⚠️ Sospechosos", stats['sospechosos'])
-            with col5:
-                st.metric("🔄 Repetidos", stats['numeros_repetidos'])
-            
-            st.markdown("---")
-            
-            # ========== GRÁFICOS ==========
-            col_graf1, col_graf2 = st.columns(2)
-            
-            with col_graf1:
-                st.subheader("📡 Distribución por Operador")
-                if stats['operadores']:
-                    df_operadores = pd.DataFrame(
-                        list(stats['operadores'].items()),
-                        columns=['Operador', 'Cantidad']
-                    ).sort_values('Cantidad', ascending=False)
-                    st.bar_chart(df_operadores.set_index('Operador'), use_container_width=True)
-                else:
-                    st.info("No hay números válidos para mostrar operadores")
-            
-            with col_graf2:
-                st.subheader("🏷️ Distribución por Categoría")
-                if stats['categorias']:
-                    df_categorias = pd.DataFrame(
-                        list(stats['categorias'].items()),
-                        columns=['Categoría', 'Cantidad']
-                    ).sort_values('Cantidad', ascending=False)
-                    st.bar_chart(df_categorias.set_index('Categoría'), use_container_width=True)
-            
-            # ========== REPETIDOS ==========
-            if stats['numeros_repetidos'] > 0:
-                st.subheader("🔄 Números Repetidos (Top 10)")
-                df_repetidos = pd.DataFrame(
-                    list(stats['top_repetidos'].items()),
-                    columns=['Número', 'Repeticiones']
-                ).sort_values('Repeticiones', ascending=False)
-                st.dataframe(df_repetidos, use_container_width=True, hide_index=True)
-            
-            st.markdown("---")
-            
-            # ========== RESULTADOS DETALLADOS ==========
-            st.subheader("📋 Resultados Detallados")
-            
-            # Filtros
-            col_filtro1, col_filtro2 = st.columns([1, 3])
-            
-            with col_filtro1:
-                filtro = st.selectbox(
-                    "Filtrar por:",
-                    ["Todos", "Válidos", "Inválidos", "Sospechosos", "Por Operador"]
-                )
-            
-            # Aplicar filtros
-            if filtro == "Válidos":
-                df_mostrar = df_resultados[df_resultados['valido']].copy()
-            elif filtro == "Inválidos":
-                df_mostrar = df_resultados[~df_resultados['valido']].copy()
-            elif filtro == "Sospechosos":
-                df_mostrar = df_resultados[df_resultados['sospechoso']].copy()
-            elif filtro == "Por Operador":
-                with col_filtro2:
-                    operadores_unicos = df_resultados[df_resultados['valido']]['operador'].unique()
-                    operador_seleccionado = st.selectbox("Selecciona operador:", operadores_unicos)
-                    df_mostrar = df_resultados[df_resultados['operador'] == operador_seleccionado].copy()
+    hay_entrada = len(numeros_lista) > 0 or archivo_csv is not None
+    if st.button("🚀 Validar Lista", type="primary", disabled=not hay_entrada):
+        try:
+            if rutas_listas:
+                cargar_listas_negras(*rutas_listas)
             else:
-                df_mostrar = df_resultados.copy()
-            
-            # Mostrar tabla
-            st.dataframe(
-                df_mostrar[[
-                    'numero_original', 'numero_completo', 'valido', 'categoria',
-                    'operador', 'sospechoso', 'mensaje_error', 'razon_sospecha'
-                ]],
-                use_container_width=True,
-                hide_index=True,
-                column_config={
-                    "valido": st.column_config.CheckboxColumn("Válido"),
-                    "sospechoso": st.column_config.CheckboxColumn("Sospechoso"),
-                }
-            )
-            
-            st.caption(f"Mostrando {len(df_mostrar)} de {len(df_resultados)} números")
-            
-            # ========== DESCARGAS ==========
-            st.markdown("---")
-            st.subheader("📥 Descargar Resultados")
-            
-            col_desc1, col_desc2 = st.columns(2)
-            
-            with col_desc1:
-                # CSV completo
-                csv_completo = df_resultados.to_csv(index=False)
-                st.download_button(
-                    "📄 Descargar Resultados Completos (CSV)",
-                    csv_completo,
-                    "validacion_completa.csv",
-                    "text/csv",
-                    use_container_width=True
-                )
-            
-            with col_desc2:
-                # CSV solo válidos
-                csv_validos = df_resultados[df_resultados['valido']].to_csv(index=False)
-                st.download_button(
-                    "✅ Descargar Solo Números Válidos (CSV)",
-                    csv_validos,
-                    "numeros_validos.csv",
-                    "text/csv",
-                    use_container_width=True
+                desactivar_listas_negras()
+            listas_ok = True
+        except (OSError, ValueError) as e:
+            st.error(f"Error al cargar listas negras: {e}")
+            listas_ok = False
+        
+        if archivo_csv is not None:
+            archivo, columna, separador = archivo_csv
+            leer_bloques = partial(leer_columna_por_bloques, archivo, columna, separador)
+            avance = lambda procesados: archivo.tell() / max(archivo.size, 1)
+            origen = f"{archivo.name} · columna {columna}"
+        else:
+            leer_bloques = partial(bloques_de_lista, numeros_lista)
+            avance = lambda procesados: procesados / len(numeros_lista)
+            origen = f"{len(numeros_lista):,} números ingresados"
+        
+        if listas_ok:
+            try:
+                # Si un rerun interrumpe la validación, no queda ningún resultado a medias
+                st.session_state['resultado_lista'] = dict(validar_en_bloques(leer_bloques, avance), origen=origen)
+                # Las descargas preparadas eran del resultado anterior
+                for clave in ("descarga_completa", "descarga_validos"):
+                    st.session_state.pop(clave, None)
+                # Se vuelve a ejecutar la página para mostrar el resultado fuera del fragmento
+                st.rerun()
+            except Exception as e:
+                st.error(f"Error al validar: {e}")
+
+
+@fragmento
+def buscar_casi_duplicados(resultado_lista: dict):
+    """Búsqueda de casi duplicados del resultado; se guarda en el mismo resultado."""
+    compacto = resultado_lista['compacto']
+    
+    # ========== CASI DUPLICADOS ==========
+    with st.expander("🔤 Posibles errores de digitación"):
+        st.caption("Números que difieren de otro de la lista en un dígito "
+                   "o en dos dígitos vecinos invertidos")
+        incluir_inversiones = st.checkbox("Incluir dígitos vecinos invertidos", value=True)
+        if st.button("Buscar casi duplicados"):
+            with st.spinner("Buscando..."):
+                resultado_lista['casi_duplicados'] = detectar_casi_duplicados(compacto, incluir_inversiones)
+        
+        if 'casi_duplicados' in resultado_lista:
+            casi_duplicados = resultado_lista['casi_duplicados']
+            if len(casi_duplicados) == 0:
+                st.success("✅ No se encontraron casi duplicados")
+            else:
+                st.warning(f"⚠️ {len(casi_duplicados):,} pares de números casi iguales")
+                st.dataframe(
+                    casi_duplicados.head(MAX_FILAS_TABLA).rename(columns={
+                        'numero': 'Número', 'similar': 'Probable error', 'tipo': 'Tipo',
+                        'posicion': 'Posición', 'veces_numero': 'Veces número',
+                        'veces_similar': 'Veces probable error',
+                    }),
+                    use_container_width=True,
+                    hide_index=True
                 )
 
+
+@fragmento
+def resultados_detallados(resultado_lista: dict):
+    """Tabla de resultados con su filtro: al filtrar se ejecuta solo esta función."""
+    compacto = resultado_lista['compacto']
+    stats = resultado_lista['stats']
+    
+    # ========== RESULTADOS DETALLADOS ==========
+    st.subheader("📋 Resultados Detallados")
+    
+    # Filtros (sobre los códigos del resultado compacto)
+    col_filtro1, col_filtro2 = st.columns([1, 3])
+    
+    with col_filtro1:
+        filtro = st.selectbox(
+            "Filtrar por:",
+            ["Todos", "Válidos", "Inválidos", "Sospechosos", "Por Operador"]
+        )
+    
+    validos_mask = np.isin(compacto['categoria'].to_numpy(), CATEGORIAS_VALIDAS)
+    
+    # Aplicar filtros
+    if filtro == "Válidos":
+        mascara = validos_mask
+    elif filtro == "Inválidos":
+        mascara = ~validos_mask
+    elif filtro == "Sospechosos":
+        mascara = compacto['sospecha'].to_numpy() > 0
+    elif filtro == "Por Operador":
+        with col_filtro2:
+            operadores_unicos = list(stats['operadores'])
+            operador_seleccionado = st.selectbox("Selecciona operador:", operadores_unicos)
+            mascara = compacto['operador'].to_numpy() == CODIGOS_OPERADOR.get(operador_seleccionado, -1)
+    else:
+        mascara = np.ones(len(compacto), dtype=bool)
+    
+    # Solo se genera el texto de las filas que se muestran
+    filas = np.flatnonzero(mascara)
+    filas_tabla = filas[:MAX_FILAS_TABLA]
+    df_mostrar = expandir_resultados(
+        compacto.iloc[filas_tabla], originales_de_filas(resultado_lista['leer_originales'], filas_tabla)
+    )
+    
+    # Mostrar tabla
+    st.dataframe(
+        df_mostrar[[
+            'numero_original', 'numero_completo', 'valido', 'categoria',
+            'operador', 'sospechoso', 'en_lista_negra', 'mensaje_error', 'razon_sospecha'
+        ]],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "valido": st.column_config.CheckboxColumn("Válido"),
+            "sospechoso": st.column_config.CheckboxColumn("Sospechoso"),
+            "en_lista_negra": st.column_config.CheckboxColumn("Lista negra"),
+        }
+    )
+    
+    if len(filas) > len(filas_tabla):
+        st.caption(f"Mostrando los primeros {len(filas_tabla):,} de {len(filas):,} números filtrados "
+                   f"({len(compacto):,} en total); descarga los resultados para verlos todos")
+    else:
+        st.caption(f"Mostrando {len(filas):,} de {len(compacto):,} números")
+
+
+@fragmento
+def descargas(resultado_lista: dict):
+    """Formato y botones de descarga del resultado."""
+    compacto = resultado_lista['compacto']
+    
+    # ========== DESCARGAS ==========
+    st.markdown("---")
+    st.subheader("📥 Descargar Resultados")
+    
+    # El archivo se genera al pedir la descarga; no se guarda en la sesión
+    exportacion = ExportacionResultados(compacto, resultado_lista['leer_originales'])
+    
+    formatos = descripciones_formatos()
+    formato = st.selectbox(
+        "Formato de descarga:",
+        list(formatos),
+        format_func=formatos.get,
+        key="formato_descarga"
+    )
+    
+    col_desc1, col_desc2 = st.columns(2)
+    
+    with col_desc1:
+        boton_descarga(
+            "📄 Descargar Resultados Completos",
+            lambda: exportacion.exportar(formato, nombre="validacion_completa"),
+            nombre_archivo("validacion_completa", formato),
+            formato,
+            "descarga_completa"
+        )
+    
+    with col_desc2:
+        boton_descarga(
+            "✅ Descargar Solo Números Válidos",
+            lambda: exportacion.exportar(formato, np.isin(compacto['categoria'].to_numpy(), CATEGORIAS_VALIDAS),
+                                         nombre="numeros_validos"),
+            nombre_archivo("numeros_validos", formato),
+            formato,
+            "descarga_validos"
+        )
+
+# Crear tabs principales
+tab1, tab2, tab3 = st.tabs(["🔍 Validar Número", "📋 Validar Lista", "📘 Documentación"])
+
+# ==================== TAB 1: VALIDAR NÚMERO INDIVIDUAL ====================
+with tab1:
+    validar_numero_individual()
+
+# ==================== TAB 2: VALIDAR LISTA ====================
+with tab2:
+    st.subheader("Validar Lista de Números")
+    
+    entrada_lista()
+    
+    resultado_lista = st.session_state.get('resultado_lista')
+    
+    if resultado_lista is not None and resultado_lista['stats']['total'] == 0:
+        st.info(f"No se encontraron números en la entrada ({resultado_lista['origen']})")
+    
+    elif resultado_lista is not None:
+        stats = resultado_lista['stats']
+        
+        st.success(f"✅ Validación completada: {stats['total']:,} números procesados ({resultado_lista['origen']})")
+        memo = info_memo_validacion()
+        st.caption(f"🧠 Números en memoria de validación: {memo['entradas']:,} (se reutilizan entre validaciones)")
+        
+        st.markdown("---")
+        
+        # ========== ESTADÍSTICAS GENERALES ==========
+        st.subheader("📊 Resumen Estadístico")
+        
+        col1, col2, col3, col4, col5 = st.columns(5)
+        
+        with col1:
+            st.metric("📱 Total", stats['total'])
+        with col2:
+            st.metric("✅ Válidos", stats['validos'], f"{stats['porcentaje_validos']}%")
+        with col3:
+            st.metric("❌ Inválidos", stats['invalidos'], f"{stats['porcentaje_invalidos']}%")
+        with col4:
+            st.metric("⚠️ Sospechosos", stats['sospechosos'])
+        with col5:
+            st.metric("🔄 Repetidos", stats['numeros_repetidos'])
+        
+        if stats.get('en_lista_negra'):
+            st.warning(f"🚫 {stats['en_lista_negra']:,} números están en lista negra (columna `en_lista_negra`)")
+        
+        st.markdown("---")
+        
+        # ========== GRÁFICOS ==========
+        col_graf1, col_graf2 = st.columns(2)
+        
+        with col_graf1:
+            st.subheader("📡 Distribución por Operador")
+            if stats['operadores']:
+                df_operadores = pd.DataFrame(
+                    list(stats['operadores'].items()),
+                    columns=['Operador', 'Cantidad']
+                ).sort_values('Cantidad', ascending=False)
+                st.bar_chart(df_operadores.set_index('Operador'), use_container_width=True)
+            else:
+                st.info("No hay números válidos para mostrar operadores")
+        
+        with col_graf2:
+            st.subheader("🏷️ Distribución por Categoría")
+            if stats['categorias']:
+                df_categorias = pd.DataFrame(
+                    list(stats['categorias'].items()),
+                    columns=['Categoría', 'Cantidad']
+                ).sort_values('Cantidad', ascending=False)
+                st.bar_chart(df_categorias.set_index('Categoría'), use_container_width=True)
+        
+        # ========== REPETIDOS ==========
+        if stats['numeros_repetidos'] > 0:
+            st.subheader("🔄 Números Repetidos (Top 10)")
+            df_repetidos = pd.DataFrame(
+                [
+                    (numero, grupo['repeticiones'], ', '.join(f'"{f}" ×{n}' for f, n in grupo['formatos'].items()))
+                    for numero, grupo in stats['grupos_repetidos'].items()
+                ],
+                columns=['Número', 'Repeticiones', 'Formatos originales']
+            ).sort_values('Repeticiones', ascending=False)
+            st.dataframe(df_repetidos, use_container_width=True, hide_index=True)
+        
+        buscar_casi_duplicados(resultado_lista)
+        
+        st.markdown("---")
+        
+        resultados_detallados(resultado_lista)
+        descargas(resultado_lista)
+
 # ==================== TAB 3: DOCUMENTACIÓN ====================
 with tab3:
     st.subheader("📘 Documentación del Validador")
@@ -0,0 +1,258 @@
+"""
+Validador de números telefónicos por línea de comandos.
+Procesa archivos más grandes que la memoria leyendo y escribiendo por bloques.
+
+Uso (desde la carpeta scripts/):
+    python -m phone_validator contactos.csv --columna "Telefono celular" -o resultados.csv
+    python -m phone_validator contactos.csv -o resultados.parquet --resumen resumen.json --procesos 4
+    cat numeros.txt | python -m phone_validator - --sin-encabezado -o resultados.csv.gz
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from phone_validator import (
+    COLUMNAS_RESULTADO,
+    ResumenValidacion,
+    cargar_listas_negras,
+    cargar_portabilidad,
+    demo_consola,
+    expandir_resultados,
+    leer_columnas,
+    validar_lista_numeros_compacto,
+)
+
+
+TAMANO_BLOQUE = 200_000
+
+
+def _validar_bloque(numeros: np.ndarray) -> pd.DataFrame:
+    """
+    Valida un bloque de números (se ejecuta en el proceso principal o en un worker).
+
+    Retorna el resultado compacto: entre procesos viajan ~14 bytes por fila
+    y el texto se genera solo al escribir.
+    """
+    return validar_lista_numeros_compacto(numeros)
+
+
+def leer_bloques(entrada: str, columna: Optional[str], sin_encabezado: bool,
+                 separador: str, encoding: str, tamano_bloque: int) -> Iterator[np.ndarray]:
+    """
+    Lee la columna de números de un CSV (o stdin con "-") por bloques.
+
+    Solo se carga la columna seleccionada y cada valor se lee como texto,
+    para conservar el formato original (+57, espacios, ceros iniciales).
+    """
+    origen = sys.stdin.buffer if entrada == '-' else entrada
+    if not columna:
+        columna = 0
+    elif sin_encabezado or columna.isdigit():
+        columna = int(columna)
+
+    for numeros, in leer_columnas(origen, [columna], separador, encoding, tamano_bloque, sin_encabezado):
+        yield numeros
+
+
+class EscritorResultados:
+    """Escribe los resultados de forma incremental en CSV (opcionalmente .gz) o Parquet."""
+
+    def __init__(self, salida: str, formato: Optional[str] = None):
+        self.salida = salida
+        self.formato = formato or self._inferir_formato(salida)
+        self._archivo = None
+        self._parquet = None
+        self._escribio_encabezado = False
+
+    @staticmethod
+    def _inferir_formato(salida: str) -> str:
+        if salida.endswith('.parquet'):
+            return 'parquet'
+        if salida.endswith('.gz'):
+            return 'csv.gz'
+        return 'csv'
+
+    def escribir(self, df: pd.DataFrame) -> None:
+        if self.formato == 'parquet':
+            self._escribir_parquet(df)
+            return
+
+        if self._archivo is None:
+            if self.salida == '-':
+                self._archivo = sys.stdout
+            elif self.formato == 'csv.gz':
+                self._archivo = gzip.open(self.salida, 'wt', encoding='utf-8', newline='')
+            else:
+                self._archivo = open(self.salida, 'w', encoding='utf-8', newline='')
+
+        df.to_csv(self._archivo, index=False, header=not self._escribio_encabezado)
+        self._escribio_encabezado = True
+
+    def _escribir_parquet(self, df: pd.DataFrame) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("❌ Para escribir Parquet instala pyarrow (pip install pyarrow)")
+
+        esquema = pa.schema([
+            (columna, pa.bool_() if columna in ('valido', 'sospechoso', 'en_lista_negra') else pa.string())
+            for columna in COLUMNAS_RESULTADO
+        ])
+        originales = df['numero_original'].astype(object)
+        df = df.assign(numero_original=originales.where(originales.notna(), None))
+        tabla = pa.Table.from_pandas(df, schema=esquema, preserve_index=False)
+
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(self.salida, esquema)
+        self._parquet.write_table(tabla)
+
+    def cerrar(self) -> None:
+        if self._parquet is None and not self._escribio_encabezado:
+            # Entrada vacía: dejar al menos el encabezado / esquema
+            self.escribir(pd.DataFrame({columna: pd.Series(dtype=object) for columna in COLUMNAS_RESULTADO}))
+        if self._parquet is not None:
+            self._parquet.close()
+        if self._archivo is not None and self._archivo is not sys.stdout:
+            self._archivo.close()
+        elif self._archivo is sys.stdout:
+            sys.stdout.flush()
+
+
+def _preparar_worker(portabilidad: Optional[str], listas_negras: List[str]) -> None:
+    """Carga en cada worker las mismas tablas locales del proceso principal (mmap compartido)."""
+    if portabilidad:
+        cargar_portabilidad(portabilidad)
+    if listas_negras:
+        cargar_listas_negras(*listas_negras)
+
+
+def _resultados_en_orden(bloques: Iterator[np.ndarray], procesos: int,
+                         portabilidad: Optional[str] = None,
+                         listas_negras: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Valida los bloques en orden y los expande a texto para escribirlos.
+    Con varios procesos mantiene como máximo 2 bloques pendientes por
+    worker, así la memoria se mantiene acotada.
+    """
+    if procesos <= 1:
+        for bloque in bloques:
+            yield expandir_resultados(_validar_bloque(bloque), bloque)
+        return
+
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_preparar_worker,
+                             initargs=(portabilidad, listas_negras or [])) as pool:
+        pendientes = deque()
+        for bloque in bloques:
+            pendientes.append((bloque, pool.submit(_validar_bloque, bloque)))
+            if len(pendientes) >= 2 * procesos:
+                original, futuro = pendientes.popleft()
+                yield expandir_resultados(futuro.result(), original)
+        while pendientes:
+            original, futuro = pendientes.popleft()
+            yield expandir_resultados(futuro.result(), original)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m phone_validator',
+        description='Valida números celulares colombianos de un CSV (o stdin) por bloques.',
+    )
+    parser.add_argument('entrada', nargs='?', default='-',
+                        help='Archivo CSV de entrada, o "-" para leer de stdin (por defecto)')
+    parser.add_argument('-c', '--columna',
+                        help='Columna con los números (nombre o posición). Por defecto la primera')
+    parser.add_argument('--sin-encabezado', action='store_true',
+                        help='La entrada no tiene fila de encabezado (p. ej. un número por línea)')
+    parser.add_argument('--separador', default=',', help='Separador del CSV de entrada (por defecto ",")')
+    parser.add_argument('--encoding', default='utf-8', help='Codificación de la entrada (por defecto utf-8)')
+    parser.add_argument('-o', '--salida', default='-',
+                        help='Archivo de resultados (.csv, .csv.gz o .parquet), o "-" para stdout')
+    parser.add_argument('--formato', choices=['csv', 'csv.gz', 'parquet'],
+                        help='Formato de salida (por defecto según la extensión)')
+    parser.add_argument('--resumen',
+                        help='Archivo JSON para el resumen estadístico (por defecto se imprime en stderr)')
+    parser.add_argument('--portabilidad',
+                        help='CSV de portabilidad (número;operador actual) o su versión compilada; '
+                             'se compila junto al CSV la primera vez')
+    parser.add_argument('--lista-negra', action='append', default=[], metavar='ARCHIVO',
+                        help='Lista negra / de exclusión (CSV o un número por línea); se puede repetir')
+    parser.add_argument('--tamano-bloque', type=int, default=TAMANO_BLOQUE,
+                        help=f'Filas por bloque (por defecto {TAMANO_BLOQUE:,})')
+    parser.add_argument('-p', '--procesos', type=int, default=1,
+                        help='Procesos de validación en paralelo (por defecto 1)')
+    parser.add_argument('-q', '--silencioso', action='store_true', help='No mostrar el progreso')
+    parser.add_argument('--demo', action='store_true', help='Mostrar la prueba rápida de consola y salir')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de la línea de comandos."""
+    args = _parser().parse_args(argv)
+
+    if args.demo:
+        demo_consola()
+        return 0
+
+    def progreso(mensaje: str) -> None:
+        if not args.silencioso:
+            print(mensaje, file=sys.stderr, flush=True)
+
+    inicio = time.time()
+
+    if args.portabilidad:
+        tabla = cargar_portabilidad(args.portabilidad)
+        progreso(f"  ✓ Portabilidad: {len(tabla):,} números portados")
+    if args.lista_negra:
+        lista = cargar_listas_negras(*args.lista_negra)
+        progreso(f"  ✓ Listas negras: {len(lista):,} números")
+
+    escritor = EscritorResultados(args.salida, args.formato)
+
+    try:
+        with ResumenValidacion() as resumen:
+            bloques = leer_bloques(
+                args.entrada, args.columna, args.sin_encabezado,
+                args.separador, args.encoding, args.tamano_bloque,
+            )
+
+            for i, df in enumerate(_resultados_en_orden(bloques, args.procesos, args.portabilidad, args.lista_negra), 1):
+                escritor.escribir(df)
+                resumen.agregar(df)
+                progreso(f"  ✓ Bloque {i}: {resumen.total:,} registros procesados")
+
+            # Segunda lectura (solo la columna) para los formatos originales de los
+            # más repetidos; stdin no se puede releer
+            releer = None if args.entrada == '-' else leer_bloques(
+                args.entrada, args.columna, args.sin_encabezado,
+                args.separador, args.encoding, args.tamano_bloque,
+            )
+            estadisticas = resumen.resultado(releer)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"❌ Error al leer la entrada: {e}", file=sys.stderr)
+        return 1
+    finally:
+        escritor.cerrar()
+
+    texto_resumen = json.dumps(estadisticas, ensure_ascii=False, indent=2)
+    if args.resumen:
+        with open(args.resumen, 'w', encoding='utf-8') as archivo:
+            archivo.write(texto_resumen)
+    else:
+        print(texto_resumen, file=sys.stderr)
+
+    progreso(f"✓ Tiempo total: {time.time() - inicio:.2f} segundos")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
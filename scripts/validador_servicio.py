@@ -0,0 +1,578 @@
+"""
+Servicio HTTP local de validación de números telefónicos.
+Expone phone_validator a otros procesos sin Streamlit ni servicios externos
+(solo la biblioteca estándar: asyncio).
+
+Uso (desde la carpeta scripts/):
+    python validador_servicio.py --puerto 8765 --procesos 4
+    curl "http://127.0.0.1:8765/validar?numero=3001234567"
+    curl --data-binary @numeros.txt "http://127.0.0.1:8765/lote?formato=csv"
+    curl --data-binary @contactos.csv -H "Content-Type: text/csv" \\
+         "http://127.0.0.1:8765/lote?columna=Telefono%20celular"
+
+Endpoints:
+    GET  /validar?numero=...   Resultado de validar_numero_colombiano en JSON
+    POST /validar              Igual, con cuerpo JSON {"numero": "..."}
+    POST /lote                 Cuerpo NDJSON, CSV o un número por línea; responde
+                               NDJSON (o CSV con ?formato=csv) por partes, en orden
+    GET  /salud                Estado del servicio (memo, solicitudes, lotes)
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from exportacion import serializar_filas
+from phone_validator import (
+    COLUMNAS_RESULTADO,
+    cargar_listas_negras,
+    cargar_portabilidad,
+    expandir_resultados,
+    info_memo_validacion,
+    validar_lista_numeros_compacto,
+    validar_numero_colombiano,
+)
+
+
+PUERTO = 8765
+
+# Números por bloque de un lote (cada bloque es una llamada al pool)
+TAMANO_BLOQUE = 50_000
+
+# Espera para juntar lotes pequeños de solicitudes concurrentes
+ESPERA_AGRUPACION = 0.002
+
+# Bytes leídos del cuerpo por vez
+TAMANO_LECTURA = 1024 ** 2
+
+TIPOS_RESPUESTA = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+ESTADOS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    431: 'Request Header Fields Too Large',
+    500: 'Internal Server Error',
+}
+
+
+class ErrorSolicitud(Exception):
+    """Solicitud inválida: se responde con el estado indicado y se cierra la conexión."""
+
+    def __init__(self, estado: int, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def _validar_serializado(numeros: np.ndarray, formato: str) -> Tuple[bytes, np.ndarray]:
+    """
+    Valida un bloque y lo deja serializado (se ejecuta en un worker).
+
+    Entre procesos viajan los bytes ya listos para enviar y el final de cada
+    fila, así el proceso principal solo reparte y escribe.
+    """
+    return serializar_filas(expandir_resultados(validar_lista_numeros_compacto(numeros), numeros), formato)
+
+
+def _preparar_worker(portabilidad: Optional[str], listas_negras: List[str]) -> None:
+    """Carga en cada worker las mismas tablas locales del proceso principal (mmap compartido)."""
+    if portabilidad:
+        cargar_portabilidad(portabilidad)
+    if listas_negras:
+        cargar_listas_negras(*listas_negras)
+
+
+class AgrupadorLotes:
+    """
+    Junta los bloques pequeños de solicitudes concurrentes en una sola
+    llamada al ejecutor y reparte el resultado a cada una.
+
+    Los bloques de tamano_bloque filas o más van directo al ejecutor.
+    """
+
+    def __init__(self, ejecutor: Executor, tamano_bloque: int = TAMANO_BLOQUE,
+                 espera: float = ESPERA_AGRUPACION):
+        self.ejecutor = ejecutor
+        self.tamano_bloque = tamano_bloque
+        self.espera = espera
+        self.llamadas = 0
+        self.bloques = 0
+        self._cola: Optional[asyncio.Queue] = None
+        self._despachador: Optional[asyncio.Task] = None
+        # El bucle solo guarda una referencia débil a las tareas: sin este
+        # conjunto, un grupo en proceso podría recolectarse sin responder
+        self._tareas: Set[asyncio.Task] = set()
+
+    def iniciar(self) -> None:
+        self._cola = asyncio.Queue()
+        self._despachador = asyncio.create_task(self._despachar())
+
+    async def cerrar(self) -> None:
+        """Deja de agrupar, espera los grupos en proceso y cancela los que seguían en cola."""
+        if self._despachador is not None:
+            self._despachador.cancel()
+            await asyncio.gather(self._despachador, return_exceptions=True)
+        await asyncio.gather(*self._tareas, return_exceptions=True)
+        while self._cola is not None and not self._cola.empty():
+            _, _, futuro = self._cola.get_nowait()
+            futuro.cancel()
+
+    async def validar(self, numeros: np.ndarray, formato: str) -> Tuple[bytes, np.ndarray]:
+        """Retorna (bytes, final de cada fila) del bloque validado."""
+        self.bloques += 1
+        if len(numeros) >= self.tamano_bloque:
+            self.llamadas += 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.ejecutor, _validar_serializado, numeros, formato)
+
+        futuro = asyncio.get_running_loop().create_future()
+        self._cola.put_nowait((numeros, formato, futuro))
+        return await futuro
+
+    async def _despachar(self) -> None:
+        while True:
+            grupo = [await self._cola.get()]
+            if self.espera > 0:
+                await asyncio.sleep(self.espera)
+
+            filas = len(grupo[0][0])
+            while filas < self.tamano_bloque and not self._cola.empty():
+                pendiente = self._cola.get_nowait()
+                grupo.append(pendiente)
+                filas += len(pendiente[0])
+
+            for formato in {formato for _, formato, _ in grupo}:
+                tarea = asyncio.create_task(self._procesar([item for item in grupo if item[1] == formato], formato))
+                self._tareas.add(tarea)
+                tarea.add_done_callback(self._tareas.discard)
+
+    async def _procesar(self, grupo: list, formato: str) -> None:
+        self.llamadas += 1
+        numeros = np.concatenate([numeros for numeros, _, _ in grupo]) if len(grupo) > 1 else grupo[0][0]
+        try:
+            loop = asyncio.get_running_loop()
+            texto, finales = await loop.run_in_executor(self.ejecutor, _validar_serializado, numeros, formato)
+        except Exception as e:
+            for _, _, futuro in grupo:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            return
+
+        # Repartir: filas [inicio, fin) de cada solicitud → bytes [finales[inicio-1], finales[fin-1])
+        limites = np.concatenate(([0], finales))
+        fila = 0
+        for numeros_solicitud, _, futuro in grupo:
+            fin = fila + len(numeros_solicitud)
+            if not futuro.done():
+                futuro.set_result((texto[limites[fila]:limites[fin]], finales[fila:fin] - limites[fila]))
+            fila = fin
+
+
+def _lineas_csv(lineas: Iterator[str]) -> Iterator[str]:
+    """Une las líneas de un registro CSV con saltos de línea entre comillas."""
+    pendiente = None
+    for linea in lineas:
+        pendiente = linea if pendiente is None else pendiente + '\n' + linea
+        if pendiente.count('"') % 2 == 0:
+            yield pendiente
+            pendiente = None
+    if pendiente is not None:
+        yield pendiente
+
+
+class LectorNumeros:
+    """
+    Extrae los números de las líneas del cuerpo de un lote.
+
+    Formatos de entrada:
+    - ndjson: cada línea es un valor JSON ("300...", 300..., null) o un objeto
+      con la clave "numero" (o la indicada en columna); una línea que no es
+      JSON se toma como texto
+    - csv: con encabezado (salvo encabezado=0); columna por nombre o posición
+    - texto: un número por línea
+    """
+
+    def __init__(self, entrada: str, columna: Optional[str] = None,
+                 separador: str = ',', encabezado: bool = True):
+        self.entrada = entrada
+        self.columna = columna
+        self.separador = separador
+        self._indice: Optional[int] = None
+        self._falta_encabezado = entrada == 'csv' and encabezado
+        if entrada == 'csv' and not encabezado:
+            self._indice = int(columna) if columna else 0
+
+    def numeros(self, lineas: List[str]) -> List[Optional[str]]:
+        if self.entrada == 'ndjson':
+            return [self._numero_json(linea) for linea in lineas if linea.strip()]
+        if self.entrada == 'csv':
+            return self._numeros_csv(lineas)
+        return [linea.rstrip('\r') for linea in lineas]
+
+    def _numero_json(self, linea: str) -> Optional[str]:
+        try:
+            valor = json.loads(linea)
+        except ValueError:
+            return linea.strip()
+        if isinstance(valor, dict):
+            valor = valor.get(self.columna or 'numero')
+        return None if valor is None else str(valor)
+
+    def _numeros_csv(self, lineas: List[str]) -> List[Optional[str]]:
+        filas = csv.reader(_lineas_csv(lineas), delimiter=self.separador)
+        if self._falta_encabezado:
+            encabezado = next(filas, None)
+            if encabezado is None:
+                return []
+            self._falta_encabezado = False
+            if self.columna is None:
+                self._indice = 0
+            elif self.columna in encabezado:
+                self._indice = encabezado.index(self.columna)
+            elif self.columna.isdigit():
+                self._indice = int(self.columna)
+            else:
+                raise ErrorSolicitud(400, f"Columna no encontrada: {self.columna}")
+
+        indice = self._indice
+        return [fila[indice] if len(fila) > indice and fila[indice] != '' else None
+                for fila in filas if fila]
+
+
+class ServicioValidacion:
+    """Servidor HTTP/1.1 (keep-alive) sobre asyncio para validar números."""
+
+    def __init__(self, procesos: int = 1, tamano_bloque: int = TAMANO_BLOQUE,
+                 espera_agrupacion: float = ESPERA_AGRUPACION,
+                 portabilidad: Optional[str] = None, listas_negras: Optional[List[str]] = None):
+        self.procesos = procesos
+        self.tamano_bloque = tamano_bloque
+        # Con un proceso, los lotes corren en un hilo y comparten el memo con
+        # las consultas unitarias; con varios, cada worker tiene su propio memo
+        if procesos > 1:
+            ejecutor = ProcessPoolExecutor(max_workers=procesos, initializer=_preparar_worker,
+                                           initargs=(portabilidad, listas_negras or []))
+        else:
+            ejecutor = ThreadPoolExecutor(max_workers=1)
+        self.ejecutor = ejecutor
+        self.agrupador = AgrupadorLotes(ejecutor, tamano_bloque, espera_agrupacion)
+        self.solicitudes = 0
+        self.filas_lote = 0
+        self.inicio = time.time()
+        self._servidor: Optional[asyncio.AbstractServer] = None
+        # Conexiones abiertas (tarea que la atiende → writer), para cerrarlas al terminar
+        self._conexiones: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    async def iniciar(self, host: str = '127.0.0.1', puerto: int = PUERTO) -> asyncio.AbstractServer:
+        self.agrupador.iniciar()
+        self._servidor = await asyncio.start_server(self._atender, host, puerto, limit=64 * 1024)
+        return self._servidor
+
+    async def cerrar(self) -> None:
+        if self._servidor is not None:
+            self._servidor.close()
+        # close() no cierra las conexiones keep-alive: al cerrarlas, cada una
+        # termina su solicitud en curso (o su espera) y sale
+        for writer in list(self._conexiones.values()):
+            writer.close()
+        await asyncio.gather(*self._conexiones, return_exceptions=True)
+        if self._servidor is not None:
+            await self._servidor.wait_closed()
+        await self.agrupador.cerrar()
+        self.ejecutor.shutdown(wait=False, cancel_futures=True)
+
+    # ---------- HTTP ----------
+
+    async def _atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        tarea = asyncio.current_task()
+        self._conexiones[tarea] = writer
+        try:
+            while await self._atender_solicitud(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self._conexiones[tarea]
+            writer.close()
+
+    async def _atender_solicitud(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Atiende una solicitud; retorna True si la conexión sigue abierta."""
+        try:
+            cabecera = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return False
+        except asyncio.LimitOverrunError:
+            await self._responder(writer, 431, {'error': 'Encabezados demasiado grandes'}, cerrar=True)
+            return False
+
+        lineas = cabecera.decode('latin-1').split('\r\n')
+        try:
+            metodo, destino, version = lineas[0].split(' ')
+        except ValueError:
+            await self._responder(writer, 400, {'error': 'Línea de solicitud inválida'}, cerrar=True)
+            return False
+
+        encabezados = {}
+        for linea in lineas[1:]:
+            nombre, _, valor = linea.partition(':')
+            if nombre:
+                encabezados[nombre.strip().lower()] = valor.strip()
+
+        conexion = encabezados.get('connection', '').lower()
+        mantener = conexion == 'keep-alive' if version == 'HTTP/1.0' else conexion != 'close'
+
+        url = urlsplit(destino)
+        parametros = {clave: valores[-1] for clave, valores in parse_qs(url.query).items()}
+        cuerpo = self._cuerpo(reader, encabezados)
+        self.solicitudes += 1
+
+        try:
+            if url.path == '/validar':
+                await self._validar_unitario(writer, metodo, parametros, cuerpo, mantener)
+            elif url.path == '/lote':
+                if metodo != 'POST':
+                    raise ErrorSolicitud(405, 'Use POST')
+                await self._validar_lote(writer, parametros, encabezados, cuerpo, mantener)
+            elif url.path == '/salud':
+                await self._responder(writer, 200, self.estado(), cerrar=not mantener)
+            else:
+                raise ErrorSolicitud(404, f'Ruta no encontrada: {url.path}')
+        except ErrorSolicitud as e:
+            # El cuerpo puede no haberse leído completo: se cierra la conexión
+            await self._responder(writer, e.estado, {'error': str(e)}, cerrar=True)
+            return False
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return False
+        except Exception as e:
+            await self._responder(writer, 500, {'error': str(e)}, cerrar=True)
+            return False
+
+        if mantener:
+            # Lo que quede del cuerpo (p. ej. un GET con Content-Length) se
+            # descarta para no leerlo como la siguiente solicitud
+            async for _ in cuerpo:
+                pass
+        return mantener
+
+    @staticmethod
+    async def _cuerpo(reader: asyncio.StreamReader, encabezados: Dict[str, str]) -> AsyncIterator[bytes]:
+        """Lee el cuerpo por partes (Content-Length o chunked)."""
+        if encabezados.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                tamano = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                if tamano == 0:
+                    await reader.readuntil(b'\r\n')
+                    return
+                yield await reader.readexactly(tamano)
+                await reader.readexactly(2)
+
+        restante = int(encabezados.get('content-length', 0))
+        while restante > 0:
+            parte = await reader.read(min(restante, TAMANO_LECTURA))
+            if not parte:
+                raise asyncio.IncompleteReadError(b'', restante)
+            restante -= len(parte)
+            yield parte
+
+    @staticmethod
+    async def _responder(writer: asyncio.StreamWriter, estado: int, datos,
+                         tipo: str = 'application/json; charset=utf-8', cerrar: bool = False) -> None:
+        cuerpo = datos if isinstance(datos, bytes) else json.dumps(datos, ensure_ascii=False).encode('utf-8')
+        writer.write(
+            f'HTTP/1.1 {estado} {ESTADOS[estado]}\r\n'
+            f'Content-Type: {tipo}\r\n'
+            f'Content-Length: {len(cuerpo)}\r\n'
+            f'Connection: {"close" if cerrar else "keep-alive"}\r\n\r\n'.encode('latin-1') + cuerpo
+        )
+        await writer.drain()
+
+    # ---------- Endpoints ----------
+
+    async def _validar_unitario(self, writer, metodo: str, parametros: Dict[str, str],
+                                cuerpo: AsyncIterator[bytes], mantener: bool) -> None:
+        if metodo == 'GET':
+            if 'numero' not in parametros:
+                raise ErrorSolicitud(400, 'Falta el parámetro numero')
+            numero = parametros['numero']
+        elif metodo == 'POST':
+            try:
+                datos = json.loads(b''.join([parte async for parte in cuerpo]) or b'{}')
+                numero = datos['numero']
+            except (ValueError, KeyError, TypeError):
+                raise ErrorSolicitud(400, 'Se espera un cuerpo JSON {"numero": "..."}')
+            numero = None if numero is None else str(numero)
+        else:
+            raise ErrorSolicitud(405, 'Use GET o POST')
+
+        # Una consulta unitaria se resuelve en el bucle: con el memo es más
+        # rápido que cualquier viaje a un worker
+        await self._responder(writer, 200, validar_numero_colombiano(numero), cerrar=not mantener)
+
+    async def _validar_lote(self, writer, parametros: Dict[str, str], encabezados: Dict[str, str],
+                            cuerpo: AsyncIterator[bytes], mantener: bool) -> None:
+        formato = parametros.get('formato', 'ndjson')
+        if formato not in TIPOS_RESPUESTA:
+            raise ErrorSolicitud(400, f'Formato no soportado: {formato} (ndjson o csv)')
+
+        tipo = encabezados.get('content-type', '')
+        entrada = parametros.get('entrada') or (
+            'ndjson' if 'json' in tipo else 'csv' if 'csv' in tipo else 'texto'
+        )
+        if entrada not in ('ndjson', 'csv', 'texto'):
+            raise ErrorSolicitud(400, f'Entrada no soportada: {entrada} (ndjson, csv o texto)')
+        lector = LectorNumeros(entrada, parametros.get('columna'), parametros.get('separador', ','),
+                               parametros.get('encabezado', '1') != '0')
+
+        # Se mantienen a lo sumo 2 bloques en vuelo por worker: la memoria
+        # queda acotada y el cliente recibe los resultados en orden
+        max_pendientes = 2 * max(self.procesos, 1)
+        pendientes = deque()
+        inicio_respuesta = False
+
+        async def escribir(datos: bytes) -> None:
+            nonlocal inicio_respuesta
+            if not inicio_respuesta:
+                writer.write(
+                    f'HTTP/1.1 200 OK\r\n'
+                    f'Content-Type: {TIPOS_RESPUESTA[formato]}\r\n'
+                    f'Transfer-Encoding: chunked\r\n'
+                    f'Connection: {"keep-alive" if mantener else "close"}\r\n\r\n'.encode('latin-1')
+                )
+                inicio_respuesta = True
+                if formato == 'csv':
+                    datos = (','.join(COLUMNAS_RESULTADO) + '\n').encode('utf-8') + datos
+            if datos:
+                writer.write(b'%x\r\n%b\r\n' % (len(datos), datos))
+                await writer.drain()
+
+        async def enviar_primero() -> None:
+            texto, _ = await pendientes.popleft()
+            await escribir(texto)
+
+        try:
+            async for bloque in self._bloques(cuerpo, lector):
+                self.filas_lote += len(bloque)
+                pendientes.append(asyncio.ensure_future(self.agrupador.validar(bloque, formato)))
+                if len(pendientes) >= max_pendientes:
+                    await enviar_primero()
+            while pendientes:
+                await enviar_primero()
+        except Exception:
+            if inicio_respuesta:
+                # Ya se enviaron datos: no hay forma de cambiar el estado
+                raise ConnectionError('Lote interrumpido')
+            raise
+        finally:
+            for tarea in pendientes:
+                tarea.cancel()
+
+        await escribir(b'')
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+
+    async def _bloques(self, cuerpo: AsyncIterator[bytes], lector: LectorNumeros) -> AsyncIterator[np.ndarray]:
+        """Bloques de hasta tamano_bloque números a medida que llega el cuerpo."""
+        numeros: List[Optional[str]] = []
+        resto = b''
+        async for parte in cuerpo:
+            resto += parte
+            corte = resto.rfind(b'\n')
+            if corte < 0:
+                continue
+            completas = resto[:corte]
+            if lector.entrada == 'csv' and completas.count(b'"') % 2:
+                # Un valor entre comillas sigue en la próxima parte
+                continue
+            resto = resto[corte + 1:]
+            numeros.extend(lector.numeros(completas.decode('utf-8-sig').split('\n')))
+            while len(numeros) >= self.tamano_bloque:
+                yield np.array(numeros[:self.tamano_bloque], dtype=object)
+                del numeros[:self.tamano_bloque]
+
+        if resto:
+            numeros.extend(lector.numeros(resto.decode('utf-8-sig').split('\n')))
+        for inicio in range(0, len(numeros), self.tamano_bloque):
+            yield np.array(numeros[inicio:inicio + self.tamano_bloque], dtype=object)
+
+    def estado(self) -> Dict:
+        return {
+            'estado': 'ok',
+            'procesos': self.procesos,
+            'segundos_activo': round(time.time() - self.inicio, 1),
+            'solicitudes': self.solicitudes,
+            'filas_lote': self.filas_lote,
+            'bloques_lote': self.agrupador.bloques,
+            'llamadas_validacion': self.agrupador.llamadas,
+            'memo': info_memo_validacion(),
+        }
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python validador_servicio.py',
+        description='Servicio HTTP local de validación de números celulares colombianos.',
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Dirección de escucha (por defecto 127.0.0.1)')
+    parser.add_argument('--puerto', type=int, default=PUERTO, help=f'Puerto (por defecto {PUERTO})')
+    parser.add_argument('-p', '--procesos', type=int, default=1,
+                        help='Procesos para validar lotes (por defecto 1: un hilo que comparte el memo)')
+    parser.add_argument('--tamano-bloque', type=int, default=TAMANO_BLOQUE,
+                        help=f'Números por bloque de un lote (por defecto {TAMANO_BLOQUE:,})')
+    parser.add_argument('--espera-ms', type=float, default=ESPERA_AGRUPACION * 1000,
+                        help='Milisegundos para juntar lotes pequeños concurrentes (por defecto 2)')
+    parser.add_argument('--portabilidad', help='CSV de portabilidad (número;operador actual) o su versión compilada')
+    parser.add_argument('--lista-negra', action='append', default=[], metavar='ARCHIVO',
+                        help='Lista negra / de exclusión (CSV o un número por línea); se puede repetir')
+    return parser
+
+
+async def _servir(args) -> None:
+    servicio = ServicioValidacion(args.procesos, args.tamano_bloque, args.espera_ms / 1000,
+                                  args.portabilidad, args.lista_negra)
+    servidor = await servicio.iniciar(args.host, args.puerto)
+    # Con SIGTERM también se cierra el pool (si no, los workers quedan huérfanos)
+    if hasattr(signal, 'SIGTERM') and sys.platform != 'win32':
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    print(f"✓ Validador escuchando en http://{args.host}:{args.puerto} "
+          f"({args.procesos} proceso(s))", file=sys.stderr, flush=True)
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        await servicio.cerrar()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de la línea de comandos."""
+    args = _parser().parse_args(argv)
+
+    if args.portabilidad:
+        tabla = cargar_portabilidad(args.portabilidad)
+        print(f"  ✓ Portabilidad: {len(tabla):,} números portados", file=sys.stderr)
+    if args.lista_negra:
+        lista = cargar_listas_negras(*args.lista_negra)
+        print(f"  ✓ Listas negras: {len(lista):,} números", file=sys.stderr)
+
+    try:
+        asyncio.run(_servir(args))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
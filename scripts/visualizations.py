@@ -3,132 +3,425 @@ Módulo para crear visualizaciones y gráficos.
 Incluye Sankey, gráficos de barras, estadísticas, etc.
 """
 
+import functools
+import hashlib
+import importlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
 from typing import Dict, List, Tuple
 import streamlit as st
-from config import COLORS
+from config import (
+    COLORS,
+    FIGURE_CACHE_SIZE,
+    SANKEY_MAX_LINKS,
+    SANKEY_MIN_SHARE,
+    SANKEY_OTHER_LABEL,
+    TIME_SERIES_MAX_POINTS,
+)
+from memory_budget import MEMORY_BUDGET, MemoryBudget, deep_size
+
+
+class _LazyModule:
+    """Módulo que se importa la primera vez que se usa uno de sus atributos."""
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr: str):
+        return getattr(importlib.import_module(self._name), attr)
+
+
+# Plotly se importa al crear el primer gráfico, no al importar este módulo
+go = _LazyModule("plotly.graph_objects")
+px = _LazyModule("plotly.express")
+
+
+# ============= CACHÉ DE FIGURAS =============
+
+def _feed_hash(h, value) -> None:
+    """Agrega un valor al hash con una representación estable (contenido, no identidad)."""
+    if isinstance(value, pd.DataFrame):
+        h.update(b"df" + repr((list(value.columns), [str(t) for t in value.dtypes])).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        h.update(b"series" + repr((value.name, str(value.dtype))).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(b"array" + repr((str(value.dtype), value.shape)).encode())
+        h.update(pd.util.hash_array(value.ravel()).tobytes() if value.dtype == object else value.tobytes())
+    elif isinstance(value, dict):
+        # El orden de inserción importa: define el orden de barras y sectores
+        h.update(b"dict%d" % len(value))
+        for key in value:
+            _feed_hash(h, key)
+            _feed_hash(h, value[key])
+    elif isinstance(value, (list, tuple)):
+        h.update(b"seq%d" % len(value))
+        for item in value:
+            _feed_hash(h, item)
+    else:
+        h.update(type(value).__name__.encode() + b":" + repr(value).encode() + b";")
+
+
+def stable_hash(*values) -> str:
+    """Hash estable del contenido (no de la identidad) de datos y opciones de un gráfico."""
+    h = hashlib.blake2b(digest_size=16)
+    for value in values:
+        _feed_hash(h, value)
+    return h.hexdigest()
+
+
+class FigureCache:
+    """
+    Caché LRU acotada y segura entre hilos: clave → figura y su JSON.
+    
+    El JSON se genera la primera vez que se pide (figure_json) y se reutiliza
+    mientras la figura siga en la caché. Las figuras son compartidas: no se
+    deben modificar después de obtenerlas. Con budget, el tamaño de cada
+    figura (deep_size) cuenta en el presupuesto de memoria del proceso.
+    """
+    
+    def __init__(self, max_entries: int = FIGURE_CACHE_SIZE, budget: MemoryBudget = None):
+        self.max_entries = max_entries
+        self.budget = budget
+        # clave → (figura, bytes, último uso)
+        self._entries: "OrderedDict[str, Tuple[go.Figure, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def _forget(self, key: str) -> int:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+        return size
+    
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries[key] = (entry[0], entry[1], time.monotonic())
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: str, fig: "go.Figure") -> None:
+        size = deep_size(fig) if self.budget is not None else 0
+        if self.budget is not None and not self.budget.fits(size):
+            return
+        with self._lock:
+            if key in self._entries:
+                self._forget(key)
+            self._entries[key] = (fig, size, time.monotonic())
+            self._bytes += size
+            while len(self._entries) > self.max_entries:
+                self._forget(next(iter(self._entries)))
+        if self.budget is not None:
+            self.budget.enforce()
+    
+    def memory_usage(self) -> Tuple[int, int]:
+        """(entradas, bytes)."""
+        with self._lock:
+            return len(self._entries), self._bytes
+    
+    def oldest_use(self):
+        with self._lock:
+            return next(iter(self._entries.values()))[2] if self._entries else None
+    
+    def evict_oldest(self) -> int:
+        with self._lock:
+            return self._forget(next(iter(self._entries))) if self._entries else 0
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+    
+    def info(self) -> Dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+_FIGURE_CACHE = FigureCache(budget=MEMORY_BUDGET)
+MEMORY_BUDGET.register("figuras", _FIGURE_CACHE)
+
+
+def cached_figure(builder):
+    """
+    Decorador: reutiliza la figura si ya se construyó con los mismos datos y
+    opciones (p. ej. en un rerun de Streamlit donde solo cambió un selectbox).
+    La función original queda disponible en `.uncached`.
+    """
+    @functools.wraps(builder)
+    def wrapper(*args, **kwargs):
+        key = stable_hash(builder.__qualname__, args, kwargs)
+        fig = _FIGURE_CACHE.get(key)
+        if fig is None:
+            fig = builder(*args, **kwargs)
+            _FIGURE_CACHE.put(key, fig)
+        return fig
+    
+    wrapper.uncached = builder
+    return wrapper
+
+
+def figure_json(fig: "go.Figure") -> str:
+    """JSON de la figura, generado una sola vez por figura (p. ej. para exportar o enviar)."""
+    cached = getattr(fig, "_cached_json", None)
+    if cached is None:
+        cached = fig.to_json()
+        fig._cached_json = cached
+    return cached
+
+
+def figure_cache_info() -> Dict:
+    """Estado de la caché de figuras (entradas, aciertos, fallos)."""
+    return _FIGURE_CACHE.info()
+
+
+def clear_figure_cache() -> None:
+    """Vacía la caché de figuras."""
+    _FIGURE_CACHE.clear()
+
+
+
+# ============= DIAGRAMAS SANKEY =============
+
+# Orden de los nodos dentro de una etapa (el primero que aparezca en el nombre)
+SANKEY_PRIORITY = ['Delivered', 'Entregado', 'Failed', 'Fallido',
+                   'Read', 'Leído', 'Processing', 'Procesando', 'ProcEnviados']
+
+# (patrón, color del nodo, color de los enlaces que llegan al nodo)
+SANKEY_COLORS = [
+    (r"^(?=.*enviado)(?=.*(?:inicio|origen))", "#2196F3", "rgba(158, 158, 158, 0.2)"),
+    (r"delivered|entregado", "#4CAF50", "rgba(76, 175, 80, 0.25)"),
+    (r"read|leído", "#9C27B0", "rgba(156, 39, 176, 0.25)"),
+    (r"failed|fallido", "#F44336", "rgba(244, 67, 54, 0.25)"),
+    (r"processing|procesando|procenviados", "#FF9800", "rgba(255, 152, 0, 0.25)"),
+    (r"negro|negra", "#3F51B5", "rgba(158, 158, 158, 0.2)"),
+]
+SANKEY_DEFAULT_COLORS = ("#9E9E9E", "rgba(158, 158, 158, 0.2)")
+
+
+def sankey_links_from_frame(df: pd.DataFrame, stages: List[str], value_col: str = None) -> pd.DataFrame:
+    """
+    Convierte un DataFrame con una columna por etapa (y opcionalmente una de
+    conteos) en la lista de enlaces entre etapas consecutivas.
+    
+    Cada fila es un recorrido, p. ej. (Enviado, Entregado, Leído); sin
+    value_col cada fila cuenta 1. Un mismo estado en dos etapas son nodos
+    distintos.
+    
+    Returns:
+        DataFrame con columnas source, target, value, source_stage, target_stage
+    """
+    values = df[value_col] if value_col else pd.Series(1, index=df.index)
+    links = []
+    for stage, (col_from, col_to) in enumerate(zip(stages, stages[1:])):
+        pares = pd.DataFrame({
+            'source': df[col_from].astype(str),
+            'target': df[col_to].astype(str),
+            'value': values,
+        })[df[col_from].notna() & df[col_to].notna()]
+        pares = pares.groupby(['source', 'target'], sort=False, observed=True)['value'].sum().reset_index()
+        links.append(pares.assign(source_stage=stage, target_stage=stage + 1))
+    
+    if not links:
+        return pd.DataFrame(columns=['source', 'target', 'value', 'source_stage', 'target_stage'])
+    return pd.concat(links, ignore_index=True)
+
+
+def _sankey_stages(source_idx: np.ndarray, target_idx: np.ndarray, n_nodes: int) -> np.ndarray:
+    """Etapa de cada nodo: el camino más largo desde un nodo sin entradas (con ciclos, acotado)."""
+    stage = np.zeros(n_nodes, dtype=np.int64)
+    for _ in range(n_nodes):
+        new_stage = stage.copy()
+        np.maximum.at(new_stage, target_idx, stage[source_idx] + 1)
+        new_stage = np.minimum(new_stage, n_nodes - 1)
+        if (new_stage == stage).all():
+            break
+        stage = new_stage
+    return stage
+
 
+def _sankey_links(source, target, value, stages: List[str], value_col: str) -> pd.DataFrame:
+    """Normaliza las entradas aceptadas por create_sankey_diagram a un DataFrame de enlaces."""
+    if isinstance(source, pd.DataFrame):
+        if stages:
+            return sankey_links_from_frame(source, stages, value_col)
+        links = source.rename(columns={value_col: 'value'}) if value_col else source
+        return links[[c for c in links.columns
+                      if c in ('source', 'target', 'value', 'source_stage', 'target_stage')]]
+    return pd.DataFrame({'source': list(source), 'target': list(target), 'value': list(value)})
 
-def create_sankey_diagram(source: List, target: List, value: List, title: str = "") -> go.Figure:
-    """Crea un diagrama de Sankey mejorado para visualizar flujos de estados."""
-    if not source or not target or not value:
+
+def _sankey_node_values(src: np.ndarray, tgt: np.ndarray, weights: np.ndarray, n_nodes: int) -> np.ndarray:
+    """Valor de cada nodo: lo que entra o lo que sale, lo que sea mayor."""
+    return np.maximum(np.bincount(src, weights, n_nodes), np.bincount(tgt, weights, n_nodes))
+
+
+def _sankey_group_links(src: np.ndarray, tgt: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Suma los enlaces repetidos (mismo origen y destino) y descarta los que van a sí mismos."""
+    links = pd.DataFrame({'s': src, 't': tgt, 'v': weights})
+    links = links[links['s'] != links['t']].groupby(['s', 't'], sort=False)['v'].sum().reset_index()
+    return links['s'].to_numpy(), links['t'].to_numpy(), links['v'].to_numpy()
+
+
+def _sankey_other_nodes(node_labels: np.ndarray, node_stage: np.ndarray,
+                        stages: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Índice del nodo "Otros" de cada etapa pedida, creándolo si no existe.
+    
+    Returns:
+        Tupla (etiquetas, etapas, tabla etapa → índice del nodo "Otros")
+    """
+    lookup = np.full(int(node_stage.max()) + 1, -1, dtype=np.int64)
+    existing = np.flatnonzero(node_labels == SANKEY_OTHER_LABEL)
+    lookup[node_stage[existing]] = existing
+    missing = np.unique(stages[lookup[stages] < 0])
+    lookup[missing] = len(node_labels) + np.arange(len(missing))
+    node_labels = np.concatenate([node_labels, np.full(len(missing), SANKEY_OTHER_LABEL, dtype=object)])
+    node_stage = np.concatenate([node_stage, missing])
+    return node_labels, node_stage, lookup
+
+
+@cached_figure
+def create_sankey_diagram(source, target: List = None, value: List = None, title: str = "",
+                          stages: List[str] = None, value_col: str = None,
+                          min_share: float = SANKEY_MIN_SHARE, max_links: int = SANKEY_MAX_LINKS) -> "go.Figure":
+    """
+    Crea un diagrama de Sankey de cualquier cantidad de etapas.
+    
+    Acepta:
+    - listas source / target / value (un enlace por posición)
+    - un DataFrame de enlaces (source, target, value y opcionalmente
+      source_stage / target_stage)
+    - un DataFrame con una columna por etapa, indicando `stages` (y `value_col`)
+    
+    Los nodos se indexan con una tabla hash (sin búsquedas en listas), los
+    colores y posiciones se calculan en bloque y el orden es siempre el mismo
+    (etapa, prioridad del estado, valor, nombre). Para que el navegador no se
+    congele, los nodos con menos de `min_share` del total de su etapa se
+    agrupan en un nodo "Otros", y si quedan más de `max_links` enlaces los
+    menores se redirigen al "Otros" de la etapa destino.
+    """
+    links = _sankey_links(source, target, value, stages, value_col)
+    if not links.empty:
+        links = links.assign(source=links['source'].astype(str), target=links['target'].astype(str),
+                             value=pd.to_numeric(links['value'], errors='coerce').fillna(0))
+        links = links[links['value'] > 0]
+    if links.empty:
         return go.Figure().add_annotation(text="No hay datos para visualizar")
     
-    # Obtener todos los nodos únicos
-    all_nodes = list(set(source + target))
-    
-    # Separar nodos en origen y destino para mejor organización
-    source_nodes = list(set(source))
-    target_nodes = list(set(target))
-    
-    # Organizar nodos: primero origen (izquierda), luego destino (derecha)
-    nodes = []
-    node_positions_x = []
-    node_positions_y = []
-    
-    # Nodos de origen a la izquierda (x=0.001)
-    for i, node in enumerate(source_nodes):
-        nodes.append(node)
-        node_positions_x.append(0.001)
-        node_positions_y.append(0.5)  # Centrado verticalmente
-    
-    # Nodos de destino a la derecha (x=0.999)
-    # Ordenar por importancia: Delivered, Failed, Read, Processing, otros
-    priority_order = ['Delivered', 'Entregado', 'Failed', 'Fallido', 
-                      'Read', 'Leído', 'Processing', 'Procesando', 'ProcEnviados']
-    
-    def get_priority(node):
-        for idx, keyword in enumerate(priority_order):
-            if keyword in str(node):
-                return idx
-        return len(priority_order)
-    
-    sorted_targets = sorted(target_nodes, key=get_priority)
-    
-    # Distribuir nodos de destino verticalmente
-    for i, node in enumerate(sorted_targets):
-        if node not in nodes:  # Evitar duplicados
-            nodes.append(node)
-            node_positions_x.append(0.999)
-            # Distribuir uniformemente entre 0.1 y 0.9
-            y_pos = 0.1 + (i / max(len(sorted_targets) - 1, 1)) * 0.8
-            node_positions_y.append(y_pos)
-    
-    # Colores mejorados para nodos según estado
-    node_colors = []
-    for node in nodes:
-        node_str = str(node).lower()
-        if "enviado" in node_str and ("inicio" in node_str or "origen" in node_str):
-            node_colors.append("#2196F3")  # Azul sólido (origen)
-        elif "delivered" in node_str or "entregado" in node_str:
-            node_colors.append("#4CAF50")  # Verde sólido
-        elif "read" in node_str or "leído" in node_str:
-            node_colors.append("#9C27B0")  # Violeta sólido
-        elif "failed" in node_str or "fallido" in node_str:
-            node_colors.append("#F44336")  # Rojo sólido
-        elif "processing" in node_str or "procesando" in node_str or "procenviados" in node_str:
-            node_colors.append("#FF9800")  # Naranja sólido
-        elif "negro" in node_str or "negra" in node_str:
-            node_colors.append("#3F51B5")  # Indigo sólido
-        else:
-            node_colors.append("#9E9E9E")  # Gris sólido
-    
-    # Crear índices de source/target
-    source_idx = [nodes.index(s) for s in source]
-    target_idx = [nodes.index(t) for t in target]
-    
-    # Colores de links según el destino (más transparentes)
-    link_colors = []
-    for s, t in zip(source, target):
-        t_str = str(t).lower()
-        if "delivered" in t_str or "entregado" in t_str:
-            link_colors.append("rgba(76, 175, 80, 0.25)")
-        elif "failed" in t_str or "fallido" in t_str:
-            link_colors.append("rgba(244, 67, 54, 0.25)")
-        elif "read" in t_str or "leído" in t_str:
-            link_colors.append("rgba(156, 39, 176, 0.25)")
-        elif "processing" in t_str or "procesando" in t_str:
-            link_colors.append("rgba(255, 152, 0, 0.25)")
-        else:
-            link_colors.append("rgba(158, 158, 158, 0.2)")
-    
-    # Crear labels con valores para mejor legibilidad
-    node_labels = []
-    node_values = {}
-    
-    # Calcular valores totales por nodo
-    for s, t, v in zip(source, target, value):
-        if s not in node_values:
-            node_values[s] = 0
-        if t not in node_values:
-            node_values[t] = 0
-        node_values[s] += v
-        node_values[t] += v
-    
-    # Crear labels con nombre y valor
-    for node in nodes:
-        val = node_values.get(node, 0) // 2  # Dividir por 2 porque se cuenta entrada y salida
-        node_labels.append(f"{node}\n({val:,})")
-    
-    fig = go.Figure(data=[go.Sankey(
+    # Nodos: (etapa, nombre) si se conocen las etapas; si no, el nombre (y la etapa se deduce)
+    staged = 'source_stage' in links.columns and 'target_stage' in links.columns
+    if staged:
+        keys = pd.concat([
+            links['source_stage'].astype(str) + '\x1f' + links['source'],
+            links['target_stage'].astype(str) + '\x1f' + links['target'],
+        ], ignore_index=True)
+    else:
+        keys = pd.concat([links['source'], links['target']], ignore_index=True)
+    codes, uniques = pd.factorize(keys)
+    n_nodes, n_links = len(uniques), len(links)
+    src, tgt = codes[:n_links], codes[n_links:]
+    
+    node_labels = np.empty(n_nodes, dtype=object)
+    node_labels[codes] = pd.concat([links['source'], links['target']], ignore_index=True).to_numpy(dtype=object)
+    if staged:
+        node_stage = np.zeros(n_nodes, dtype=np.int64)
+        node_stage[src] = links['source_stage'].to_numpy(dtype=np.int64)
+        node_stage[tgt] = links['target_stage'].to_numpy(dtype=np.int64)
+    else:
+        node_stage = _sankey_stages(src, tgt, n_nodes)
+    src, tgt, weights = _sankey_group_links(src, tgt, links['value'].to_numpy(dtype=float))
+    
+    # Nodos pequeños de cada etapa → "Otros" de esa etapa (si son al menos dos)
+    node_value = _sankey_node_values(src, tgt, weights, len(node_labels))
+    stage_total = np.bincount(node_stage, node_value)
+    small = node_value < min_share * stage_total[node_stage]
+    small &= np.bincount(node_stage, small)[node_stage] >= 2
+    if small.any():
+        small = np.flatnonzero(small)
+        node_labels, node_stage, others = _sankey_other_nodes(node_labels, node_stage, node_stage[small])
+        remap = np.arange(len(node_labels))
+        remap[small] = others[node_stage[small]]
+        src, tgt, weights = _sankey_group_links(remap[src], remap[tgt], weights)
+    
+    # Si aún quedan demasiados enlaces, los menores van al "Otros" de la etapa destino
+    if len(weights) > max_links:
+        dropped = np.ones(len(weights), dtype=bool)
+        dropped[np.argsort(-weights, kind='stable')[:max_links]] = False
+        node_labels, node_stage, others = _sankey_other_nodes(node_labels, node_stage, node_stage[tgt[dropped]])
+        tgt = np.where(dropped, others[node_stage[tgt]], tgt)
+        src, tgt, weights = _sankey_group_links(src, tgt, weights)
+    
+    # Solo los nodos que conservan enlaces, en orden determinista:
+    # etapa, prioridad del estado, valor (desc), nombre
+    node_value = _sankey_node_values(src, tgt, weights, len(node_labels))
+    used = np.flatnonzero(node_value > 0)
+    label_series = pd.Series(node_labels[used], dtype=object).astype(str)
+    priority = np.full(len(used), len(SANKEY_PRIORITY))
+    for idx, keyword in reversed(list(enumerate(SANKEY_PRIORITY))):
+        priority[label_series.str.contains(keyword, regex=False).to_numpy()] = idx
+    priority[(label_series == SANKEY_OTHER_LABEL).to_numpy()] = len(SANKEY_PRIORITY) + 1
+    order = used[np.lexsort((label_series.to_numpy(), -node_value[used], priority, node_stage[used]))]
+    position = np.full(len(node_labels), -1, dtype=np.int64)
+    position[order] = np.arange(len(order))
+    src, tgt = position[src], position[tgt]
+    node_labels, node_stage, node_value = node_labels[order], node_stage[order], node_value[order]
+    
+    # Posiciones: x por etapa, y según el valor acumulado dentro de la etapa
+    first_stage = node_stage.min()
+    max_stage = max(int(node_stage.max() - first_stage), 1)
+    node_x = np.clip((node_stage - first_stage) / max_stage, 0.001, 0.999)
+    stage_total = np.bincount(node_stage, node_value)
+    before = pd.Series(node_value).groupby(node_stage).cumsum().to_numpy() - node_value
+    node_y = np.clip(0.02 + 0.96 * (before + node_value / 2) / stage_total[node_stage], 0.001, 0.999)
+    
+    # Colores por categoría del nombre; los enlaces toman la del destino
+    lower = pd.Series(node_labels, dtype=object).astype(str).str.lower()
+    category = np.full(len(node_labels), len(SANKEY_COLORS))
+    for idx, (pattern, _, _) in reversed(list(enumerate(SANKEY_COLORS))):
+        category[lower.str.contains(pattern, regex=True).to_numpy()] = idx
+    node_palette = np.array([c for _, c, _ in SANKEY_COLORS] + [SANKEY_DEFAULT_COLORS[0]], dtype=object)
+    link_palette = np.array([c for _, _, c in SANKEY_COLORS] + [SANKEY_DEFAULT_COLORS[1]], dtype=object)
+    
+    text_labels = [f"{label}\n({int(val):,})" for label, val in zip(node_labels, node_value)]
+    
+    # La traza se pasa como dict para que plotly la valide una sola vez
+    fig = go.Figure(data=[dict(
+        type="sankey",
         arrangement="snap",
         node=dict(
-            pad=40,
+            pad=40 if len(node_labels) <= 20 else 10,
             thickness=20,
             line=dict(color="white", width=2),
-            label=node_labels,
-            color=node_colors,
-            x=node_positions_x,
-            y=node_positions_y,
+            label=text_labels,
+            color=node_palette[category],
+            x=node_x,
+            y=node_y,
             hovertemplate='<b>%{label}</b><extra></extra>',
         ),
         link=dict(
-            source=source_idx,
-            target=target_idx,
-            value=value,
-            color=link_colors,
+            source=src,
+            target=tgt,
+            value=weights,
+            color=link_palette[category[tgt]],
             hovertemplate='<b>%{source.label}</b> → <b>%{target.label}</b><br>Cantidad: %{value:,.0f}<extra></extra>',
         ),
         textfont=dict(color="#000000", size=14, family="Arial Black"),
@@ -142,7 +435,7 @@ def create_sankey_diagram(source: List, target: List, value: List, title: str =
             "font": {"size": 20, "color": "#1f77b4", "family": "Arial"}
         },
         font=dict(size=14, family="Arial", color="#000000"),
-        height=500,
+        height=500 if max_stage <= 1 else 600,
         paper_bgcolor="rgba(255, 255, 255, 1)",
         plot_bgcolor="rgba(255, 255, 255, 1)",
         margin=dict(l=20, r=20, t=60, b=20),
@@ -153,7 +446,8 @@ def create_sankey_diagram(source: List, target: List, value: List, title: str =
 
 
 
-def create_status_bar_chart(data: Dict[str, int], title: str = "") -> go.Figure:
+@cached_figure
+def create_status_bar_chart(data: Dict[str, int], title: str = "") -> "go.Figure":
     """Crea un gráfico de barras con estados y sus conteos."""
     if not data:
         return go.Figure().add_annotation(text="No hay datos disponibles")
@@ -181,7 +475,8 @@ def create_status_bar_chart(data: Dict[str, int], title: str = "") -> go.Figure:
     return fig
 
 
-def create_pie_chart(data: Dict[str, int], title: str = "") -> go.Figure:
+@cached_figure
+def create_pie_chart(data: Dict[str, int], title: str = "") -> "go.Figure":
     """Crea un gráfico de pastel con distribución de estados."""
     if not data:
         return go.Figure().add_annotation(text="No hay datos disponibles")
@@ -207,26 +502,131 @@ def create_pie_chart(data: Dict[str, int], title: str = "") -> go.Figure:
     return fig
 
 
-def create_time_series_chart(df: pd.DataFrame, date_col: str, title: str = "") -> go.Figure:
-    """Crea un gráfico de serie temporal."""
+# Resoluciones posibles de una serie (etiqueta, ancho del intervalo)
+TIME_SERIES_RESOLUTIONS = [
+    ("por minuto", pd.Timedelta(minutes=1)),
+    ("cada 5 minutos", pd.Timedelta(minutes=5)),
+    ("cada 15 minutos", pd.Timedelta(minutes=15)),
+    ("por hora", pd.Timedelta(hours=1)),
+    ("cada 6 horas", pd.Timedelta(hours=6)),
+    ("por día", pd.Timedelta(days=1)),
+    ("por semana", pd.Timedelta(days=7)),
+]
+
+
+def lttb_downsample(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Índices de los puntos que conserva Largest-Triangle-Three-Buckets.
+    
+    Se mantienen el primero y el último; de cada intervalo intermedio se
+    elige el punto que forma el triángulo más grande con el punto elegido
+    antes y el promedio del intervalo siguiente, así se conservan picos y
+    valles con muchos menos puntos.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(area.argmax())
+        selected[i + 1] = previous
+    return selected
+
+
+def time_series_points(df: pd.DataFrame, date_col: str, value_col: str = None, freq: str = "D",
+                       date_range: Tuple = None,
+                       max_points: int = TIME_SERIES_MAX_POINTS) -> Tuple[pd.DatetimeIndex, np.ndarray, str]:
+    """
+    Agrega una serie por intervalos de tiempo y la reduce a max_points.
+    
+    Args:
+        df: Filas con una columna de fecha (o un agregado previo con value_col)
+        date_col: Columna de fecha
+        value_col: Columna a sumar; sin ella se cuentan filas
+        freq: "D" (por día), otro intervalo fijo ("h", "15min", "7D"), o "auto"
+            para elegir la resolución más fina que cabe en el rango (útil al hacer zoom)
+        date_range: (desde, hasta) para acotar la ventana
+        max_points: Puntos máximos; por encima se aplica LTTB
+        
+    Returns:
+        Tupla (fechas, valores, descripción de la resolución)
+    """
+    dates = pd.to_datetime(df[date_col], errors="coerce")
+    values = pd.to_numeric(df[value_col], errors="coerce").fillna(0) if value_col else None
+    valid = dates.notna()
+    if date_range is not None:
+        start, end = (pd.Timestamp(limit) if limit is not None else None for limit in date_range)
+        if start is not None:
+            valid &= dates >= start
+        if end is not None:
+            valid &= dates <= end
+    
+    dates = dates[valid]
+    if dates.empty:
+        return pd.DatetimeIndex([]), np.empty(0), ""
+    ns = dates.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    
+    if freq == "auto":
+        # La resolución más fina con a lo sumo 10 intervalos por punto final
+        span = ns.max() - ns.min()
+        label, width = next(
+            ((label, width) for label, width in TIME_SERIES_RESOLUTIONS if span / width.value <= 10 * max_points),
+            TIME_SERIES_RESOLUTIONS[-1],
+        )
+    else:
+        width = pd.Timedelta(freq if freq[:1].isdigit() else "1" + freq)
+        label = next((label for label, w in TIME_SERIES_RESOLUTIONS if w == width), freq)
+    
+    buckets, inverse = np.unique(ns // width.value, return_inverse=True)
+    weights = None if values is None else values[valid].to_numpy(dtype=float)
+    totals = np.bincount(inverse.ravel(), weights, len(buckets))
+    x = buckets * width.value
+    
+    if len(x) > max_points:
+        keep = lttb_downsample(x, totals, max_points)
+        x, totals = x[keep], totals[keep]
+    
+    return pd.DatetimeIndex(x.astype("datetime64[ns]")), totals, label
+
+
+@cached_figure
+def create_time_series_chart(df: pd.DataFrame, date_col: str, title: str = "", value_col: str = None,
+                             freq: str = "D", date_range: Tuple = None,
+                             max_points: int = TIME_SERIES_MAX_POINTS) -> "go.Figure":
+    """
+    Crea un gráfico de serie temporal.
+    
+    Nunca envía más de max_points puntos al navegador: la serie se agrega
+    por intervalos y, si aún sobran, se reduce con LTTB. Con freq="auto" y
+    un date_range (zoom) se vuelve a agregar a la resolución más fina que
+    cabe en esa ventana. Ver time_series_points.
+    """
     if df.empty or date_col not in df.columns:
         return go.Figure().add_annotation(text="No hay datos disponibles")
     
-    df_time = df.copy()
-    df_time[date_col] = pd.to_datetime(df_time[date_col], errors="coerce")
-    df_time = df_time.dropna(subset=[date_col]).sort_values(date_col)
+    x, y, resolution = time_series_points(df, date_col, value_col, freq, date_range, max_points)
     
-    if df_time.empty:
+    if len(x) == 0:
         return go.Figure().add_annotation(text="No hay datos válidos")
     
-    daily_counts = df_time.groupby(df_time[date_col].dt.date).size()
-    
     fig = go.Figure()
     fig.add_trace(go.Scatter(
-        x=daily_counts.index,
-        y=daily_counts.values,
-        mode='lines+markers',
-        name='Mensajes',
+        x=x,
+        y=y,
+        mode='lines+markers' if len(x) <= 200 else 'lines',
+        name=f'Mensajes ({resolution})',
         line=dict(color="#2196F3", width=2),
         marker=dict(size=6),
     ))
@@ -258,7 +658,8 @@ def create_statistics_cards(title: str, total: int, stats: Dict[str, int]) -> No
                 st.metric(state, f"{count:,}", f"{percentage:.1f}%")
 
 
-def create_comparison_chart(sms_stats: Dict, whatsapp_stats: Dict) -> go.Figure:
+@cached_figure
+def create_comparison_chart(sms_stats: Dict, whatsapp_stats: Dict) -> "go.Figure":
     """Crea un gráfico comparativo entre SMS y WhatsApp."""
     all_states = set(sms_stats.get("states", {}).keys()) | set(whatsapp_stats.get("states", {}).keys())
     
@@ -285,9 +686,36 @@ def create_comparison_chart(sms_stats: Dict, whatsapp_stats: Dict) -> go.Figure:
     
     return fig
 
+
+@cached_figure
+def create_month_comparison_chart(current: Dict[str, int], previous: Dict[str, int],
+                                  current_label: str, previous_label: str, title: str = "") -> "go.Figure":
+    """Crea un gráfico de barras agrupadas: un mes contra otro, por categoría."""
+    categories = sorted(set(current) | set(previous), key=lambda c: current.get(c, 0), reverse=True)
+    if not categories:
+        return go.Figure().add_annotation(text="No hay datos disponibles")
+
+    fig = go.Figure(data=[
+        go.Bar(name=previous_label, x=categories, y=[previous.get(c, 0) for c in categories],
+               marker_color="#B0BEC5"),
+        go.Bar(name=current_label, x=categories, y=[current.get(c, 0) for c in categories],
+               marker_color="#2196F3"),
+    ])
+
+    fig.update_layout(
+        title=title or f"{current_label} vs {previous_label}",
+        barmode="group",
+        height=400,
+        paper_bgcolor="rgba(240, 240, 240, 1)",
+        plot_bgcolor="rgba(240, 240, 240, 1)",
+    )
+
+    return fig
+
 # ========== NUEVAS VISUALIZACIONES MEJORADAS ==========
 
-def create_horizontal_bar_chart(data: Dict[str, int], title: str = "") -> go.Figure:
+@cached_figure
+def create_horizontal_bar_chart(data: Dict[str, int], title: str = "") -> "go.Figure":
     """Crea un gráfico de barras horizontales (mejor para textos largos)."""
     if not data:
         return go.Figure().add_annotation(text="No hay datos disponibles")
@@ -342,7 +770,8 @@ def create_horizontal_bar_chart(data: Dict[str, int], title: str = "") -> go.Fig
     return fig
 
 
-def create_donut_chart(data: Dict[str, int], title: str = "") -> go.Figure:
+@cached_figure
+def create_donut_chart(data: Dict[str, int], title: str = "") -> "go.Figure":
     """Crea un gráfico de donut (dona) mejorado."""
     if not data:
         return go.Figure().add_annotation(text="No hay datos disponibles")
@@ -372,7 +801,8 @@ def create_donut_chart(data: Dict[str, int], title: str = "") -> go.Figure:
     return fig
 
 
-def create_stacked_bar_chart(data_dict: Dict[str, Dict[str, int]], title: str = "") -> go.Figure:
+@cached_figure
+def create_stacked_bar_chart(data_dict: Dict[str, Dict[str, int]], title: str = "") -> "go.Figure":
     """Crea un gráfico de barras apiladas para múltiples categorías."""
     if not data_dict:
         return go.Figure().add_annotation(text="No hay datos disponibles")
@@ -0,0 +1,177 @@
+"""
+Pruebas de los índices de bitmaps (scripts/bitmap_index.py) contra los cubos
+(filter_cube) y contra máscaras de pandas sobre el mismo archivo.
+Ejecutar: python test_bitmap_index.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+import aggregates
+import bitmap_index
+from aggregates import MISSING_LABEL, build_cube, filter_cube
+from bitmap_index import Bitmap, build_index, fetch_rows
+
+# Filas del archivo de prueba (no es múltiplo de 8) y bloque de lectura:
+# el archivo ocupa varios bloques
+FILAS = 2_503
+BLOQUE = 1_000
+
+ESTADOS = ["Entregado", "Leido", "Failed", "Rechazado", ""]
+OPERADORES = ["Claro", "Movistar", "Tigo", "WOM"]
+
+
+def _archivo_sms(directorio: str) -> Path:
+    """CSV SMS sintético con valores vacíos, un operador poco frecuente y filas sin fecha."""
+    rng = np.random.default_rng(7)
+    operadores = rng.choice(OPERADORES, FILAS, p=[0.5, 0.3, 0.195, 0.005])
+    dias = rng.integers(1, 11, FILAS)
+    fechas = np.where(rng.random(FILAS) < 0.05, "", [f"2026-01-{dia:02d} 10:00:00" for dia in dias])
+    datos = pd.DataFrame({
+        "Id Envio": np.arange(1, FILAS + 1),
+        "Telefono celular": 573000000000 + np.arange(FILAS),
+        "Fecha de Carga": fechas,
+        "Fecha y hora procesado": fechas,
+        "Estado del envio": rng.choice(ESTADOS, FILAS),
+        "Usuario": rng.choice(["user_a", "user_b"], FILAS),
+        "Operador": operadores,
+        "Tipo Mensaje": rng.choice(["Promocional", "Notificacion"], FILAS),
+        "Total Clicks URL 1": 0, "Total Clicks URL 2": 0, "Total Clicks URL 3": 0,
+    })
+    ruta = Path(directorio) / "mensajes_texto.csv"
+    datos.to_csv(ruta, sep=";", index=False, encoding="latin1")
+    return ruta
+
+
+class BloquesPequenos:
+    """Lee los archivos en bloques de BLOQUE filas en lugar de AGGREGATE_CHUNK_SIZE."""
+
+    def __enter__(self):
+        self._anterior = aggregates.AGGREGATE_CHUNK_SIZE
+        aggregates.AGGREGATE_CHUNK_SIZE = bitmap_index.AGGREGATE_CHUNK_SIZE = BLOQUE
+
+    def __exit__(self, *exc):
+        aggregates.AGGREGATE_CHUNK_SIZE = bitmap_index.AGGREGATE_CHUNK_SIZE = self._anterior
+
+
+def _mascara(tabla: pd.DataFrame, filtros: dict) -> np.ndarray:
+    """Filas que cumplen los filtros, calculadas con pandas sobre el archivo leído completo."""
+    mascara = np.ones(len(tabla), dtype=bool)
+    for columna, valores in filtros.items():
+        if columna == "dates":
+            dias = pd.to_datetime(tabla["Fecha y hora procesado"], errors="coerce").dt.normalize()
+            mascara &= ((dias >= pd.Timestamp(valores[0])) & (dias <= pd.Timestamp(valores[1]))).to_numpy()
+        else:
+            etiquetas = tabla[columna].fillna(MISSING_LABEL).replace("", MISSING_LABEL)
+            mascara &= etiquetas.isin(valores).to_numpy()
+    return mascara
+
+
+def test_operaciones_bitmap():
+    """&, |, -, ~ y conteos con tamaños que no son múltiplo de 8."""
+    print("\n" + "="*60)
+    print("TEST: Operaciones de Bitmap")
+    print("="*60)
+
+    rng = np.random.default_rng(1)
+    for tamano in (1, 7, 8, 13, 64, 1001):
+        a, b = rng.random(tamano) < 0.4, rng.random(tamano) < 0.6
+        bits_a, bits_b = Bitmap.from_mask(a), Bitmap.from_mask(b)
+
+        assert (bits_a & bits_b).count() == (a & b).sum()
+        assert (bits_a | bits_b).count() == (a | b).sum()
+        assert (bits_a - bits_b).count() == (a & ~b).sum()
+        # ~ no debe contar los bits de relleno del último byte
+        assert (~bits_a).count() == (~a).sum() == tamano - bits_a.count()
+        assert np.array_equal((~~bits_a).bits, bits_a.bits)
+        assert np.array_equal((~bits_a).rows(), np.flatnonzero(~a))
+        assert Bitmap.full(tamano).count() == tamano and Bitmap.empty(tamano).count() == 0
+        assert np.array_equal(bits_a.rows(3), np.flatnonzero(a)[:3])
+        filas = np.flatnonzero(b)
+        assert np.array_equal(Bitmap.from_rows(filas, tamano).bits, bits_b.bits)
+    print("✓ &, |, -, ~ y count coinciden con las máscaras (tamaños 1, 7, 8, 13, 64, 1001)")
+
+    try:
+        Bitmap.full(8) & Bitmap.full(9)
+    except ValueError:
+        print("✓ Combinar bitmaps de tamaños distintos da error")
+    else:
+        raise AssertionError("se combinaron bitmaps de tamaños distintos")
+
+
+def test_indice_contra_cubo_y_pandas():
+    """match(filtros).count() coincide con filter_cube y con una máscara de pandas."""
+    print("\n" + "="*60)
+    print("TEST: Índice vs. cubo vs. pandas")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directorio, BloquesPequenos():
+        ruta = _archivo_sms(directorio)
+        indice = build_index("sms", ruta)
+        cubo = build_cube("sms", ruta)
+        tabla = pd.read_csv(ruta, sep=";", encoding="latin1", dtype=str, keep_default_na=False)
+
+        assert indice.size == FILAS
+        # Valores frecuentes como bits empaquetados; el operador poco frecuente como lista de filas
+        tipos = {indice.sets["Operador"][valor].dtype for valor in indice.sets["Operador"]}
+        assert tipos == {np.dtype(np.uint8), np.dtype(np.uint32)}, tipos
+        for columna in indice.columns:
+            for valor in indice.sets[columna]:
+                esperadas = np.flatnonzero(_mascara(tabla, {columna: [valor]}))
+                assert np.array_equal(indice.bitmap(columna, valor).rows(), esperadas), (columna, valor)
+        print(f"✓ Filas de cada valor iguales a pandas ({len(tipos)} tipos de almacenamiento)")
+
+        casos = [
+            {},
+            {"Estado del envio": ["Failed"]},
+            {"Estado del envio": ["Failed", MISSING_LABEL], "Operador": ["Claro", "WOM"]},
+            {"Operador": ["WOM"], "Tipo Mensaje": ["Promocional"]},
+            {"dates": ("2026-01-03", "2026-01-06"), "Usuario": ["user_b"]},
+            {"Operador": ["No existe"]},
+        ]
+        for filtros in casos:
+            cantidad = indice.match(filtros).count()
+            assert cantidad == int(filter_cube(cubo, filtros)["rows"].sum()), filtros
+            assert cantidad == _mascara(tabla, filtros).sum(), filtros
+            print(f"✓ {filtros or 'sin filtros'}: {cantidad:,} filas")
+
+        dentro = indice.match({"Estado del envio": ["Failed"]})
+        esperado = tabla[_mascara(tabla, {"Estado del envio": ["Failed"]})]["Operador"].value_counts().to_dict()
+        assert indice.value_counts("Operador", dentro) == esperado
+        print("✓ value_counts dentro de un bitmap coincide con pandas")
+
+
+def test_fetch_rows_entre_bloques():
+    """fetch_rows lee las filas pedidas aunque estén en bloques distintos."""
+    print("\n" + "="*60)
+    print("TEST: fetch_rows entre bloques")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directorio, BloquesPequenos():
+        ruta = _archivo_sms(directorio)
+        tabla = pd.read_csv(ruta, sep=";", encoding="latin1", dtype=str)
+        filas = np.array([0, BLOQUE - 1, BLOQUE, BLOQUE + 1, 2 * BLOQUE, FILAS - 1])
+
+        leidas = fetch_rows("sms", ruta, filas, columns=["Id Envio", "Operador"])
+        assert list(leidas.index) == list(filas)
+        assert leidas["Id Envio"].tolist() == tabla["Id Envio"].iloc[filas].tolist()
+        assert leidas["Operador"].tolist() == tabla["Operador"].iloc[filas].tolist()
+        assert fetch_rows("sms", ruta, np.array([], dtype=np.int64)).empty
+        print(f"✓ Filas {filas.tolist()} iguales a las del archivo")
+
+
+def main():
+    test_operaciones_bitmap()
+    test_indice_contra_cubo_y_pandas()
+    test_fetch_rows_entre_bloques()
+    print("\n✓ Todas las pruebas de índices de bitmaps pasaron")
+
+
+if __name__ == "__main__":
+    main()
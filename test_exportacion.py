@@ -0,0 +1,132 @@
+"""
+Pruebas de la exportación de resultados (scripts/exportacion.py): CSV, CSV
+comprimido (gzip / zip) y Parquet, con todas las filas o solo las válidas.
+Ejecutar: python test_exportacion.py
+"""
+
+import gzip
+import io
+import sys
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from exportacion import PARQUET_DISPONIBLE, ExportacionResultados, descripciones_formatos
+from phone_validator import CATEGORIAS_VALIDAS, COLUMNAS_RESULTADO, validar_lista_numeros, validar_lista_numeros_compacto
+
+# Con bloques de 4 filas, el segundo bloque no tiene ningún número válido
+NUMEROS = [
+    "3001234567", "+57 315 123 4567", None, "12",
+    "", "abc", None, "0312345",
+    "300-123-4567", "573725270507", "3201234567", "12345678901234567890",
+    "3111111111",
+]
+BLOQUE = 4
+
+
+def _leer(datos: bytes, formato: str) -> pd.DataFrame:
+    """Lee una exportación como texto (vacíos como "") y con las columnas booleanas como bool."""
+    if formato == 'parquet':
+        df = pd.read_parquet(io.BytesIO(datos))
+        return df.astype({columna: object for columna in df.columns if df[columna].dtype != bool}).fillna("")
+    if formato == 'csv.gz':
+        datos = gzip.decompress(datos)
+    elif formato == 'zip':
+        with zipfile.ZipFile(io.BytesIO(datos)) as archivo_zip:
+            assert archivo_zip.namelist() == ["validacion.csv"]
+            datos = archivo_zip.read("validacion.csv")
+    df = pd.read_csv(io.BytesIO(datos), dtype=str, keep_default_na=False)
+    for columna in ("valido", "sospechoso", "en_lista_negra"):
+        df[columna] = df[columna] == "True"
+    return df
+
+
+def _comparar(obtenido: pd.DataFrame, esperado: pd.DataFrame) -> None:
+    assert list(obtenido.columns) == COLUMNAS_RESULTADO
+    assert len(obtenido) == len(esperado)
+    for columna in COLUMNAS_RESULTADO:
+        if columna in ("valido", "sospechoso", "en_lista_negra"):
+            assert obtenido[columna].tolist() == esperado[columna].tolist(), columna
+        else:
+            assert obtenido[columna].tolist() == esperado[columna].fillna("").astype(str).tolist(), columna
+
+
+def _formatos():
+    return [formato for formato in ('csv', 'csv.gz', 'zip', 'parquet') if formato != 'parquet' or PARQUET_DISPONIBLE]
+
+
+def test_formatos():
+    """Cada formato contiene las mismas filas que validar_lista_numeros."""
+    print("\n" + "="*60)
+    print("TEST: Exportación en todos los formatos")
+    print("="*60)
+
+    esperado = validar_lista_numeros(NUMEROS)
+    compacto = validar_lista_numeros_compacto(NUMEROS)
+    validos = np.isin(compacto['categoria'].to_numpy(), CATEGORIAS_VALIDAS)
+
+    # Originales como arreglo y como función que los relee en bloques de otro tamaño
+    originales = {
+        'un arreglo': NUMEROS,
+        'una función por bloques': lambda: (pd.Series(NUMEROS[i:i + 3], dtype=object) for i in range(0, len(NUMEROS), 3)),
+    }
+    for descripcion, numeros in originales.items():
+        exportacion = ExportacionResultados(compacto, numeros, tamano_bloque=BLOQUE)
+        for formato in _formatos():
+            _comparar(_leer(exportacion.exportar(formato, nombre="validacion"), formato), esperado)
+            _comparar(_leer(exportacion.exportar(formato, validos, nombre="validacion"), formato),
+                      esperado[validos].reset_index(drop=True))
+        print(f"✓ Originales en {descripcion}: {', '.join(_formatos())} "
+              f"({len(esperado)} filas, {validos.sum()} válidas)")
+
+    assert ExportacionResultados(compacto, NUMEROS).exportar('csv') == ExportacionResultados(
+        compacto, NUMEROS, tamano_bloque=BLOQUE).exportar('csv')
+    print("✓ El tamaño de bloque no cambia el archivo")
+
+
+def test_sin_filas():
+    """Sin filas (o sin filas seleccionadas) se exporta solo el encabezado / esquema."""
+    print("\n" + "="*60)
+    print("TEST: Exportación sin filas")
+    print("="*60)
+
+    compacto = validar_lista_numeros_compacto(["", "12"])
+    ninguna = np.zeros(len(compacto), dtype=bool)
+    for exportacion, mascara in ((ExportacionResultados(validar_lista_numeros_compacto([])), None),
+                                 (ExportacionResultados(compacto, ["", "12"]), ninguna)):
+        for formato in _formatos():
+            df = _leer(exportacion.exportar(formato, mascara, nombre="validacion"), formato)
+            assert list(df.columns) == COLUMNAS_RESULTADO and df.empty
+    print(f"✓ Solo encabezado en {', '.join(_formatos())}")
+
+
+def test_formato_invalido():
+    """Un formato desconocido da ValueError y Parquet solo se ofrece con pyarrow."""
+    print("\n" + "="*60)
+    print("TEST: Formatos disponibles")
+    print("="*60)
+
+    try:
+        ExportacionResultados(validar_lista_numeros_compacto(["3001234567"])).exportar('xlsx')
+    except ValueError:
+        print("✓ Formato desconocido → ValueError")
+    else:
+        raise AssertionError("se aceptó un formato desconocido")
+
+    assert ('parquet' in descripciones_formatos()) == PARQUET_DISPONIBLE
+    print(f"✓ Formatos ofrecidos: {list(descripciones_formatos())}")
+
+
+def main():
+    test_formatos()
+    test_sin_filas()
+    test_formato_invalido()
+    print("\n✓ Todas las pruebas de exportación pasaron")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Presupuesto de tiempo de importación de la app (python -X importtime).
+Plotly Express y el validador se importan al usar un gráfico o la pestaña de
+DQ, y config resuelve los archivos de datos al usarlos, no al importar.
+Ejecutar: python test_importtime.py
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+SCRIPTS_DIR = Path(__file__).parent / "scripts"
+
+# Módulos del proyecto: la suma de su tiempo propio de importación (sin
+# Streamlit, pandas ni NumPy) no debe pasar de este presupuesto
+PRESUPUESTO_MS = 60
+
+# No se deben importar al importar la app
+MODULOS_DIFERIDOS = ("plotly.express", "phone_validator")
+
+REPETICIONES = 3
+
+
+def medir_importacion(modulo: str = "app"):
+    """
+    Importa el módulo en un proceso nuevo con -X importtime.
+    Retorna ({módulo: tiempo propio en µs}, si config ya resolvió SMS_FILE).
+    """
+    entorno = dict(os.environ)
+    entorno.pop("PYTHONDONTWRITEBYTECODE", None)  # medir con los .pyc, como en producción
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         f"import {modulo}, config; print('SMS_FILE' in vars(config))"],
+        cwd=SCRIPTS_DIR, env=entorno, capture_output=True, text=True, check=True,
+    )
+    tiempos = {}
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, _, nombre = linea[len("import time:"):].split("|")
+        tiempos[nombre.strip()] = int(propio)
+    return tiempos, proceso.stdout.strip().splitlines()[-1] == "True"
+
+
+def test_presupuesto_importacion():
+    """Tiempo de importación de app.py y módulos que no se deben cargar al iniciar."""
+    print("\n" + "="*60)
+    print("TEST: Presupuesto de importación de la app")
+    print("="*60)
+
+    proyecto = {ruta.stem for ruta in SCRIPTS_DIR.glob("*.py")}
+    mediciones = []
+    for _ in range(REPETICIONES):
+        tiempos, resuelto = medir_importacion("app")
+        assert not resuelto, "config resolvió los archivos de datos al importar"
+        for modulo in MODULOS_DIFERIDOS:
+            assert modulo not in tiempos, f"{modulo} se importa al importar la app"
+        mediciones.append(sum(t for nombre, t in tiempos.items() if nombre in proyecto) / 1000)
+
+    mejor = min(mediciones)
+    print(f"✓ Módulos del proyecto: {mejor:.1f} ms (presupuesto {PRESUPUESTO_MS} ms)")
+    print(f"✓ No se importan al iniciar: {', '.join(MODULOS_DIFERIDOS)}")
+    assert mejor <= PRESUPUESTO_MS, f"La importación tomó {mejor:.1f} ms (presupuesto {PRESUPUESTO_MS} ms)"
+
+
+if __name__ == "__main__":
+    test_presupuesto_importacion()
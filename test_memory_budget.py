@@ -0,0 +1,98 @@
+"""
+Pruebas del presupuesto de memoria compartido por las cachés
+(scripts/memory_budget.py con result_cache.py y visualizations.py).
+Ejecutar: python test_memory_budget.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from memory_budget import MemoryBudget, deep_size
+from result_cache import ResultCache
+from visualizations import FigureCache, go
+
+
+def _figura(puntos: int = 200) -> "go.Figure":
+    return go.Figure(go.Bar(x=list(range(puntos)), y=list(range(puntos))))
+
+
+def _pausa():
+    """Separa los momentos de uso (time.monotonic) de dos operaciones seguidas."""
+    time.sleep(0.002)
+
+
+def test_liberacion_entre_caches():
+    """Se libera primero la entrada usada hace más tiempo, sin importar su caché."""
+    print("\n" + "="*60)
+    print("TEST: LRU global entre la caché de resultados y la de figuras")
+    print("="*60)
+
+    figura = _figura()
+    tamano = deep_size(figura)
+    with tempfile.TemporaryDirectory() as directorio:
+        # Caben dos entradas de `tamano` bytes, no tres
+        presupuesto = MemoryBudget(int(tamano * 2.5))
+        resultados = ResultCache(directorio, budget=presupuesto)
+        figuras = FigureCache(budget=presupuesto)
+        presupuesto.register("resultados", resultados)
+        presupuesto.register("figuras", figuras)
+
+        resultados.put("funcion", "a", bytes(tamano))
+        _pausa()
+        figuras.put("figura", figura)
+        _pausa()
+        resultados.put("funcion", "b", bytes(tamano))
+        # La más antigua era el resultado "a" (sigue en disco)
+        assert resultados.memory_usage() == (1, tamano)
+        assert figuras.memory_usage() == (1, tamano)
+        print(f"✓ Tercera entrada: se liberó el resultado más antiguo ({presupuesto.used():,} de {presupuesto.max_bytes:,} bytes)")
+
+        _pausa()
+        assert resultados.get("funcion", "a") == bytes(tamano)
+        assert resultados.disk_hits == 1
+        # Ahora la más antigua era la figura
+        assert figuras.memory_usage() == (0, 0) and figuras.get("figura") is None
+        assert resultados.memory_usage() == (2, 2 * tamano)
+        assert presupuesto.evictions == 2 and presupuesto.used() <= presupuesto.max_bytes
+        print("✓ Al releer \"a\" del disco se liberó la figura (la usada hace más tiempo)")
+
+
+def test_entrada_mayor_que_el_presupuesto():
+    """Una entrada más grande que el presupuesto queda solo en disco."""
+    print("\n" + "="*60)
+    print("TEST: Entrada más grande que el presupuesto")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        presupuesto = MemoryBudget(10_000)
+        resultados = ResultCache(directorio, budget=presupuesto)
+        figuras = FigureCache(budget=presupuesto)
+        presupuesto.register("resultados", resultados)
+        presupuesto.register("figuras", figuras)
+
+        resultados.put("funcion", "chico", bytes(1_000))
+        resultados.put("funcion", "grande", bytes(50_000))
+        assert resultados.memory_usage() == (1, 1_000)
+        assert resultados.get("funcion", "grande") == bytes(50_000)
+        assert resultados.memory_usage() == (1, 1_000)
+        assert (Path(directorio) / "funcion-grande.pkl").exists()
+        print("✓ El resultado grande se sirve desde el disco y no entra en memoria")
+
+        figuras.put("grande", _figura(5_000))
+        assert figuras.memory_usage() == (0, 0)
+        assert presupuesto.evictions == 0
+        print("✓ La figura grande no se guarda; no se liberó nada por ella")
+
+
+def main():
+    test_liberacion_entre_caches()
+    test_entrada_mayor_que_el_presupuesto()
+    print("\n✓ Todas las pruebas del presupuesto de memoria pasaron")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Pruebas de la caché de resultados en disco (scripts/result_cache.py).
+Ejecutar: python test_result_cache.py
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+import result_cache
+from result_cache import ResultCache, SingleFlight, disk_cache
+
+
+class CacheTemporal:
+    """Reemplaza la caché de @disk_cache por una en un directorio temporal."""
+
+    def __enter__(self):
+        self._tmp = tempfile.TemporaryDirectory(prefix="test_result_cache_")
+        self._anterior = result_cache._RESULT_CACHE
+        result_cache._RESULT_CACHE = ResultCache(self._tmp.name)
+        return result_cache._RESULT_CACHE
+
+    def __exit__(self, *exc):
+        result_cache._RESULT_CACHE = self._anterior
+        self._tmp.cleanup()
+
+
+def test_huella_invalida():
+    """Cambiar el archivo que lee la función invalida su entrada."""
+    print("\n" + "="*60)
+    print("TEST: La huella del archivo invalida la entrada")
+    print("="*60)
+
+    with CacheTemporal() as cache, tempfile.TemporaryDirectory() as datos:
+        archivo = Path(datos) / "datos.csv"
+        archivo.write_text("a\n1\n")
+        llamadas = []
+
+        @disk_cache(lambda: archivo)
+        def contar_filas():
+            llamadas.append(1)
+            return len(archivo.read_text().splitlines()) - 1
+
+        assert contar_filas() == 1 and contar_filas() == 1
+        assert len(llamadas) == 1, "la segunda llamada debía salir de la caché"
+        print("✓ Misma huella: se calcula una vez")
+
+        archivo.write_text("a\n1\n2\n")
+        assert contar_filas() == 2
+        assert len(llamadas) == 2, "el archivo cambió y no se volvió a calcular"
+        print(f"✓ Archivo modificado: se recalcula ({cache.info()['functions']['contar_filas']['entries']} entradas)")
+
+
+def test_lru_disco():
+    """El disco no pasa de max_bytes y quedan las entradas más recientes."""
+    print("\n" + "="*60)
+    print("TEST: LRU del disco por tamaño")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = ResultCache(directorio, max_bytes=3500)
+        for i in range(10):
+            cache.put("funcion", f"clave{i}", bytes(1000))
+            assert cache.info()["bytes"] <= cache.max_bytes
+
+        en_disco = sorted(path.name for path in Path(directorio).glob("*.pkl"))
+        assert len(en_disco) == 3, en_disco
+        assert "funcion-clave9.pkl" in en_disco
+        print(f"✓ {len(en_disco)} entradas en disco ({cache.info()['bytes']:,} de {cache.max_bytes:,} bytes)")
+
+
+def test_reinicio_lee_disco():
+    """Una caché nueva sobre el mismo directorio sirve lo guardado por la anterior."""
+    print("\n" + "="*60)
+    print("TEST: Reinicio en caliente desde el disco")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ResultCache(directorio).put("funcion", "clave", b"resultado")
+
+        nueva = ResultCache(directorio)
+        assert nueva.get("funcion", "clave") == b"resultado"
+        assert (nueva.disk_hits, nueva.misses) == (1, 0)
+        assert nueva.get("funcion", "clave") == b"resultado"
+        assert nueva.hits == 1
+        print("✓ Primera lectura desde el disco, la siguiente desde la memoria")
+
+
+def test_clear_por_funcion():
+    """`.clear()` borra solo las entradas de esa función."""
+    print("\n" + "="*60)
+    print("TEST: clear() por función")
+    print("="*60)
+
+    with CacheTemporal() as cache:
+        llamadas = {"uno": 0, "dos": 0}
+
+        @disk_cache()
+        def uno(x):
+            llamadas["uno"] += 1
+            return x
+
+        @disk_cache()
+        def dos(x):
+            llamadas["dos"] += 1
+            return x * 2
+
+        for x in range(3):
+            uno(x), dos(x)
+        assert uno.clear() == 3
+        assert set(cache.info()["functions"]) == {"dos"}
+
+        uno(0), dos(0)
+        assert llamadas == {"uno": 4, "dos": 3}, llamadas
+        print("✓ uno.clear() borró 3 entradas; las de dos siguen en caché")
+
+
+def _dos_hilos(vuelo: SingleFlight, funcion):
+    """Llama vuelo.do con la misma clave desde dos hilos; el segundo llega mientras el primero calcula."""
+    resultados, soltar, compartidos = {}, threading.Event(), vuelo.shared
+
+    def lenta():
+        soltar.wait(5)
+        return funcion()
+
+    def llamar(nombre):
+        try:
+            resultados[nombre] = vuelo.do("clave", lenta)
+        except Exception as e:
+            resultados[nombre] = e
+
+    primero = threading.Thread(target=llamar, args=("primero",))
+    primero.start()
+    while vuelo.in_flight() == 0:
+        time.sleep(0.001)
+    segundo = threading.Thread(target=llamar, args=("segundo",))
+    segundo.start()
+    while vuelo.shared == compartidos:
+        time.sleep(0.001)
+    soltar.set()
+    primero.join(), segundo.join()
+    return resultados
+
+
+def test_calculo_compartido():
+    """Dos hilos con la misma clave ejecutan la función una vez y comparten resultado o error."""
+    print("\n" + "="*60)
+    print("TEST: SingleFlight (un cálculo por clave)")
+    print("="*60)
+
+    vuelo, llamadas = SingleFlight(), []
+
+    def calcular():
+        llamadas.append(1)
+        return {"filas": 42}
+
+    resultados = _dos_hilos(vuelo, calcular)
+    assert len(llamadas) == 1
+    assert resultados["primero"] == ({"filas": 42}, False)
+    assert resultados["segundo"] == ({"filas": 42}, True)
+    assert vuelo.in_flight() == 0
+    print("✓ Una ejecución; el segundo hilo recibe el mismo resultado")
+
+    def fallar():
+        llamadas.append(1)
+        raise ValueError("archivo dañado")
+
+    resultados = _dos_hilos(vuelo, fallar)
+    assert len(llamadas) == 2
+    assert all(isinstance(resultados[nombre], ValueError) for nombre in ("primero", "segundo")), resultados
+    assert vuelo.in_flight() == 0
+    print("✓ Si la función falla, los dos hilos reciben el error")
+
+
+def main():
+    test_huella_invalida()
+    test_lru_disco()
+    test_reinicio_lee_disco()
+    test_clear_por_funcion()
+    test_calculo_compartido()
+    print("\n✓ Todas las pruebas de la caché de resultados pasaron")
+
+
+if __name__ == "__main__":
+    main()
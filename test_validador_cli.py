@@ -0,0 +1,136 @@
+"""
+Pruebas del validador por línea de comandos (scripts/validador_cli.py):
+archivo CSV con celdas vacías, por bloques, con uno y varios procesos.
+Ejecutar: python test_validador_cli.py
+"""
+
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from phone_validator import COLUMNAS_RESULTADO, analizar_resultados, validar_lista_numeros
+import validador_cli
+
+# Con bloques de 2 filas, el segundo bloque tiene solo celdas vacías
+# y el tercero un vacío y un número corto
+NUMEROS = ["3001234567", "+57 315 123 4567", None, None, "", "12", "300-123-4567", "abc", "573725270507"]
+
+
+def _entrada(directorio: str) -> Path:
+    ruta = Path(directorio) / "contactos.csv"
+    pd.DataFrame({"Nombre": [f"contacto {i}" for i in range(len(NUMEROS))], "Telefono": NUMEROS}).to_csv(ruta, index=False)
+    return ruta
+
+
+def _comparar(salida: pd.DataFrame, esperado: pd.DataFrame) -> None:
+    assert list(salida.columns) == COLUMNAS_RESULTADO
+    for columna in ("numero_limpio", "numero_completo", "categoria", "operador", "mensaje_error", "razon_sospecha"):
+        assert salida[columna].fillna("").tolist() == esperado[columna].fillna("").tolist(), columna
+    for columna in ("valido", "sospechoso", "en_lista_negra"):
+        assert salida[columna].tolist() == esperado[columna].tolist(), columna
+
+
+def test_csv_con_vacios():
+    """La salida CSV y el resumen JSON coinciden con validar_lista_numeros, con 1 y 2 procesos."""
+    print("\n" + "="*60)
+    print("TEST: CLI con celdas vacías")
+    print("="*60)
+
+    esperado = validar_lista_numeros(NUMEROS)
+    with tempfile.TemporaryDirectory() as directorio:
+        entrada = _entrada(directorio)
+        for procesos in (1, 2):
+            salida = Path(directorio) / f"resultados_{procesos}.csv"
+            resumen = Path(directorio) / f"resumen_{procesos}.json"
+            codigo = validador_cli.main([
+                str(entrada), "--columna", "Telefono", "-o", str(salida), "--resumen", str(resumen),
+                "--tamano-bloque", "2", "--procesos", str(procesos), "--silencioso",
+            ])
+            assert codigo == 0
+
+            resultados = pd.read_csv(salida, dtype=str, keep_default_na=False)
+            for columna in ("valido", "sospechoso", "en_lista_negra"):
+                resultados[columna] = resultados[columna] == "True"
+            _comparar(resultados, esperado)
+            assert resultados["categoria"].tolist()[2:6] == ["Vacío", "Vacío", "Vacío", "Longitud inválida"]
+
+            estadisticas = json.loads(resumen.read_text(encoding="utf-8"))
+            assert estadisticas == json.loads(json.dumps(analizar_resultados(esperado), ensure_ascii=False))
+            print(f"✓ -p {procesos}: {len(resultados)} filas, {estadisticas['categorias']}")
+
+
+def test_csv_gz_sin_encabezado():
+    """Un número por línea sin encabezado, con salida comprimida."""
+    print("\n" + "="*60)
+    print("TEST: CLI sin encabezado y salida .csv.gz")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        entrada = Path(directorio) / "numeros.txt"
+        entrada.write_text("3001234567\n\n12\n3151234567\n", encoding="utf-8")
+        salida = Path(directorio) / "resultados.csv.gz"
+        resumen = Path(directorio) / "resumen.json"
+        codigo = validador_cli.main([str(entrada), "--sin-encabezado", "-o", str(salida), "--resumen", str(resumen), "--silencioso"])
+        assert codigo == 0
+
+        resultados = pd.read_csv(salida, dtype=str, keep_default_na=False)
+        # pandas omite las líneas en blanco de un archivo de una sola columna
+        assert resultados["categoria"].tolist() == ["Válido (Sospechoso)", "Longitud inválida", "Válido (Sospechoso)"]
+        assert json.loads(resumen.read_text(encoding="utf-8"))["total"] == 3
+        print(f"✓ {len(resultados)} filas en {salida.name}")
+
+
+def test_columna_por_posicion_y_stdin():
+    """La columna por posición y la entrada por stdin dan lo mismo que la columna por nombre."""
+    print("\n" + "="*60)
+    print("TEST: CLI con columna por posición y stdin")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        entrada = _entrada(directorio)
+        salidas = {}
+        for descripcion, argumentos in (("nombre", [str(entrada), "--columna", "Telefono"]),
+                                        ("posición", [str(entrada), "--columna", "1"]),
+                                        ("stdin", ["-", "--columna", "1"])):
+            salida = Path(directorio) / f"resultados_{len(salidas)}.csv"
+            stdin = sys.stdin
+            sys.stdin = io.TextIOWrapper(io.BytesIO(entrada.read_bytes()), encoding="utf-8")
+            try:
+                codigo = validador_cli.main(argumentos + ["-o", str(salida), "--tamano-bloque", "2", "--silencioso"])
+            finally:
+                sys.stdin = stdin
+            assert codigo == 0
+            salidas[descripcion] = salida.read_text(encoding="utf-8")
+
+        assert salidas["posición"] == salidas["nombre"] and salidas["stdin"] == salidas["nombre"]
+        print(f"✓ {', '.join(salidas)}: misma salida")
+
+
+def test_entrada_inexistente():
+    """Un archivo que no existe termina con código 1."""
+    print("\n" + "="*60)
+    print("TEST: CLI con entrada inexistente")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        codigo = validador_cli.main([str(Path(directorio) / "no_existe.csv"), "-o", str(Path(directorio) / "r.csv"), "--silencioso"])
+        assert codigo == 1
+        print("✓ Código de salida 1")
+
+
+def main():
+    test_csv_con_vacios()
+    test_csv_gz_sin_encabezado()
+    test_columna_por_posicion_y_stdin()
+    test_entrada_inexistente()
+    print("\n✓ Todas las pruebas de la línea de comandos pasaron")
+
+
+if __name__ == "__main__":
+    main()
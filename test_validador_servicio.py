@@ -0,0 +1,183 @@
+"""
+Pruebas del servicio HTTP de validación (scripts/validador_servicio.py),
+con el servidor en el mismo proceso y un cliente http.client.
+Ejecutar: python test_validador_servicio.py
+"""
+
+import asyncio
+import csv
+import http.client
+import io
+import json
+import sys
+from pathlib import Path
+from urllib.parse import quote
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from phone_validator import limpiar_memo_validacion, validar_lista_numeros, validar_numero_colombiano
+from validador_servicio import ServicioValidacion
+
+COLUMNAS_COMPARADAS = ["numero_completo", "categoria", "operador", "mensaje_error", "razon_sospecha"]
+
+
+def _esperado(numeros) -> list:
+    return validar_lista_numeros(numeros)[COLUMNAS_COMPARADAS].fillna("").to_dict("records")
+
+
+def _filas(texto: str, formato: str) -> list:
+    if formato == "csv":
+        filas = list(csv.DictReader(io.StringIO(texto)))
+    else:
+        filas = [json.loads(linea) for linea in texto.splitlines()]
+    return [{columna: fila[columna] or "" for columna in COLUMNAS_COMPARADAS} for fila in filas]
+
+
+class Cliente:
+    """Conexión keep-alive al servicio; cada solicitud corre en un hilo para no bloquear el bucle."""
+
+    def __init__(self, puerto: int):
+        self._conexion = http.client.HTTPConnection("127.0.0.1", puerto, timeout=30)
+
+    def _enviar(self, metodo: str, ruta: str, cuerpo: bytes = None, encabezados: dict = None):
+        self._conexion.request(metodo, ruta, body=cuerpo, headers=encabezados or {})
+        respuesta = self._conexion.getresponse()
+        return respuesta.status, respuesta.read().decode("utf-8")
+
+    async def pedir(self, metodo: str, ruta: str, cuerpo: bytes = None, encabezados: dict = None):
+        return await asyncio.get_running_loop().run_in_executor(None, self._enviar, metodo, ruta, cuerpo, encabezados)
+
+    def cerrar(self) -> None:
+        self._conexion.close()
+
+
+def _con_servicio(prueba, **opciones):
+    """Ejecuta prueba(servicio, cliente) con el servicio escuchando en un puerto libre."""
+    async def ejecutar():
+        servicio = ServicioValidacion(**opciones)
+        servidor = await servicio.iniciar("127.0.0.1", 0)
+        cliente = Cliente(servidor.sockets[0].getsockname()[1])
+        try:
+            await prueba(servicio, cliente)
+        finally:
+            cliente.cerrar()
+            await servicio.cerrar()
+
+    asyncio.run(ejecutar())
+
+
+def test_validar_unitario():
+    """GET y POST /validar responden lo mismo que validar_numero_colombiano."""
+    print("\n" + "="*60)
+    print("TEST: /validar")
+    print("="*60)
+
+    async def prueba(servicio, cliente):
+        estado, texto = await cliente.pedir("GET", "/validar?numero=" + quote("+57 300 123 4567"))
+        assert estado == 200 and json.loads(texto) == validar_numero_colombiano("+57 300 123 4567")
+        print(f"✓ GET: {json.loads(texto)['categoria']}")
+
+        estado, texto = await cliente.pedir("POST", "/validar", json.dumps({"numero": None}).encode(),
+                                            {"Content-Type": "application/json"})
+        assert estado == 200 and json.loads(texto)["categoria"] == "Vacío"
+        print("✓ POST con número nulo: Vacío")
+
+        estado, _ = await cliente.pedir("GET", "/validar")
+        assert estado == 400
+        print("✓ Sin número: 400")
+
+    _con_servicio(prueba)
+
+
+def _prueba_lotes(repeticiones: int):
+    """Lotes CSV y NDJSON con celdas vacías, después de dejar un número en el memo."""
+    async def prueba(servicio, cliente):
+        # Con el número ya en el memo, en el lote solo quedan por validar los vacíos
+        estado, _ = await cliente.pedir("GET", "/validar?numero=3001234567")
+        assert estado == 200
+
+        cuerpo_csv = "Nombre,Tel\nx,3001234567\nx,\n".encode("utf-8")
+        for _ in range(repeticiones):
+            for formato in ("ndjson", "csv"):
+                estado, texto = await cliente.pedir("POST", f"/lote?columna=Tel&formato={formato}", cuerpo_csv,
+                                                    {"Content-Type": "text/csv"})
+                assert estado == 200, texto
+                assert _filas(texto, formato) == _esperado(["3001234567", None])
+        print(f"✓ CSV con una celda vacía ({repeticiones} veces por formato)")
+
+        numeros = [None, "", None, "12", "+57 315 123 4567", "abc", "3001234567"]
+        cuerpo_ndjson = "\n".join(json.dumps(numero) for numero in numeros).encode("utf-8")
+        estado, texto = await cliente.pedir("POST", "/lote", cuerpo_ndjson, {"Content-Type": "application/x-ndjson"})
+        assert estado == 200, texto
+        assert _filas(texto, "ndjson") == _esperado(numeros)
+        print(f"✓ NDJSON con bloques de solo vacíos y cortos ({len(numeros)} filas)")
+
+        estado, texto = await cliente.pedir("POST", "/lote?formato=csv", b"3001234567\n\n12\n")
+        assert estado == 200
+        assert _filas(texto, "csv") == _esperado(["3001234567", "", "12"])
+        print("✓ Texto (un número por línea) con una línea vacía")
+
+    return prueba
+
+
+def test_lotes_un_proceso():
+    """Con un proceso, los lotes comparten el memo de las consultas unitarias."""
+    print("\n" + "="*60)
+    print("TEST: /lote con un proceso")
+    print("="*60)
+
+    limpiar_memo_validacion()
+    _con_servicio(_prueba_lotes(1), tamano_bloque=2)
+
+
+def test_lotes_varios_procesos():
+    """Con dos procesos, cada respuesta es correcta sin importar qué worker la atiende."""
+    print("\n" + "="*60)
+    print("TEST: /lote con dos procesos")
+    print("="*60)
+
+    _con_servicio(_prueba_lotes(5), procesos=2, tamano_bloque=2)
+
+
+def test_salud():
+    """/salud cuenta solicitudes y filas de lote; las rutas y formatos desconocidos dan error."""
+    print("\n" + "="*60)
+    print("TEST: /salud y errores")
+    print("="*60)
+
+    async def prueba(servicio, cliente):
+        estado, _ = await cliente.pedir("POST", "/lote", b"3001234567\n3151234567\n")
+        assert estado == 200
+        estado, texto = await cliente.pedir("GET", "/salud")
+        salud = json.loads(texto)
+        assert estado == 200 and salud["estado"] == "ok"
+        assert salud["solicitudes"] == 2 and salud["filas_lote"] == 2
+        print(f"✓ {salud['solicitudes']} solicitudes, {salud['filas_lote']} filas de lote")
+
+        # El cuerpo de un GET se descarta: la siguiente solicitud de la conexión se lee bien
+        estado, _ = await cliente.pedir("GET", "/salud", b"cuerpo que no se usa")
+        assert estado == 200
+        estado, texto = await cliente.pedir("GET", "/validar?numero=3151234567")
+        assert estado == 200 and json.loads(texto)["operador"] == "Claro"
+        print("✓ Un GET con cuerpo no afecta la siguiente solicitud (keep-alive)")
+
+        # Cada error cierra la conexión; http.client vuelve a conectar
+        for metodo, ruta, esperado in (("GET", "/otra", 404), ("GET", "/lote", 405),
+                                       ("POST", "/lote?formato=xml", 400)):
+            estado, _ = await cliente.pedir(metodo, ruta, b"" if metodo == "POST" else None)
+            assert estado == esperado, (ruta, estado)
+        print("✓ Ruta desconocida 404, GET /lote 405, formato desconocido 400")
+
+    _con_servicio(prueba)
+
+
+def main():
+    test_validar_unitario()
+    test_lotes_un_proceso()
+    test_lotes_varios_procesos()
+    test_salud()
+    print("\n✓ Todas las pruebas del servicio pasaron")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,19 @@ from scripts.phone_validator import (
     analizar_resultados,
     limpiar_numero,
     identificar_operador,
-    detectar_patron_sospechoso
+    detectar_patron_sospechoso,
+    detectar_patrones_sospechosos_lote,
+    RAZONES_SOSPECHA,
+    info_memo_validacion,
+    limpiar_memo_validacion,
+    ResumenValidacion,
+    validar_lista_numeros_compacto,
+    expandir_resultados,
+    cargar_portabilidad,
+    desactivar_portabilidad,
+    cargar_listas_negras,
+    desactivar_listas_negras,
+    detectar_casi_duplicados,
 )
 
 def test_limpieza():
@@ -76,6 +88,35 @@ def test_patrones_sospechosos():
         if sospechoso:
             print(f"    Razón: {razon}")
 
+def test_patrones_sospechosos_lote():
+    """Prueba que la detección vectorizada coincida con la individual."""
+    print("\n" + "="*60)
+    print("TEST 3b: Detección Vectorizada de Patrones Sospechosos")
+    print("="*60)
+    
+    casos = [
+        "3001234567",
+        "3111111111",
+        "3001230000",
+        "3012345678",
+        "3098765432",
+        "3001111123",
+        "3012121212",
+        "1212121212",
+        "3045454590",
+        "30012",
+        "",
+    ]
+    
+    sospechosos, codigos = detectar_patrones_sospechosos_lote(casos)
+    
+    for numero, sospechoso, codigo in zip(casos, sospechosos, codigos):
+        esperado = detectar_patron_sospechoso(numero)
+        obtenido = (bool(sospechoso), RAZONES_SOSPECHA[codigo])
+        resultado = "✅" if obtenido == esperado else "❌"
+        print(f"{resultado} {numero!r} → {obtenido[1] or 'Normal'}")
+        assert obtenido == esperado
+
 def test_validacion_completa():
     """Prueba la validación completa de números."""
     print("\n" + "="*60)
@@ -157,6 +198,221 @@ def test_validacion_lista():
     print(f"\n📋 MUESTRA DE RESULTADOS:")
     print(df[['numero_original', 'numero_completo', 'valido', 'categoria', 'operador']].head(10).to_string(index=False))
 
+def test_validacion_lista_con_memo():
+    """Prueba que la validación por lotes (agrupada y con memo) coincida con la individual."""
+    print("\n" + "="*60)
+    print("TEST 5b: Validación por Lotes con Memo")
+    print("="*60)
+    
+    numeros = [
+        "573001234567",
+        "+57 300 123 4567",
+        "300-123-4567",
+        "3001234567",
+        "573725270507",
+        "57312345",
+        "3012121212",
+        None,
+        "",
+        "abc123",
+    ] * 3
+    
+    limpiar_memo_validacion()
+    df = validar_lista_numeros(numeros)
+    
+    for i, numero in enumerate(numeros):
+        esperado = validar_numero_colombiano(numero)
+        obtenido = df.iloc[i].to_dict()
+        check = "✅" if all(obtenido[k] == esperado[k] for k in esperado if k != 'numero_original') else "❌"
+        if i < len(numeros) // 3:
+            print(f"{check} {numero!r} → {obtenido['categoria']}")
+        assert check == "✅"
+    
+    validar_lista_numeros(numeros)
+    info = info_memo_validacion()
+    print(f"\n🧠 Memo: {info['entradas']} entradas, {info['aciertos']} aciertos, {info['fallos']} fallos")
+    assert info['entradas'] == 8
+    assert info['aciertos'] > info['fallos']
+
+def test_resumen_incremental():
+    """Prueba que el resumen por bloques coincida con analizar_resultados."""
+    print("\n" + "="*60)
+    print("TEST 5c: Resumen Incremental por Bloques")
+    print("="*60)
+    
+    numeros = [
+        "573001234567", "3151234567", "+573201234567", "3151234567",
+        "573725270507", "57312345", "", "3001234567", "300 123 4567",
+        "0312345", "312345", "0312345", "3111111111", None,
+    ] * 5
+    
+    df = validar_lista_numeros(numeros)
+    esperado = analizar_resultados(df)
+    
+    with ResumenValidacion(particiones=4) as resumen:
+        for inicio in range(0, len(df), 9):
+            resumen.agregar(df.iloc[inicio:inicio + 9])
+        obtenido = resumen.resultado([numeros[:30], numeros[30:]])
+    
+    for clave in esperado:
+        check = "✅" if obtenido[clave] == esperado[clave] else "❌"
+        print(f"{check} {clave}: {obtenido[clave]}")
+        assert obtenido[clave] == esperado[clave]
+
+def test_resultado_compacto():
+    """Prueba el resultado compacto (códigos enteros) contra el de texto."""
+    print("\n" + "="*60)
+    print("TEST 5d: Resultado Compacto")
+    print("="*60)
+    
+    numeros = [
+        "573001234567", "3151234567", "+573201234567", "573725270507",
+        "57312345", "", "0312345", "3111111111", None, "12345678901234567890",
+    ] * 3
+    
+    df = validar_lista_numeros(numeros)
+    compacto = validar_lista_numeros_compacto(numeros)
+    expandido = expandir_resultados(compacto, numeros)
+    
+    print(f"Columnas compactas: {dict(compacto.dtypes.astype(str))}")
+    print(f"Bytes por fila: {compacto.memory_usage(deep=True).sum() / len(compacto):.1f}")
+    
+    for columna in df.columns:
+        iguales = df[columna].fillna('').tolist() == expandido[columna].fillna('').tolist()
+        check = "✅" if iguales else "❌"
+        print(f"{check} {columna}")
+        assert iguales
+    
+    # Con los originales, las estadísticas coinciden (incluso para números sin clave entera)
+    assert analizar_resultados(validar_lista_numeros_compacto(numeros), numeros) == analizar_resultados(validar_lista_numeros(numeros))
+
+def test_grupos_repetidos():
+    """Prueba que distintos formatos del mismo número se agrupen."""
+    print("\n" + "="*60)
+    print("TEST 5e: Grupos de Repetidos con Formatos Originales")
+    print("="*60)
+    
+    numeros = ["+57 300 123 4567", "300-123-4567", "+57 300 123 4567", "3151234567", "(315) 123-4567", "3201234567"]
+    stats = analizar_resultados(validar_lista_numeros(numeros))
+    
+    for numero, grupo in stats['grupos_repetidos'].items():
+        print(f"   {numero}: {grupo['repeticiones']} veces → {grupo['formatos']}")
+    
+    assert stats['numeros_repetidos'] == 2
+    assert stats['top_repetidos'] == {'3001234567': 3, '3151234567': 2}
+    assert stats['grupos_repetidos']['3001234567']['formatos'] == {'+57 300 123 4567': 2, '300-123-4567': 1}
+    print("✅ Formatos agrupados correctamente")
+
+def test_portabilidad():
+    """Prueba que la tabla de portabilidad tenga prioridad sobre el prefijo."""
+    import tempfile, os
+    print("\n" + "="*60)
+    print("TEST 5f: Tabla de Portabilidad")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'portabilidad.csv')
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write("numero;operador\n573001234567;COMCEL\n3151234567;Telefónica\n3151234567;Colombia Movil\n")
+        
+        tabla = cargar_portabilidad(ruta)
+        try:
+            print(f"Números portados: {len(tabla)}")
+            assert len(tabla) == 2
+            
+            # 300 es Tigo por prefijo, pero el número fue portado a Claro
+            assert validar_numero_colombiano("3001234567")['operador'] == 'Claro'
+            # Gana el último registro del archivo
+            df = validar_lista_numeros(["+57 315 123 4567", "3001234567", "3001234568"])
+            print(df[['numero_original', 'operador']].to_string(index=False))
+            assert df['operador'].tolist() == ['Tigo', 'Claro', 'Tigo']
+        finally:
+            desactivar_portabilidad()
+    
+    assert validar_numero_colombiano("3001234567")['operador'] == 'Tigo'
+    print("✅ Portabilidad aplicada correctamente")
+
+def test_listas_negras():
+    """Prueba la marca en_lista_negra con listas con y sin encabezado."""
+    import tempfile, os
+    print("\n" + "="*60)
+    print("TEST 5g: Listas Negras")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        lista = os.path.join(directorio, 'lista_negra.txt')
+        with open(lista, 'w', encoding='utf-8') as archivo:
+            archivo.write("573001234567\n+57 315 123 4567\n")
+        opt_out = os.path.join(directorio, 'opt_out.csv')
+        with open(opt_out, 'w', encoding='utf-8') as archivo:
+            archivo.write("Telefono celular,Fecha\n3201234567,2024-01-01\n")
+        
+        listas = cargar_listas_negras(lista, opt_out)
+        try:
+            print(f"Números en listas negras: {len(listas)}")
+            assert len(listas) == 3
+            assert validar_numero_colombiano("300 123 4567")['en_lista_negra']
+            assert not validar_numero_colombiano("3001234568")['en_lista_negra']
+            
+            df = validar_lista_numeros(["3151234567", "+573201234567", "3101234567", ""])
+            print(df[['numero_original', 'en_lista_negra']].to_string(index=False))
+            assert df['en_lista_negra'].tolist() == [True, True, False, False]
+            assert analizar_resultados(df)['en_lista_negra'] == 2
+        finally:
+            desactivar_listas_negras()
+    
+    assert not validar_numero_colombiano("3001234567")['en_lista_negra']
+    print("✅ Listas negras aplicadas correctamente")
+
+def test_casi_duplicados():
+    """Prueba la detección de errores de digitación (un dígito o vecinos invertidos)."""
+    print("\n" + "="*60)
+    print("TEST 5h: Casi Duplicados")
+    print("="*60)
+    
+    numeros = ["3001234567", "+57 300 123 4567", "3001234568", "3001235467", "3109999999", ""]
+    df = detectar_casi_duplicados(numeros)
+    print(df.to_string(index=False))
+    
+    pares = {(fila.numero, fila.similar, fila.tipo, fila.posicion) for fila in df.itertuples()}
+    assert pares == {
+        ("3001234567", "3001234568", "Un dígito distinto", 10),
+        ("3001234567", "3001235467", "Dígitos vecinos invertidos", 7),
+    }
+    assert df['veces_numero'].tolist() == [2, 2]
+    assert len(detectar_casi_duplicados(numeros, transposiciones=False)) == 1
+    assert len(detectar_casi_duplicados(validar_lista_numeros_compacto(numeros))) == 2
+    print("✅ Casi duplicados detectados correctamente")
+
+def test_lotes_sin_candidatos():
+    """Prueba lotes donde ningún número llega a buscar el operador (vacíos, cortos o ya en el memo)."""
+    print("\n" + "="*60)
+    print("TEST 5i: Lotes Sin Candidatos a Operador")
+    print("="*60)
+    
+    casos = {
+        "todos vacíos": ([""], ["Vacío"]),
+        "todos nulos": ([None, None], ["Vacío", "Vacío"]),
+        "todos cortos": (["12", "34"], ["Longitud inválida", "Longitud inválida"]),
+        "vacíos y cortos": (["", "7", None], ["Vacío", "Longitud inválida", "Vacío"]),
+    }
+    for nombre, (numeros, esperadas) in casos.items():
+        limpiar_memo_validacion()
+        obtenidas = validar_lista_numeros(numeros)['categoria'].tolist()
+        check = "✅" if obtenidas == esperadas else "❌"
+        print(f"{check} {nombre}: {obtenidas}")
+        assert obtenidas == esperadas
+        assert expandir_resultados(validar_lista_numeros_compacto(numeros))['categoria'].tolist() == esperadas
+    
+    # Con el memo ya lleno, en el lote solo quedan por validar los vacíos
+    limpiar_memo_validacion()
+    validar_numero_colombiano("3001234567")
+    compacto = validar_lista_numeros_compacto(["3001234567", None, "300 123 4567", ""])
+    obtenidas = expandir_resultados(compacto)['categoria'].tolist()
+    print(f"✅ memo con el número válido: {obtenidas}")
+    assert obtenidas[1] == obtenidas[3] == "Vacío"
+    assert obtenidas[0] == obtenidas[2] == validar_numero_colombiano("3001234567")['categoria']
+
 def test_casos_edge():
     """Prueba casos extremos y bordes."""
     print("\n" + "="*60)
@@ -199,8 +455,17 @@ def main():
     test_limpieza()
     test_identificacion_operador()
     test_patrones_sospechosos()
+    test_patrones_sospechosos_lote()
     test_validacion_completa()
     test_validacion_lista()
+    test_validacion_lista_con_memo()
+    test_resumen_incremental()
+    test_resultado_compacto()
+    test_grupos_repetidos()
+    test_portabilidad()
+    test_listas_negras()
+    test_casi_duplicados()
+    test_lotes_sin_candidatos()
     test_casos_edge()
     
     print("\n" + "="*60)
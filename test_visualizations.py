@@ -0,0 +1,212 @@
+"""
+Pruebas de los gráficos (scripts/visualizations.py): agrupación "Otros" del
+diagrama de Sankey, reducción de series de tiempo con LTTB y caché de figuras.
+Ejecutar: python test_visualizations.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from config import SANKEY_OTHER_LABEL
+from visualizations import (
+    FigureCache,
+    clear_figure_cache,
+    create_sankey_diagram,
+    create_status_bar_chart,
+    create_time_series_chart,
+    figure_cache_info,
+    lttb_downsample,
+    stable_hash,
+    time_series_points,
+)
+
+
+def _sankey(*args, **kwargs):
+    """(etiquetas de los nodos sin el conteo, enlaces) del Sankey construido."""
+    traza = create_sankey_diagram.uncached(*args, **kwargs).data[0]
+    etiquetas = [etiqueta.split("\n")[0] for etiqueta in traza.node.label]
+    enlaces = pd.DataFrame({
+        "source": [etiquetas[i] for i in traza.link.source],
+        "target": [etiquetas[i] for i in traza.link.target],
+        "value": np.asarray(traza.link.value, dtype=float),
+    })
+    return etiquetas, enlaces
+
+
+def test_sankey_otros():
+    """Los nodos con menos de min_share de su etapa se agrupan en "Otros" sin perder cantidad."""
+    print("\n" + "="*60)
+    print("TEST: Sankey - nodos pequeños en \"Otros\"")
+    print("="*60)
+
+    destinos = ["Entregado", "Failed"] + [f"Raro {i}" for i in range(48)]
+    valores = [1000, 500] + [1] * 48
+    etiquetas, enlaces = _sankey(["Enviado"] * len(destinos), destinos, valores, min_share=0.01)
+
+    assert not any(etiqueta.startswith("Raro") for etiqueta in etiquetas)
+    assert enlaces.set_index("target")["value"].to_dict() == {"Entregado": 1000, "Failed": 500, SANKEY_OTHER_LABEL: 48}
+    assert enlaces["value"].sum() == sum(valores)
+    print(f"✓ 48 destinos pequeños → \"{SANKEY_OTHER_LABEL}\" (48); total conservado ({sum(valores):,})")
+
+    # Un solo nodo pequeño en la etapa no se agrupa
+    etiquetas, _ = _sankey(["Enviado"] * 3, ["Entregado", "Failed", "Raro"], [1000, 500, 1], min_share=0.01)
+    assert "Raro" in etiquetas and SANKEY_OTHER_LABEL not in etiquetas
+    print("✓ Un único nodo pequeño se muestra con su nombre")
+
+
+def test_sankey_max_enlaces():
+    """Con más de max_links enlaces, los menores van al "Otros" de la etapa destino."""
+    print("\n" + "="*60)
+    print("TEST: Sankey - máximo de enlaces")
+    print("="*60)
+
+    destinos = [f"Estado {i:02d}" for i in range(20)]
+    valores = list(range(10, 30))
+    etiquetas, enlaces = _sankey(["Enviado"] * 20, destinos, valores, min_share=0, max_links=5)
+
+    assert len(enlaces) <= 5 + 1
+    assert set(enlaces["target"]) == {f"Estado {i:02d}" for i in range(15, 20)} | {SANKEY_OTHER_LABEL}
+    assert enlaces["value"].sum() == sum(valores)
+    print(f"✓ {len(enlaces)} enlaces: los 5 mayores y \"{SANKEY_OTHER_LABEL}\"; total conservado ({sum(valores):,})")
+
+
+def test_sankey_etapas():
+    """Con una columna por etapa, lo que entra a cada etapa suma las filas del recorrido."""
+    print("\n" + "="*60)
+    print("TEST: Sankey - varias etapas")
+    print("="*60)
+
+    rng = np.random.default_rng(3)
+    filas = 5_000
+    recorridos = pd.DataFrame({
+        "envio": rng.choice(["Enviado", "Reintento"], filas),
+        "entrega": rng.choice(["Entregado", "Failed"] + [f"Error {i}" for i in range(30)], filas,
+                              p=[0.6, 0.37] + [0.001] * 30),
+        "lectura": rng.choice(["Leído", "No leído"], filas),
+    })
+    _, enlaces = _sankey(recorridos, stages=["envio", "entrega", "lectura"], min_share=0.01)
+
+    salen_de_envio = enlaces[enlaces["source"].isin(["Enviado", "Reintento"])]["value"].sum()
+    llegan_a_lectura = enlaces[enlaces["target"].isin(["Leído", "No leído"])]["value"].sum()
+    assert salen_de_envio == llegan_a_lectura == filas
+    assert SANKEY_OTHER_LABEL in set(enlaces["target"])
+    print(f"✓ Cada etapa suma {filas:,} recorridos con los errores poco frecuentes en \"{SANKEY_OTHER_LABEL}\"")
+
+
+def test_lttb():
+    """LTTB devuelve n_out índices crecientes, con el primero, el último y los picos."""
+    print("\n" + "="*60)
+    print("TEST: LTTB")
+    print("="*60)
+
+    rng = np.random.default_rng(5)
+    n, n_out = 10_000, 500
+    x = np.arange(n, dtype=float)
+    y = np.sin(x / 300) + rng.normal(0, 0.05, n)
+    y[6_543] = 25
+    indices = lttb_downsample(x, y, n_out)
+
+    assert len(indices) == n_out
+    assert indices[0] == 0 and indices[-1] == n - 1
+    assert np.all(np.diff(indices) > 0)
+    assert 6_543 in indices
+    print(f"✓ {n:,} → {len(indices)} puntos con el primero, el último y el pico")
+
+    for pedidos in (n, n + 1, 2):
+        assert np.array_equal(lttb_downsample(x, y, pedidos), np.arange(n)), pedidos
+    print("✓ Con n_out >= n (o menos de 3) se devuelven todos los puntos")
+
+
+def test_serie_reducida():
+    """time_series_points respeta max_points y conserva los extremos de la serie."""
+    print("\n" + "="*60)
+    print("TEST: Serie de tiempo reducida")
+    print("="*60)
+
+    fechas = pd.date_range("2026-01-01", periods=20_000, freq="min")
+    filas = pd.DataFrame({"fecha": fechas, "envios": np.arange(20_000) % 7})
+
+    puntos, totales, etiqueta = time_series_points(filas, "fecha", "envios", freq="min", max_points=100)
+    assert len(puntos) == len(totales) == 100
+    assert puntos[0] == fechas[0] and puntos[-1] == fechas[-1]
+    assert puntos.is_monotonic_increasing
+    print(f"✓ {len(fechas):,} intervalos ({etiqueta}) → {len(puntos)} puntos, del {puntos[0]} al {puntos[-1]}")
+
+    puntos, totales, _ = time_series_points(filas, "fecha", freq="D", max_points=100)
+    assert len(puntos) == 14 and totales.sum() == len(filas)
+    print("✓ Por día (14 intervalos) no se reduce y cuenta todas las filas")
+
+
+def test_stable_hash():
+    """El hash depende del contenido: copias iguales dan el mismo hash, cambios no."""
+    print("\n" + "="*60)
+    print("TEST: stable_hash")
+    print("="*60)
+
+    conteos = {"Entregado": 10, "Failed": 3}
+    filas = pd.DataFrame({"fecha": pd.date_range("2026-01-01", periods=50, freq="h"), "envios": np.arange(50)})
+
+    assert stable_hash(conteos, "Estados") == stable_hash(dict(conteos), "Estados")
+    assert stable_hash(filas) == stable_hash(filas.copy())
+    assert stable_hash(np.arange(5)) == stable_hash(np.arange(5).copy())
+    assert stable_hash([1, "a", (2.5, None)]) == stable_hash([1, "a", (2.5, None)])
+    print("✓ Copias con el mismo contenido dan el mismo hash")
+
+    modificadas = filas.copy()
+    modificadas.loc[7, "envios"] = -1
+    assert stable_hash(filas) != stable_hash(modificadas)
+    assert stable_hash(conteos) != stable_hash({"Failed": 3, "Entregado": 10})
+    assert stable_hash(conteos, "Estados") != stable_hash(conteos, "Otro título")
+    assert stable_hash([1, 2]) != stable_hash([2, 1])
+    print("✓ Cambiar un valor, el orden de las claves o el título cambia el hash")
+
+
+def test_cache_figuras():
+    """Los mismos datos (aunque sean otra copia) devuelven la figura guardada."""
+    print("\n" + "="*60)
+    print("TEST: Caché de figuras")
+    print("="*60)
+
+    clear_figure_cache()
+    conteos = {"Entregado": 10, "Failed": 3}
+    primera = create_status_bar_chart(conteos, "Estados")
+    segunda = create_status_bar_chart(dict(conteos), "Estados")
+    assert segunda is primera
+    assert figure_cache_info()["hits"] == 1 and figure_cache_info()["misses"] == 1
+    assert create_status_bar_chart(conteos, "Otro título") is not primera
+    print("✓ Los mismos conteos (otra copia) devuelven la figura guardada; otro título no")
+
+    filas = pd.DataFrame({"fecha": pd.date_range("2026-01-01", periods=500, freq="h"), "envios": 1})
+    serie = create_time_series_chart(filas, "fecha", value_col="envios")
+    assert create_time_series_chart(filas.copy(), "fecha", value_col="envios") is serie
+    assert figure_cache_info()["hits"] == 2
+    print("✓ Una copia del DataFrame reutiliza la figura de la serie")
+
+    cache = FigureCache(max_entries=2)
+    for clave in ("a", "b", "c"):
+        cache.put(clave, primera)
+    assert cache.get("a") is None and cache.get("c") is primera
+    assert cache.info()["entries"] == 2
+    clear_figure_cache()
+    assert figure_cache_info()["entries"] == 0
+    print("✓ La caché no pasa de max_entries y clear_figure_cache la vacía")
+
+
+def main():
+    test_sankey_otros()
+    test_sankey_max_enlaces()
+    test_sankey_etapas()
+    test_lttb()
+    test_serie_reducida()
+    test_stable_hash()
+    test_cache_figuras()
+    print("\n✓ Todas las pruebas de gráficos pasaron")
+
+
+if __name__ == "__main__":
+    main()